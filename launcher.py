@@ -62,6 +62,10 @@ def main() -> None:
     # 단, ui.home.py의 set_page_config가 가장 먼저 실행되어야 함.
     
     try:
+        # 예측 모델 야간 재학습 스레드는 앱 프로세스에서만 시작 (이미 실행 중이면 무시)
+        from modules.core_logic import get_system
+        get_system().start_forecast_refresh()
+
         from ui.home import main as ui_main
         ui_main()
     except Exception as e:
@@ -0,0 +1,82 @@
+"""TimeBank 단체 배정 모듈.
+
+단체 인원(예: 14명)을 빈 숙소 여러 개에 나눠 배정할 때, max_guests 합이 인원 이상이면서
+숙박 총액이 가장 싼 숙소 조합을 찾습니다 (최소 비용 커버 0/1 배낭 문제).
+
+1. 지배 제거: 숙소 u보다 싸거나 같으면서 수용 인원이 같거나 큰 숙소가
+   ceil(인원 / u.max_guests)개 이상 남아 있으면 u는 최적해에 필요하지 않습니다
+   (그 숙소들만으로 이미 인원을 채우므로 u를 빼도 비용이 늘지 않음).
+2. 동적 계획법: dp[c] = 수용 인원 c(인원 초과분은 인원으로 절단)를 만드는 최소 비용.
+   숙소 하나당 NumPy 벡터 연산 한 번이므로 후보 n개, 인원 G에 대해 O(n·G)입니다.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from modules.models import Unit
+
+
+@dataclass
+class Allocation:
+    units: List[Unit]
+    prices: List[int]  # 숙소별 숙박 총액
+    total_price: int
+    capacity: int  # 배정된 숙소의 max_guests 합
+
+
+def prune_dominated(capacities: np.ndarray, costs: np.ndarray, guests: int) -> np.ndarray:
+    """최적해에 필요 없는 후보를 제거한 인덱스 배열 (비용 오름차순)."""
+    caps = np.minimum(capacities, guests)
+    order = np.lexsort((-caps, costs))
+    kept_by_cap = np.zeros(guests + 1, dtype=np.int64)  # 남긴 숙소 수 (절단된 수용 인원별)
+    kept = []
+    for i in order:
+        cap = caps[i]
+        if cap <= 0:
+            continue
+        if kept_by_cap[cap:].sum() >= math.ceil(guests / cap):
+            continue
+        kept_by_cap[cap] += 1
+        kept.append(i)
+    return np.array(kept, dtype=np.int64)
+
+
+def solve_cover(capacities: np.ndarray, costs: np.ndarray, guests: int) -> Optional[np.ndarray]:
+    """수용 인원 합 >= guests 인 최소 비용 조합의 인덱스 배열 (불가능하면 None)."""
+    capacities = np.asarray(capacities, dtype=np.int64)
+    costs = np.asarray(costs, dtype=np.float64)
+    if guests <= 0:
+        return np.array([], dtype=np.int64)
+    if capacities.sum() < guests:
+        return None
+    candidates = prune_dominated(capacities, costs, guests)
+    caps = np.minimum(capacities[candidates], guests)
+
+    dp = np.full(guests + 1, np.inf)
+    dp[0] = 0.0
+    take = np.zeros((len(candidates), guests + 1), dtype=bool)
+    full_from = np.zeros(len(candidates), dtype=np.int64)  # dp[guests]를 갱신한 이전 상태
+    for k, i in enumerate(candidates):
+        cap, cost = caps[k], costs[i]
+        shifted = np.full(guests + 1, np.inf)
+        shifted[cap:guests] = dp[:guests - cap] + cost
+        lo = guests - cap
+        full_from[k] = lo + int(np.argmin(dp[lo:]))
+        shifted[guests] = dp[full_from[k]] + cost
+        take[k] = shifted < dp
+        np.minimum(dp, shifted, out=dp)
+    if not np.isfinite(dp[guests]):
+        return None
+
+    chosen = []
+    state = guests
+    for k in range(len(candidates) - 1, -1, -1):
+        if state == 0:
+            break
+        if take[k, state]:
+            chosen.append(candidates[k])
+            state = full_from[k] if state == guests else state - caps[k]
+    return np.array(chosen[::-1], dtype=np.int64)
@@ -0,0 +1,148 @@
+"""TimeBank 예약 가능 여부(Availability) 인덱스 모듈.
+
+숙소(및 시간대)별로 예약 구간을 정렬된 리스트로 유지하여
+중복 예약 여부를 bisect로 O(log n)에 판별합니다.
+구간은 date.toordinal() 기준 반개구간 [start, end) 입니다.
+
+SlotOccupancy는 달력 표시용으로 숙소별 AM/PM/OVERNIGHT 점유 여부를
+하루 1바이트(uint8, 하위 3비트 사용)로 저장한 링 버퍼입니다.
+"""
+
+import bisect
+import datetime
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+
+# 시간대별 비트 (하루 uint8 1바이트 중 하위 3비트)
+SLOT_BITS = {"AM": 1, "PM": 2, "OVERNIGHT": 4}
+FULL_DAY = 7
+_SLOT_COUNT = np.array([bin(v).count("1") for v in range(FULL_DAY + 1)], dtype=np.float64)
+
+
+def stay_range(check_in: datetime.date, check_out: datetime.date) -> Tuple[int, int]:
+    """체크인/체크아웃을 [start, end) ordinal 구간으로 변환.
+
+    당일 이용(AM/PM 등 check_out <= check_in)은 체크인 당일 하루로 취급합니다.
+    """
+    start = check_in.toordinal()
+    end = check_out.toordinal()
+    if end <= start:
+        end = start + 1
+    return start, end
+
+
+class IntervalIndex:
+    """키별 비중첩 구간 인덱스.
+
+    각 키마다 시작점 기준으로 정렬된 starts/ends/owners 병렬 리스트를 유지합니다.
+    구간끼리 겹치지 않으므로 새 구간 [s, e)와 겹칠 수 있는 후보는
+    시작점이 e보다 작은 마지막 구간 하나뿐입니다.
+    """
+
+    def __init__(self):
+        self._starts: Dict[Hashable, List[int]] = {}
+        self._ends: Dict[Hashable, List[int]] = {}
+        self._owners: Dict[Hashable, List[str]] = {}
+
+    def overlaps(self, key: Hashable, start: int, end: int) -> bool:
+        starts = self._starts.get(key)
+        if not starts:
+            return False
+        i = bisect.bisect_left(starts, end)
+        return i > 0 and self._ends[key][i - 1] > start
+
+    def add(self, key: Hashable, start: int, end: int, owner: str) -> None:
+        starts = self._starts.setdefault(key, [])
+        ends = self._ends.setdefault(key, [])
+        owners = self._owners.setdefault(key, [])
+        i = bisect.bisect_right(starts, start)
+        starts.insert(i, start)
+        ends.insert(i, end)
+        owners.insert(i, owner)
+
+    def remove(self, key: Hashable, start: int, owner: str) -> bool:
+        starts = self._starts.get(key)
+        if not starts:
+            return False
+        owners = self._owners[key]
+        i = bisect.bisect_left(starts, start)
+        while i < len(starts) and starts[i] == start:
+            if owners[i] == owner:
+                del starts[i]
+                del self._ends[key][i]
+                del owners[i]
+                return True
+            i += 1
+        return False
+
+    def intervals(self, key: Hashable) -> List[Tuple[int, int, str]]:
+        return list(zip(self._starts.get(key, []), self._ends.get(key, []), self._owners.get(key, [])))
+
+
+class SlotOccupancy:
+    """숙소별 시간대 점유 비트맵 (오늘부터 horizon_days 일을 덮는 링 버퍼).
+
+    날짜 d는 링의 d.toordinal() % horizon_days 위치에 uint8 하나로 저장됩니다
+    (하위 3비트만 사용, 숙소당 horizon_days 바이트).
+    윈도우 밖의 날짜는 기록/조회 대상에서 제외되며, 날짜가 바뀌면
+    reset() 후 예약을 다시 반영해야 합니다 (TimeBankSystem이 처리).
+    """
+
+    def __init__(self, horizon_days: int = 365, today: datetime.date = None):
+        self.horizon = horizon_days
+        self._rings: Dict[str, np.ndarray] = {}
+        self.reset(today)
+
+    def reset(self, today: datetime.date = None) -> None:
+        self.base = (today or datetime.date.today()).toordinal()
+        self._rings.clear()
+
+    def _window(self, start: int, end: int) -> np.ndarray:
+        start = max(start, self.base)
+        end = min(end, self.base + self.horizon)
+        if end <= start:
+            return np.empty(0, dtype=np.int64)
+        return np.arange(start, end) % self.horizon
+
+    def _ring(self, unit_id: str) -> np.ndarray:
+        ring = self._rings.get(unit_id)
+        if ring is None:
+            ring = self._rings[unit_id] = np.zeros(self.horizon, dtype=np.uint8)
+        return ring
+
+    def mark(self, unit_id: str, time_slot: str, start: int, end: int) -> None:
+        self._ring(unit_id)[self._window(start, end)] |= SLOT_BITS[time_slot]
+
+    def clear(self, unit_id: str, time_slot: str, start: int, end: int) -> None:
+        self._ring(unit_id)[self._window(start, end)] &= np.uint8(~SLOT_BITS[time_slot] & FULL_DAY)
+
+    def busy_mask(self, unit_id: str, time_slot: str, start: datetime.date, days: int = 90) -> np.ndarray:
+        """start부터 days일 동안 해당 시간대가 점유된 날 여부 (bool 배열)."""
+        ordinals = np.arange(start.toordinal(), start.toordinal() + days)
+        ring = self._rings.get(unit_id)
+        if ring is None:
+            return np.zeros(days, dtype=bool)
+        inside = (ordinals >= self.base) & (ordinals < self.base + self.horizon)
+        return inside & ((ring[ordinals % self.horizon] & SLOT_BITS[time_slot]) != 0)
+
+    def full_mask(self, unit_id: str, start: datetime.date, days: int = 90) -> np.ndarray:
+        """세 시간대가 모두 점유된 날 여부 (bool 배열)."""
+        ordinals = np.arange(start.toordinal(), start.toordinal() + days)
+        ring = self._rings.get(unit_id)
+        if ring is None:
+            return np.zeros(days, dtype=bool)
+        inside = (ordinals >= self.base) & (ordinals < self.base + self.horizon)
+        return inside & (ring[ordinals % self.horizon] == FULL_DAY)
+
+    def load_matrix(self, unit_ids: List[str], start: datetime.date, days: int) -> np.ndarray:
+        """숙소별 일자별 판매 비율 (점유된 시간대 수 / 3), shape (len(unit_ids), days)."""
+        ordinals = np.arange(start.toordinal(), start.toordinal() + days)
+        inside = (ordinals >= self.base) & (ordinals < self.base + self.horizon)
+        positions = ordinals % self.horizon
+        load = np.zeros((len(unit_ids), days), dtype=np.float64)
+        for row, unit_id in enumerate(unit_ids):
+            ring = self._rings.get(unit_id)
+            if ring is not None:
+                load[row] = np.where(inside, _SLOT_COUNT[ring[positions]], 0.0) / len(SLOT_BITS)
+        return load
@@ -0,0 +1,302 @@
+"""TimeBank 예약 컬럼 저장소 모듈.
+
+관리자 화면용으로 예약을 컬럼별 NumPy 배열(열 지향)로 미러링합니다.
+- 예약 생성 시 행 하나를 추가(amortized O(1), 용량 2배 확장)하고, 취소 시 상태 코드만 갱신합니다.
+- 문자열 컬럼(숙소, 캠핑장, 지역, 고객, 시간대, 상태)은 사전 코드(int32/int8)로 저장합니다.
+- 기간/회원 조건은 배열 전체에 대한 벡터 마스크로 계산하므로 예약 객체를 순회하지 않습니다.
+- page()는 정렬 키 + 예약 ID keyset 페이지네이션으로 화면에 보일 행만 골라 DataFrame으로 만듭니다.
+- frame()은 숫자/날짜 컬럼과 문자열 컬럼(코드 + 사전으로 구성한 Categorical)으로 DataFrame을 만듭니다.
+- occupancy()는 숙소 × 날짜 점유 격자를 차분 배열(체크인 +w, 체크아웃 -w)의 누적합으로 계산합니다.
+  예약을 날짜 행으로 펼치지 않으므로 O(예약 수 + 숙소 수 × 일수)입니다.
+- daily_sum()은 (그룹, 체크인 날짜)별 합계를 bincount 한 번으로 계산합니다 (예측 학습용 일 매출).
+- version은 쓰기마다 증가하므로 조회 결과 캐시의 무효화 키로 쓸 수 있습니다.
+"""
+
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.models import Booking
+from modules.rollups import SLOT_WEIGHTS
+
+# 컬럼 이름 -> dtype
+_NUMERIC_COLUMNS = {
+    "check_in": "datetime64[s]",  # pandas 기본 해상도(s/us)와 같게 두어 DataFrame 변환 시 복사 없음
+    "check_out": "datetime64[s]",
+    "created_at": "datetime64[us]",
+    "guests": np.int32,
+    "original_price": np.int64,
+    "final_price": np.int64,
+    "used_points": np.int64,
+    "earned_points": np.int64,
+    "is_member": bool,
+}
+# 사전 코드 컬럼 (DataFrame 컬럼 이름 -> 코드 dtype)
+_CODED_COLUMNS = {
+    "unit_id": np.int32,
+    "campsite_id": np.int32,
+    "region_id": np.int32,
+    "user_id": np.int32,
+    "time_slot": np.int8,
+    "status": np.int8,
+}
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _to_datetime64(ordinals: List[int]) -> np.ndarray:
+    return (np.array(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+SORT_COLUMNS = ("created_at", "check_in", "final_price")
+Cursor = Tuple[int, str]  # (정렬 키, 예약 ID)
+
+
+@dataclass
+class BookingPage:
+    frame: pd.DataFrame
+    total: int  # 조건을 만족하는 전체 건수
+    next_cursor: Optional[Cursor]  # 다음 페이지 조회용 (마지막 페이지면 None)
+
+
+class _Vocabulary:
+    """문자열 <-> 정수 코드 사전 (추가만 가능)."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        value = value if value is not None else ""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int:
+        """코드 (사전에 없으면 -1)."""
+        return self._codes.get(value, -1)
+
+
+class BookingColumns:
+    """예약 컬럼 미러.
+
+    locate(unit_id) -> (campsite_id, region_id) 로 숙소의 캠핑장/지역을 함께 저장합니다.
+    쓰기는 내부 락으로 직렬화하고, 읽기는 (행 수, 배열 참조)를 잡아 두고 락 밖에서 계산합니다.
+    """
+
+    def __init__(self, locate: Callable[[str], Tuple[Optional[str], Optional[str]]], capacity: int = 1024):
+        self._locate = locate
+        self._lock = threading.Lock()
+        self._size = 0
+        self._vocab = {name: _Vocabulary() for name in _CODED_COLUMNS}
+        self._ids = np.empty(capacity, dtype=object)
+        self._columns: Dict[str, np.ndarray] = {
+            **{name: np.zeros(capacity, dtype=dtype) for name, dtype in _NUMERIC_COLUMNS.items()},
+            **{name: np.zeros(capacity, dtype=dtype) for name, dtype in _CODED_COLUMNS.items()},
+        }
+        self._row_by_id: Dict[str, int] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        ids = np.empty(capacity, dtype=object)
+        ids[:self._size] = self._ids[:self._size]
+        self._ids = ids
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def extend(self, bookings: Sequence[Booking]) -> None:
+        with self._lock:
+            bookings = [b for b in bookings if b.id not in self._row_by_id]
+            if not bookings:
+                return
+            self._reserve(len(bookings))
+            lo, hi = self._size, self._size + len(bookings)
+            columns, vocab = self._columns, self._vocab
+            located = [self._locate(b.unit_id) for b in bookings]
+            self._ids[lo:hi] = [b.id for b in bookings]
+            # date/datetime 객체를 직접 넣으면 원소마다 변환되므로 정수(ordinal, 마이크로초)로 넘김
+            columns["check_in"][lo:hi] = _to_datetime64([b.check_in.toordinal() for b in bookings])
+            columns["check_out"][lo:hi] = _to_datetime64([b.check_out.toordinal() for b in bookings])
+            columns["created_at"][lo:hi] = np.array([(b.created_at - _EPOCH) // _MICROSECOND for b in bookings],
+                                                    dtype=np.int64).astype("datetime64[us]")
+            for name in ("guests", "original_price", "final_price", "used_points", "earned_points", "is_member"):
+                columns[name][lo:hi] = [getattr(b, name) for b in bookings]
+            for name in ("unit_id", "user_id", "time_slot", "status"):
+                code = vocab[name].code
+                columns[name][lo:hi] = [code(getattr(b, name)) for b in bookings]
+            columns["campsite_id"][lo:hi] = [vocab["campsite_id"].code(c) for c, _ in located]
+            columns["region_id"][lo:hi] = [vocab["region_id"].code(r) for _, r in located]
+            for row, b in enumerate(bookings, lo):
+                self._row_by_id[b.id] = row
+            self._size = hi
+            self.version += 1
+
+    def append(self, booking: Booking) -> None:
+        self.extend([booking])
+
+    def set_status(self, booking_id: str, status: str) -> None:
+        with self._lock:
+            row = self._row_by_id.get(booking_id)
+            if row is not None:
+                self._columns["status"][row] = self._vocab["status"].code(status)
+                self.version += 1
+
+    def _rows_of(self, name: str, keys: Sequence[str]) -> np.ndarray:
+        """사전 코드 -> keys 안의 행 번호 (keys에 없으면 -1) 변환표."""
+        vocab = self._vocab[name]
+        row_of_code = np.full(len(vocab.values), -1, dtype=np.int64)
+        for row, key in enumerate(keys):
+            code = vocab.lookup(key)
+            if code >= 0:
+                row_of_code[code] = row
+        return row_of_code
+
+    def occupancy(self, unit_ids: Sequence[str], start: datetime.date, days: int,
+                  status: str = "CONFIRMED") -> np.ndarray:
+        """숙소 × 날짜 점유 격자 (shape: len(unit_ids) × days, float32).
+
+        값은 그날 점유된 비율입니다 (OVERNIGHT 1, 당일 이용 AM/PM 각 0.5, 최대 1).
+        unit_ids 순서대로 행을 만들고, 목록에 없는 숙소의 예약은 제외합니다.
+        """
+        size, _, columns = self._snapshot()
+        n_units = len(unit_ids)
+        row_of_code = self._rows_of("unit_id", unit_ids)
+        weight_of_code = np.array([SLOT_WEIGHTS.get(v, 1.0) for v in self._vocab["time_slot"].values])
+
+        keep = columns["status"][:size] == self._vocab["status"].lookup(status)
+        rows = row_of_code[columns["unit_id"][:size][keep]]
+        weights = weight_of_code[columns["time_slot"][:size][keep]]
+        origin = np.datetime64(start, "D")
+        lo = (columns["check_in"][:size][keep].astype("datetime64[D]") - origin).astype(np.int64)
+        hi = (columns["check_out"][:size][keep].astype("datetime64[D]") - origin).astype(np.int64)
+        hi = np.maximum(hi, lo + 1)  # 당일 이용은 체크인 당일 하루 (stay_range와 같은 규칙)
+        lo, hi = np.clip(lo, 0, days), np.clip(hi, 0, days)
+        valid = (rows >= 0) & (hi > lo)
+        rows, lo, hi, weights = rows[valid], lo[valid], hi[valid], weights[valid]
+
+        # 행마다 days+1칸 차분 배열: 체크인 칸에 +w, 체크아웃 칸에 -w 를 더한 뒤 날짜 방향 누적합
+        width = days + 1
+        diff = np.bincount(rows * width + lo, weights, minlength=n_units * width)
+        diff -= np.bincount(rows * width + hi, weights, minlength=n_units * width)
+        grid = np.cumsum(diff.reshape(n_units, width)[:, :days], axis=1)
+        # 숙박과 당일 이용은 별도 시간대라 합이 1을 넘을 수 있으므로 1(만실)로 자름
+        return np.clip(grid, 0.0, 1.0).astype(np.float32)
+
+    def daily_sum(self, value: str, group: str, keys: Sequence[str], start: datetime.date, days: int,
+                  status: str = "CONFIRMED") -> np.ndarray:
+        """체크인 날짜별 value 합계 격자 (shape: len(keys) × days). 예: 캠핑장별 일 매출."""
+        size, _, columns = self._snapshot()
+        row_of_code = self._rows_of(group, keys)
+        keep = columns["status"][:size] == self._vocab["status"].lookup(status)
+        rows = row_of_code[columns[group][:size][keep]]
+        day = (columns["check_in"][:size][keep].astype("datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+        valid = (rows >= 0) & (day >= 0) & (day < days)
+        totals = np.bincount(rows[valid] * days + day[valid], columns[value][:size][keep][valid],
+                             minlength=len(keys) * days)
+        return totals.reshape(len(keys), days)
+
+    def _snapshot(self) -> Tuple[int, np.ndarray, Dict[str, np.ndarray]]:
+        with self._lock:
+            return self._size, self._ids, dict(self._columns)
+
+    def mask(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None,
+             is_member: Optional[bool] = None, status: Optional[str] = None) -> np.ndarray:
+        """조건을 만족하는 행 여부 (bool 배열). start~end(포함)는 체크인 날짜 기준."""
+        size, _, columns = self._snapshot()
+        return self._mask(size, columns, start, end, is_member, status)
+
+    def _mask(self, size: int, columns: Dict[str, np.ndarray], start: Optional[datetime.date],
+              end: Optional[datetime.date], is_member: Optional[bool], status: Optional[str]) -> np.ndarray:
+        keep = np.ones(size, dtype=bool)
+        check_in = columns["check_in"][:size]
+        if start is not None:
+            keep &= check_in >= np.datetime64(start, "D")
+        if end is not None:
+            keep &= check_in <= np.datetime64(end, "D")
+        if is_member is not None:
+            keep &= columns["is_member"][:size] == is_member
+        if status is not None:
+            keep &= columns["status"][:size] == self._vocab["status"].lookup(status)
+        return keep
+
+    def rows(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None,
+             is_member: Optional[bool] = None, status: Optional[str] = None, newest_first: bool = True) -> np.ndarray:
+        """조건을 만족하는 행 번호 (기본: 생성 시각 최신순)."""
+        rows = np.flatnonzero(self.mask(start, end, is_member, status))
+        if newest_first and len(rows):
+            created = self._snapshot()[2]["created_at"][rows]
+            rows = rows[np.argsort(created, kind="stable")[::-1]]
+        return rows
+
+    def page(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None,
+             is_member: Optional[bool] = None, status: Optional[str] = None, sort_by: str = "created_at",
+             descending: bool = True, after: Optional[Cursor] = None, limit: int = 50,
+             labels: Optional[Dict[str, Dict[str, str]]] = None) -> "BookingPage":
+        """정렬 + keyset 페이지네이션 조회.
+
+        after는 이전 페이지의 next_cursor (정렬 키, 마지막 예약 ID)이며, 그 뒤의 행만 마스크로 남긴 다음
+        argpartition으로 상위 limit개만 골라 정렬합니다 (전체 정렬 없음).
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by}")
+        size, ids, columns = self._snapshot()
+        keep = self._mask(size, columns, start, end, is_member, status)
+        total = int(np.count_nonzero(keep))
+        # 정렬 키를 int64로 보고, 내림차순은 부호를 뒤집어 항상 오름차순으로 처리
+        keys = columns[sort_by][:size].view(np.int64)
+        if descending:
+            keys = -keys
+        # 같은 정렬 키는 행 번호(예약 ID당 고정)로 구분해 전체 순서를 결정
+        ties = -np.arange(size) if descending else np.arange(size)
+        if after is not None:
+            after_key, after_id = after
+            after_row = self._row_by_id.get(after_id)
+            later = keys > after_key
+            if after_row is not None:
+                later |= (keys == after_key) & (ties > ties[after_row])
+            keep &= later
+        rows = np.flatnonzero(keep)
+        has_more = len(rows) > limit
+        if has_more:
+            kth = keys[rows[np.argpartition(keys[rows], limit - 1)[limit - 1]]]
+            rows = rows[keys[rows] <= kth]  # 경계 값과 같은 행은 행 번호 순서로 잘라야 하므로 모두 포함
+        rows = rows[np.lexsort((ties[rows], keys[rows]))[:limit]]
+        next_cursor = (int(keys[rows[-1]]), ids[rows[-1]]) if has_more else None
+        return BookingPage(frame=self.frame(rows, labels), total=total, next_cursor=next_cursor)
+
+    def frame(self, rows: Optional[np.ndarray] = None,
+              labels: Optional[Dict[str, Dict[str, str]]] = None) -> pd.DataFrame:
+        """예약 DataFrame. rows가 없으면 전체 행, 있으면 해당 행만 담습니다.
+
+        labels: {컬럼 이름: {코드 값: 표시 이름}} (예: 캠핑장 id -> 캠핑장 이름, 표시 이름은 고유해야 함)
+        """
+        size, ids, columns = self._snapshot()
+        take = slice(0, size) if rows is None else rows
+        data = {"id": ids[take]}
+        for name in _NUMERIC_COLUMNS:
+            data[name] = columns[name][take]
+        for name in _CODED_COLUMNS:
+            categories = list(self._vocab[name].values)
+            if labels and name in labels:
+                categories = [labels[name].get(value, value) for value in categories]
+            data[name] = pd.Categorical.from_codes(columns[name][take], categories=categories)
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,106 @@
+"""TimeBank 카탈로그 인덱스 모듈.
+
+- id 기반 조회: unit_id -> Unit, campsite_id -> Campsite, unit_id -> Campsite,
+  지역 id/이름 -> Campsite 목록 (모두 O(1))
+- 검색용 후보 집합: 숙소(Unit)를 지역/태그/수용 인원별로 미리 묶어 두어,
+  다중 조건 검색 시 전체 카탈로그를 훑지 않고 집합 교집합만으로
+  후보를 좁힐 수 있게 합니다.
+"""
+
+import bisect
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from modules.models import Campsite, Region, Unit
+
+
+class CatalogIndex:
+    """카탈로그 id 인덱스 및 속성별 후보 집합.
+
+    - units / campsites / campsite_by_unit / campsites_by_region: id 기반 조회용
+    - by_region: 지역 id/이름 -> unit_id 집합
+    - by_tag: 태그 -> unit_id 집합
+    - 수용 인원: 각 max_guests 값 v에 대해 "max_guests >= v" 인 unit_id 집합을
+      미리 계산해 두고, 요청 인원은 bisect로 해당 임계값을 찾습니다.
+    """
+
+    def __init__(self):
+        self.regions: Dict[str, Region] = {}
+        self.region_by_name: Dict[str, Region] = {}
+        self.campsites: Dict[str, Campsite] = {}
+        self.campsite_by_unit: Dict[str, Campsite] = {}
+        self.campsites_by_region: Dict[str, List[Campsite]] = {}
+        self.units: Dict[str, Unit] = {}
+        self.unit_order: Dict[str, int] = {}
+        self.by_region: Dict[str, Set[str]] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self._capacity_keys: List[int] = []
+        self._capacity_sets: List[FrozenSet[str]] = []
+
+    def build(self, regions: Iterable[Region], campsites: Iterable[Campsite]) -> None:
+        for index in (self.regions, self.region_by_name, self.campsites, self.campsite_by_unit,
+                      self.campsites_by_region, self.units, self.unit_order, self.by_region, self.by_tag):
+            index.clear()
+        for region in regions:
+            self.add_region(region)
+        for campsite in campsites:
+            self._add_campsite(campsite)
+        self._build_capacity_sets()
+
+    def add_region(self, region: Region) -> None:
+        self.regions[region.id] = region
+        self.region_by_name[region.name] = region
+
+    def add_campsite(self, campsite: Campsite) -> None:
+        self._add_campsite(campsite)
+        self._build_capacity_sets()
+
+    def _add_campsite(self, campsite: Campsite) -> None:
+        region = self.regions.get(campsite.region_id)
+        region_name = region.name if region else None
+        self.campsites[campsite.id] = campsite
+        self.campsites_by_region.setdefault(campsite.region_id, []).append(campsite)
+        if region_name:
+            self.campsites_by_region.setdefault(region_name, []).append(campsite)
+        for unit in campsite.units:
+            self.campsite_by_unit[unit.id] = campsite
+            self.units[unit.id] = unit
+            self.unit_order.setdefault(unit.id, len(self.unit_order))
+            self.by_region.setdefault(campsite.region_id, set()).add(unit.id)
+            if region_name:
+                self.by_region.setdefault(region_name, set()).add(unit.id)
+            for tag in unit.tags:
+                self.by_tag.setdefault(tag, set()).add(unit.id)
+
+    def _build_capacity_sets(self) -> None:
+        # 수용 인원 내림차순으로 누적하여 "v명 이상" 집합을 만든 뒤 오름차순으로 보관
+        keys: List[int] = []
+        sets: List[FrozenSet[str]] = []
+        by_capacity: Dict[int, Set[str]] = {}
+        for uid, unit in self.units.items():
+            by_capacity.setdefault(unit.max_guests, set()).add(uid)
+        acc: Set[str] = set()
+        for capacity in sorted(by_capacity, reverse=True):
+            acc |= by_capacity[capacity]
+            keys.append(capacity)
+            sets.append(frozenset(acc))
+        self._capacity_keys = keys[::-1]
+        self._capacity_sets = sets[::-1]
+
+    def units_for_guests(self, guests: int) -> FrozenSet[str]:
+        i = bisect.bisect_left(self._capacity_keys, guests)
+        return self._capacity_sets[i] if i < len(self._capacity_sets) else frozenset()
+
+    def candidates(self, guests: int = 1, region: Optional[str] = None, tags: Optional[Iterable[str]] = None) -> Set[str]:
+        """조건을 모두 만족하는 unit_id 집합 (작은 집합부터 교집합)."""
+        sets = [self.units_for_guests(guests)]
+        if region:
+            sets.append(self.by_region.get(region, set()))
+        for tag in tags or []:
+            sets.append(self.by_tag.get(tag, set()))
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
@@ -0,0 +1,47 @@
+"""TimeBank 동시성 제어 모듈.
+
+Streamlit은 브라우저 세션마다 별도 스레드에서 스크립트를 실행하며,
+모든 세션이 하나의 TimeBankSystem 인스턴스를 공유합니다.
+숙소 단위 lock striping과 사용자(포인트 지갑) 락을 항상 같은 순서로
+획득하여, 서로 다른 숙소의 예약은 병렬로 처리하면서 같은 숙소/같은 지갑에
+대한 변경은 직렬화합니다.
+"""
+
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Hashable, Iterable, Iterator, List
+
+
+class LockStripes:
+    """키를 고정 개수의 락 중 하나에 매핑하는 lock striping."""
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def stripe_ids(self, keys: Iterable[Hashable]) -> List[int]:
+        """키 목록이 사용하는 락 번호 (중복 제거, 오름차순)."""
+        return sorted({hash(key) % len(self._locks) for key in keys if key is not None})
+
+    def lock(self, stripe_id: int) -> threading.Lock:
+        return self._locks[stripe_id]
+
+
+class BookingLocks:
+    """예약 트랜잭션용 락 관리자.
+
+    획득 순서는 항상 (1) 숙소 락 오름차순 → (2) 사용자 락 오름차순 입니다.
+    모든 호출자가 같은 순서를 따르므로 교착 상태가 발생하지 않습니다.
+    """
+
+    def __init__(self, unit_stripes: int = 64, user_stripes: int = 64):
+        self._units = LockStripes(unit_stripes)
+        self._users = LockStripes(user_stripes)
+
+    @contextmanager
+    def hold(self, unit_ids: Iterable[str] = (), user_ids: Iterable[str] = ()) -> Iterator[None]:
+        with ExitStack() as stack:
+            for stripe_id in self._units.stripe_ids(unit_ids):
+                stack.enter_context(self._units.lock(stripe_id))
+            for stripe_id in self._users.stripe_ids(user_ids):
+                stack.enter_context(self._users.lock(stripe_id))
+            yield
@@ -4,88 +4,251 @@
 - 예약 관리 및 ROI 계산
 - 시스템 초기화 (Mock Data: 5대 랜드마크 포함)
 - Viral Marketing Logic (공유 점장, 포인트 시스템) 포함
+- 예약/사용자/포인트 영속화는 modules/storage.py의 Repository에 위임
 """
 
 import datetime
-import uuid
-import random
-from dataclasses import dataclass, field
+import logging
+import threading
 from typing import List, Optional, Dict, Tuple
 
-# --- 데이터 모델 ---
-@dataclass
-class Unit:
-    id: str
-    name: str
-    price: int
-    max_guests: int
-    rating: float
-    image: str
-    tags: List[str]
-
-@dataclass
-class Campsite:
-    id: str
-    region_id: str
-    name: str
-    description: str
-    units: List[Unit]
-    location_desc: str = ""
-    features: List[str] = field(default_factory=list)
-    images: List[str] = field(default_factory=list)
-    base_price_weekday: int = 0  # ui/booking.py에서 참조하는 필드 추가
-    review_count: int = 0        # ui/booking.py에서 참조하는 필드 추가
-    rating: float = 0.0          # ui/booking.py에서 참조하는 필드 추가
-
-@dataclass
-class Region:
-    id: str
-    name: str
-    description: str
-    image: str # Representative image
-
-@dataclass
-class User:
-    id: str
-    name: str
-    email: str
-    is_member: bool = False
-    points: int = 0
-    invite_code: str = field(default_factory=lambda: str(uuid.uuid4())[:8].upper())
-    referral_count: int = 0
-    total_earnings: int = 0 # 총 누적 수익 (포인트)
-
-@dataclass
-class Booking:
-    id: str
-    unit_id: str
-    user_id: str
-    check_in: datetime.date
-    check_out: datetime.date
-    guests: int
-    original_price: int
-    final_price: int
-    used_points: int = 0
-    earned_points: int = 0
-    invite_code_used: Optional[str] = None
-    status: str = "CONFIRMED"
-    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+import numpy as np
+import pandas as pd
+
+from modules.models import Unit, Campsite, Region, User, Booking, BookingRequest, LedgerEntry
+from modules.storage import Repository, InMemoryRepository, create_repository
+from modules.availability import IntervalIndex, SlotOccupancy, stay_range
+from modules.catalog_index import CatalogIndex
+from modules.concurrency import BookingLocks
+from modules.id_gen import IdGenerator, resolve_node_id
+from modules import holidays, pricing, pricing_rules
+from modules.dynamic_pricing import DynamicPricer
+from modules import points_ledger
+from modules.points_ledger import PointsLedger, Statement
+from modules import points_expiry
+from modules import allocation
+from modules.allocation import Allocation
+from modules.idempotency import IdempotencyCache
+from modules import holds
+from modules.holds import Hold, HoldBook
+from modules.booking_columns import BookingColumns, BookingPage, Cursor
+from modules.rollups import BookingRollups
+from modules.forecast import Forecaster
+
+logger = logging.getLogger(__name__)
 
 # --- 시스템 클래스 ---
 class TimeBankSystem:
-    def __init__(self):
+    def __init__(self, repository: Optional[Repository] = None):
+        # 저장소 미지정 시 메모리 저장소 사용 (테스트/스크립트용)
+        self._repository: Repository = repository if repository is not None else InMemoryRepository()
         self._bookings: List[Booking] = []
+        self._booking_by_id: Dict[str, Booking] = {}
+        self._availability = IntervalIndex() # (unit_id, time_slot) -> 예약 구간
+        self._slot_calendar = SlotOccupancy() # 달력용 시간대 점유 비트맵 (오늘부터 1년)
         self._regions: List[Region] = []
         self._all_campsites: List[Campsite] = []
-        self._users: Dict[str, User] = {} # Mock User Database
+        self._users: Dict[str, User] = {} # User Cache (원본은 Repository)
+        self._user_id_by_invite: Dict[str, str] = {} # invite_code -> user_id
+        self._user_id_by_email: Dict[str, str] = {} # email(소문자) -> user_id
+        self._catalog_index = CatalogIndex() # id 조회 및 지역/태그/인원별 후보 집합
+        self._locks = BookingLocks() # 숙소/사용자 단위 lock striping
+        self._registry_lock = threading.Lock() # 사용자 등록, 달력 재구성용
+        self._sync_lock = threading.Lock() # 다른 워커 변경 따라잡기 직렬화
+        self._change_seq = 0 # 메모리 인덱스에 반영한 저장소 변경 번호
+        node_id = resolve_node_id(self._repository.claim_node_id) # 워커마다 다른 ID 노드 번호
+        self._booking_ids = IdGenerator("bk_", node_id) # 생성 시각순 정렬되는 예약번호
+        self._price_calendar = pricing.PriceCalendar() # 숙소별 1년 가격표 캐시
+        self._dynamic_pricer = DynamicPricer(self._catalog_index) # 점유율 기반 (숙소, 날짜, 시간대) 가격 캐시
+        self._points_ledger = PointsLedger(node_id) # 포인트 원장 + 사용자별 잔액
+        self._idempotent_bookings = IdempotencyCache() # 멱등성 키 -> 처음 생성된 예약
+        self._holds = HoldBook() # 결제 전 임시 확보 (만료 시각 최소 힙)
+        self._hold_ids = IdGenerator("hd_", node_id)
+        self._booking_columns = BookingColumns(self._locate_unit) # 관리자 조회용 예약 컬럼 미러
+        self._rollups = BookingRollups() # 관리자 통계용 증분 집계 (확정 예약 기준)
+        self._occupancy_cache: Optional[Tuple[tuple, pd.DataFrame]] = None # (예약 컬럼 version, 시작일, 일수) -> 점유 격자
         self._init_data()
+        self._catalog_index.build(self._regions, self._all_campsites)
+        self._load_state()
         self._init_mock_users()
+        self._forecaster = Forecaster([c.id for c in self._all_campsites if c.units], self._forecast_history)
+
+    def _load_state(self):
+        """저장소에서 사용자 및 예약 내역 복원 (이후 변경은 _sync_changes로 따라잡음)"""
+        self._change_seq = self._repository.change_seq()
+        self._users, self._user_id_by_invite, self._user_id_by_email = self._build_user_indexes(self._repository.load_users())
+        entries = self._repository.load_ledger_entries()
+        self._points_ledger.load(entries)
+        self._reconcile_points(list(self._users.values()))
+        self._bookings = self._repository.load_bookings()
+        for booking in self._bookings:
+            self._index_booking(booking)
+        self._booking_columns.extend(self._bookings)
+        self._rollup_points(entries)
+
+    def _locate_unit(self, unit_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """숙소의 (캠핑장 id, 지역 id)"""
+        campsite = self._catalog_index.campsite_by_unit.get(unit_id)
+        return (campsite.id, campsite.region_id) if campsite else (None, None)
+
+    def _record_points(self, entries: List[LedgerEntry]):
+        """저장된 원장 항목을 메모리 원장과 통계 롤업에 반영 (이미 반영한 항목은 건너뜀)"""
+        self._rollup_points(self._points_ledger.apply(entries))
+
+    def _sync_changes(self):
+        """다른 워커가 저장소에 커밋한 사용자/예약/원장 변경을 메모리 인덱스에 반영. 락을 잡지 않은 상태에서 호출
+
+        변경이 없으면 변경 번호 조회 한 번으로 끝나며, 이미 반영한 항목(자기 프로세스의 커밋 포함)은 건너뜁니다.
+        """
+        if self._repository.change_seq() == self._change_seq:
+            return
+        with self._sync_lock:
+            seq, users, bookings, entries = self._repository.changes_since(self._change_seq)
+            if seq == self._change_seq:
+                return
+            self._adopt_users(users)
+            for stored in bookings:
+                booking = self._booking_by_id.get(stored.id)
+                if booking is not None and not (stored.status == "CANCELLED" and booking.status == "CONFIRMED"):
+                    continue
+                with self._locks.hold(unit_ids=[stored.unit_id]):
+                    if booking is None:
+                        self._adopt_bookings([stored])
+                    else:
+                        self._mark_cancelled(booking)
+            self._record_points(entries)
+            self._change_seq = seq
+
+    def _adopt_users(self, users: List[User]):
+        """저장된 사용자를 캐시에 반영 (신규 등록은 인덱스에 추가, 기존 사용자는 잔액/멤버십/초대 실적 갱신)"""
+        with self._registry_lock:
+            for stored in users:
+                user = self._users.get(stored.id)
+                if user is None:
+                    self._users[stored.id] = stored
+                    self._user_id_by_invite[stored.invite_code] = stored.id
+                    self._user_id_by_email[stored.email.lower()] = stored.id
+                else:
+                    user.points, user.is_member = stored.points, stored.is_member
+                    user.referral_count, user.total_earnings = stored.referral_count, stored.total_earnings
+
+    def _adopt_bookings(self, bookings: List[Booking]):
+        """저장된 예약을 목록/인덱스/컬럼에 반영 (이미 반영한 예약은 건너뜀). 숙소 락 안에서 호출"""
+        bookings = [b for b in bookings if b.id not in self._booking_by_id]
+        for booking in bookings:
+            self._bookings.append(booking)
+            self._index_booking(booking)
+        self._booking_columns.extend(bookings)
+
+    def _mark_cancelled(self, booking: Booking):
+        """확정 예약을 취소 상태로 바꾸고 인덱스에서 해제 (이미 취소 반영됐으면 무시). 숙소 락 안에서 호출"""
+        if booking.status != "CONFIRMED":
+            return
+        self._unindex_booking(booking)
+        booking.status = "CANCELLED"
+        self._booking_columns.set_status(booking.id, "CANCELLED")
+
+    def _rollup_points(self, entries: List[LedgerEntry]):
+        """지급 포인트(적립, 초대 리워드, 멤버십 페이백과 그 되돌림)를 통계 롤업에 반영 (예약 항목은 예약 인덱싱 후)"""
+        for entry in entries:
+            if entry.kind not in points_ledger.ISSUED:
+                continue
+            booking = self._booking_by_id.get(entry.booking_id) if entry.booking_id else None
+            if booking:
+                self._rollups.apply_points(entry.amount, booking.check_in, bool(booking.is_member),
+                                           *self._locate_unit(booking.unit_id))
+            else:
+                self._rollups.apply_points(entry.amount, entry.created_at.date(),
+                                           entry.kind == points_ledger.MEMBERSHIP_PAYBACK)
+
+    def _index_booking(self, booking: Booking):
+        """예약을 조회용 인덱스에 반영"""
+        self._booking_by_id[booking.id] = booking
+        if booking.status == "CONFIRMED":
+            start, end = stay_range(booking.check_in, booking.check_out)
+            self._availability.add((booking.unit_id, booking.time_slot), start, end, booking.id)
+            self._slot_calendar.mark(booking.unit_id, booking.time_slot, start, end)
+            self._dynamic_pricer.invalidate(booking.unit_id, start, end)
+            self._rollups.apply(booking, *self._locate_unit(booking.unit_id))
+
+    def _unindex_booking(self, booking: Booking):
+        """취소된 예약을 가용성 인덱스에서 제거"""
+        self._rollups.apply(booking, *self._locate_unit(booking.unit_id), sign=-1)
+        start, end = stay_range(booking.check_in, booking.check_out)
+        self._availability.remove((booking.unit_id, booking.time_slot), start, booking.id)
+        self._slot_calendar.clear(booking.unit_id, booking.time_slot, start, end)
+        self._dynamic_pricer.invalidate(booking.unit_id, start, end)
+
+    def _index_hold(self, hold: Hold):
+        """임시 확보 구간을 예약과 같은 가용성 인덱스/달력에 반영 (숙소 락 안에서 호출)"""
+        start, end = stay_range(hold.check_in, hold.check_out)
+        self._availability.add((hold.unit_id, hold.time_slot), start, end, hold.id)
+        self._slot_calendar.mark(hold.unit_id, hold.time_slot, start, end)
+        self._dynamic_pricer.invalidate(hold.unit_id, start, end)
+
+    def _unindex_hold(self, hold: Hold):
+        start, end = stay_range(hold.check_in, hold.check_out)
+        self._availability.remove((hold.unit_id, hold.time_slot), start, hold.id)
+        self._slot_calendar.clear(hold.unit_id, hold.time_slot, start, end)
+        self._dynamic_pricer.invalidate(hold.unit_id, start, end)
+
+    def _sweep_holds(self):
+        """만료된 임시 확보 해제 (만료된 것이 없으면 힙 맨 앞만 확인). 락을 잡지 않은 상태에서 호출"""
+        if not self._holds.has_expired():
+            return
+        for hold in self._holds.pop_expired():
+            with self._locks.hold(unit_ids=[hold.unit_id]):
+                self._unindex_hold(hold)
+
+    def _reconcile_points(self, users: List[User]):
+        """저장된 User.points와 원장 합계가 다른 사용자를 경고로 남김 (원장이 기준이므로 자동 보정하지 않음)"""
+        for u in users:
+            ledger_balance = self._points_ledger.balance(u.id)
+            if u.points != ledger_balance:
+                logger.warning("Points balance of user %s (%d) differs from ledger total (%d)",
+                               u.id, u.points, ledger_balance)
+
+    def _get_slot_calendar(self) -> SlotOccupancy:
+        """날짜가 바뀌었으면 비트맵 윈도우를 오늘 기준으로 다시 구성"""
+        self._sync_changes()
+        self._sweep_holds()
+        today = datetime.date.today()
+        if self._slot_calendar.base != today.toordinal():
+            with self._registry_lock:
+                if self._slot_calendar.base != today.toordinal():
+                    self._slot_calendar.reset(today)
+                    for booking in list(self._bookings):
+                        if booking.status == "CONFIRMED":
+                            start, end = stay_range(booking.check_in, booking.check_out)
+                            self._slot_calendar.mark(booking.unit_id, booking.time_slot, start, end)
+                    for hold in self._holds.active():
+                        start, end = stay_range(hold.check_in, hold.check_out)
+                        self._slot_calendar.mark(hold.unit_id, hold.time_slot, start, end)
+        return self._slot_calendar
+
 
     def _init_mock_users(self):
         """테스트용 사용자 초기화"""
-        # 데모 유저 생성
-        demo_user = User(id="demo_user", name="김타임", email="demo@timebank.com")
-        self._users["demo_user"] = demo_user
+        # 데모 유저 생성 (저장소에 이미 있으면 유지)
+        if "demo_user" not in self._users:
+            self.add_user(User(id="demo_user", name="김타임", email="demo@timebank.com"))
+
+    @staticmethod
+    def _build_user_indexes(users: List[User]) -> Tuple[Dict[str, User], Dict[str, str], Dict[str, str]]:
+        """사용자 목록으로 id / 초대코드 / 이메일 인덱스를 한 번에 구성 (중복 시 ValueError)"""
+        by_id: Dict[str, User] = {}
+        by_invite: Dict[str, str] = {}
+        by_email: Dict[str, str] = {}
+        for user in users:
+            if user.id in by_id:
+                raise ValueError(f"Duplicate user id: {user.id}")
+            email = user.email.lower()
+            if by_invite.setdefault(user.invite_code, user.id) != user.id:
+                raise ValueError(f"Duplicate invite code: {user.invite_code}")
+            if by_email.setdefault(email, user.id) != user.id:
+                raise ValueError(f"Duplicate email: {user.email}")
+            by_id[user.id] = user
+        return by_id, by_invite, by_email
 
     def _init_data(self):
         """5대 랜드마크 Mock Data 초기화"""
@@ -163,142 +326,553 @@ class TimeBankSystem:
         return self._regions
 
     def get_campsites_by_region(self, region_name: str) -> List[Campsite]:
+        """지역 이름 또는 id로 캠핑장 목록 조회 ("지도 전체"는 전체 목록)"""
         if region_name == "지도 전체":
             return self._all_campsites
-        target_region = next((r for r in self._regions if r.name == region_name), None)
-        if not target_region:
-            return []
-        return [c for c in self._all_campsites if c.region_id == target_region.id]
+        return list(self._catalog_index.campsites_by_region.get(region_name, []))
     
     def get_all_campsites(self) -> List[Campsite]:
         return self._all_campsites
 
     def get_all_units(self) -> List[Unit]:
-        units = []
-        for c in self._all_campsites:
-            units.extend(c.units)
-        return units
+        return list(self._catalog_index.units.values())
     
     def find_unit_by_id(self, unit_id: str) -> Optional[Unit]:
-        for c in self._all_campsites:
-            for u in c.units:
-                if u.id == unit_id:
-                    return u
-        return None
+        return self._catalog_index.units.get(unit_id)
+
+    def get_campsite(self, campsite_id: str) -> Optional[Campsite]:
+        return self._catalog_index.campsites.get(campsite_id)
+
+    def get_campsite_for_unit(self, unit_id: str) -> Optional[Campsite]:
+        """숙소가 속한 캠핑장 (역방향 인덱스)"""
+        return self._catalog_index.campsite_by_unit.get(unit_id)
+
+    def add_region(self, region: Region):
+        """지역 추가 (인덱스 동기화 포함)"""
+        self._regions.append(region)
+        self._catalog_index.add_region(region)
+
+    def add_campsite(self, campsite: Campsite):
+        """캠핑장 추가 (인덱스 동기화 포함)"""
+        if campsite.id in self._catalog_index.campsites:
+            raise ValueError("Campsite already exists")
+        self._all_campsites.append(campsite)
+        self._catalog_index.add_campsite(campsite)
 
     def get_user(self, user_id: str) -> Optional[User]:
+        self._sync_changes()
         return self._users.get(user_id)
 
+    def find_user_by_email(self, email: str) -> Optional[User]:
+        self._sync_changes()
+        user_id = self._user_id_by_email.get(email.lower())
+        return self._users.get(user_id) if user_id else None
+
+    def add_user(self, user: User) -> User:
+        """사용자 등록 (id / 초대코드 / 이메일 중복 불가)"""
+        self._sync_changes()
+        with self._registry_lock:
+            if user.id in self._users:
+                raise ValueError("User already exists")
+            if user.invite_code in self._user_id_by_invite:
+                raise ValueError("Invite code already in use")
+            email = user.email.lower()
+            if email in self._user_id_by_email:
+                raise ValueError("Email already registered")
+            # 가입 시 지급 포인트는 등록과 같은 트랜잭션의 원장 항목으로 기록
+            entries = self._points_ledger.draft([(user.id, points_ledger.ADJUSTMENT, user.points, None)])
+            self._repository.save_users([user], entries)
+            self._record_points(entries)
+            self._users[user.id] = user
+            self._user_id_by_invite[user.invite_code] = user.id
+            self._user_id_by_email[email] = user.id
+            return user
+
+    def import_users(self, users: List[User]):
+        """사용자 일괄 등록: 기존 사용자와 합쳐 인덱스를 한 번에 재구성"""
+        with self._registry_lock:
+            by_id, by_invite, by_email = self._build_user_indexes(list(self._users.values()) + list(users))
+            entries = self._points_ledger.draft((u.id, points_ledger.ADJUSTMENT, u.points, None) for u in users)
+            self._repository.save_users(list(users), entries)
+            self._record_points(entries)
+            self._users, self._user_id_by_invite, self._user_id_by_email = by_id, by_invite, by_email
+
+    def get_booking(self, booking_id: str) -> Optional[Booking]:
+        return self._repository.get_booking(booking_id)
+
+    def get_user_bookings(self, user_id: str) -> List[Booking]:
+        """사용자별 예약 내역 (저장소 인덱스 조회)"""
+        return self._repository.find_bookings_by_user(user_id)
+
+    def get_unit_bookings(self, unit_id: str) -> List[Booking]:
+        """숙소별 예약 내역 (저장소 인덱스 조회)"""
+        return self._repository.find_bookings_by_unit(unit_id)
+
+    def query_bookings_page(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None,
+                            is_member: Optional[bool] = None, status: Optional[str] = None,
+                            sort_by: str = "created_at", descending: bool = True,
+                            after: Optional[Cursor] = None, limit: int = 50) -> BookingPage:
+        """관리자 조회 (페이지 단위): 정렬 키(created_at/check_in/final_price) + 예약 ID keyset 페이지네이션"""
+        self._sync_changes()
+        return self._booking_columns.page(start, end, is_member, status, sort_by, descending, after, limit,
+                                          self._booking_labels())
+
+    def _booking_labels(self) -> Dict[str, Dict[str, str]]:
+        return {
+            "campsite_id": {c.id: c.name for c in self._all_campsites},
+            "region_id": {r.id: r.name for r in self._regions},
+        }
+
+    def get_booking_stats(self, grain: str, is_member: Optional[bool] = None) -> pd.DataFrame:
+        """관리자 통계: grain(day/month/campsite/region/campsite_month/region_month)별 미리 집계된
+        매출/예약 수/지급 포인트/점유 숙소-일/점유율 (확정 예약, 포인트는 원장 기준)"""
+        self._sync_changes()
+        units: Dict[str, int] = {}
+        for c in self._all_campsites:
+            key = c.region_id if grain.startswith("region") else c.id
+            units[key] = units.get(key, 0) + len(c.units)
+        return self._rollups.frame(grain, is_member, units, len(self._catalog_index.units))
+
+    def get_booking_totals(self, is_member: Optional[bool] = None) -> Dict[str, float]:
+        self._sync_changes()
+        return self._rollups.totals(is_member)
+
+    def get_occupancy_grid(self, start: Optional[datetime.date] = None, days: int = 183) -> pd.DataFrame:
+        """관리자 히트맵: 숙소(행, 캠핑장 순) × 날짜(열) 점유율 (확정 예약 기준, 기본 오늘부터 6개월)
+
+        예약이 바뀌기 전까지(예약 컬럼 version 기준) 계산 결과를 재사용하므로 반환값을 수정하지 마세요.
+        """
+        self._sync_changes()
+        start = start or datetime.date.today()
+        columns = self._booking_columns
+        key = (columns.version, start, days)
+        cached = self._occupancy_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        unit_ids = [u.id for c in self._all_campsites for u in c.units]
+        grid = pd.DataFrame(columns.occupancy(unit_ids, start, days), index=pd.Index(unit_ids, name="unit_id"),
+                            columns=pd.date_range(start, periods=days, freq="D"))
+        self._occupancy_cache = (key, grid)
+        return grid
+
+    def _forecast_history(self, start: datetime.date, days: int) -> Dict[str, np.ndarray]:
+        """예측 학습용 과거 관측: 캠핑장별 일 매출(체크인 기준)과 평균 점유율 (days × 캠핑장 수)"""
+        self._sync_changes()
+        campsites = [c for c in self._all_campsites if c.units]
+        unit_ids = [u.id for c in campsites for u in c.units]
+        sizes = np.array([len(c.units) for c in campsites])
+        occupancy = self._booking_columns.occupancy(unit_ids, start, days)
+        occupancy = np.add.reduceat(occupancy, np.cumsum(sizes) - sizes, axis=0) / sizes[:, None]
+        revenue = self._booking_columns.daily_sum("final_price", "campsite_id", [c.id for c in campsites], start, days)
+        return {"revenue": revenue.T, "occupancy": occupancy.T}
+
+    def get_forecast(self, today: Optional[datetime.date] = None) -> pd.DataFrame:
+        """관리자 통계: 캠핑장별 향후 매출/점유율 예측 (date, campsite_id, revenue, occupancy, 캐시)"""
+        return self._forecaster.forecast(today)
+
+    def get_forecast_status(self) -> Tuple[Optional[datetime.date], int]:
+        """(학습 기준일, 학습에 사용한 날짜 수)"""
+        return self._forecaster.fitted_until, self._forecaster.n_days
+
+    def start_forecast_refresh(self) -> None:
+        """예측 모델 최초 학습 + 매일 밤 증분 재학습 백그라운드 작업 시작 (앱 진입점 launcher.py에서 호출)"""
+        self._forecaster.start_nightly_refit()
+
+    def get_bookings_between(self, since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                             limit: Optional[int] = None) -> List[Booking]:
+        """생성 시각 [since, until) 구간의 예약을 최신순으로 조회 (예약번호 인덱스 구간 스캔)"""
+        start_id = self._booking_ids.lower_bound(since) if since else "bk_"
+        end_id = self._booking_ids.lower_bound(until) if until else "bk_~"
+        return self._repository.find_bookings_between(start_id, end_id, limit)
+
+    def is_available(self, unit_id: str, check_in: datetime.date, check_out: datetime.date, time_slot: str = "OVERNIGHT") -> bool:
+        """해당 숙소/시간대가 기간 내 예약 가능한지 여부 (O(log n), 다른 사용자의 임시 확보 포함)"""
+        self._sync_changes()
+        self._sweep_holds()
+        return self._is_free(unit_id, check_in, check_out, time_slot)
+
+    def _is_free(self, unit_id: str, check_in: datetime.date, check_out: datetime.date, time_slot: str) -> bool:
+        """만료 정리 없이 가용성 인덱스만 조회 (숙소 락 안에서 사용)"""
+        start, end = stay_range(check_in, check_out)
+        return not self._availability.overlaps((unit_id, time_slot), start, end)
+
+    def get_unavailable_dates(self, unit_id: str, time_slot: str = "OVERNIGHT", days: int = 90) -> List[datetime.date]:
+        """오늘부터 days일 중 해당 시간대가 마감된 날짜 목록 (달력 비활성화용)"""
+        today = datetime.date.today()
+        busy = self._get_slot_calendar().busy_mask(unit_id, time_slot, today, days)
+        return [today + datetime.timedelta(days=int(i)) for i in np.flatnonzero(busy)]
+
+    def get_full_dates(self, unit_id: str, days: int = 90) -> List[datetime.date]:
+        """오늘부터 days일 중 모든 시간대가 마감된 날짜 목록"""
+        today = datetime.date.today()
+        full = self._get_slot_calendar().full_mask(unit_id, today, days)
+        return [today + datetime.timedelta(days=int(i)) for i in np.flatnonzero(full)]
+
+    def search_available(self, check_in: datetime.date, check_out: datetime.date, guests: int, slot: str = "OVERNIGHT",
+                         region: Optional[str] = None, tags: Optional[List[str]] = None) -> List[Unit]:
+        """조건(인원/지역/태그)과 기간 내 예약 가능 여부를 모두 만족하는 숙소 목록
+
+        region은 지역 id 또는 이름("지도 전체"/None이면 전체), tags는 모두 포함해야 하는 태그입니다.
+        """
+        self._sync_changes()
+        if region == "지도 전체":
+            region = None
+        self._sweep_holds()
+        candidates = self._catalog_index.candidates(guests, region, tags)
+        start, end = stay_range(check_in, check_out)
+        available = [uid for uid in candidates if not self._availability.overlaps((uid, slot), start, end)]
+        available.sort(key=self._catalog_index.unit_order.__getitem__)
+        return [self._catalog_index.units[uid] for uid in available]
+
+    def allocate_group(self, check_in: datetime.date, check_out: datetime.date, guests: int,
+                       regions: Optional[List[str]] = None, slot: str = "OVERNIGHT", is_member: bool = False,
+                       membership_type: str = None, tags: Optional[List[str]] = None) -> Optional[Allocation]:
+        """단체 인원을 기간 내 빈 숙소들에 나눠 배정하는 최저가 조합 (불가능하면 None)
+
+        regions는 지역 id 또는 이름 목록(None이면 전체)이며, 숙소별 가격은
+        calculate_stay_price와 같은 요금 규칙으로 일괄 계산합니다.
+        """
+        self._sync_changes()
+        self._sweep_holds()
+        region_list = [r for r in (regions or []) if r != "지도 전체"] or [None]
+        candidates = set()
+        for region in region_list:
+            candidates |= self._catalog_index.candidates(1, region, tags)
+        start, end = stay_range(check_in, check_out)
+        free = sorted((uid for uid in candidates if not self._availability.overlaps((uid, slot), start, end)),
+                      key=self._catalog_index.unit_order.__getitem__)
+        units = [self._catalog_index.units[uid] for uid in free]
+        if not units:
+            return None
+
+        base = np.fromiter((pricing.base_price_of(u) for u in units), dtype=np.int64, count=len(units))
+        prices = pricing.quote_base_matrix(base, pricing.stay_nights(check_in, check_out), (slot,),
+                                           is_member, membership_type).sum(axis=(1, 2))
+        capacities = np.fromiter((u.max_guests for u in units), dtype=np.int64, count=len(units))
+        chosen = allocation.solve_cover(capacities, prices, guests)
+        if chosen is None:
+            return None
+        return Allocation(
+            units=[units[i] for i in chosen],
+            prices=[int(prices[i]) for i in chosen],
+            total_price=int(prices[chosen].sum()),
+            capacity=int(capacities[chosen].sum()),
+        )
+
+    def hold_unit(self, unit_id: str, user_id: str, check_in: datetime.date, check_out: datetime.date,
+                  time_slot: str = "OVERNIGHT", ttl_seconds: int = None) -> Hold:
+        """결제를 마칠 때까지 (숙소, 기간, 시간대)를 ttl_seconds 동안 임시 확보
+
+        확보된 구간은 다른 사용자에게 예약 불가로 보이며, create_booking(hold_id=...)으로 예약 전환합니다.
+        """
+        self._sync_changes()
+        unit = self.find_unit_by_id(unit_id)
+        if not unit:
+            raise ValueError("Unit not found")
+        user = self._resolve_booking_user(user_id)
+        ttl = holds.DEFAULT_HOLD_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._sweep_holds()
+        with self._locks.hold(unit_ids=[unit.id]):
+            if not self._is_free(unit.id, check_in, check_out, time_slot):
+                raise ValueError("Unit not available for the selected dates")
+            hold = Hold(
+                id=self._hold_ids.next_id(),
+                unit_id=unit.id,
+                user_id=user.id,
+                check_in=check_in,
+                check_out=check_out,
+                time_slot=time_slot,
+                expires_at=self._holds.clock() + datetime.timedelta(seconds=ttl),
+            )
+            self._holds.add(hold)
+            self._index_hold(hold)
+        return hold
+
+    def get_hold(self, hold_id: str) -> Optional[Hold]:
+        """만료되지 않은 임시 확보 (없거나 만료되면 None)"""
+        return self._holds.get(hold_id) if hold_id else None
+
+    def release_hold(self, hold_id: str) -> bool:
+        """임시 확보 취소 (결제 포기, 날짜 변경 등)"""
+        hold = self._holds.get(hold_id)
+        if hold is None:
+            return False
+        with self._locks.hold(unit_ids=[hold.unit_id]):
+            if self._holds.remove(hold_id) is None:
+                return False
+            self._unindex_hold(hold)
+        return True
+
+    def _claim_hold(self, hold_id: str, user_id: str, unit_id: str, check_in: datetime.date,
+                    check_out: datetime.date, time_slot: str) -> Hold:
+        """예약 전환할 확보를 목록/인덱스에서 꺼냄 (숙소 락 안에서 호출)"""
+        hold = self._holds.get(hold_id)
+        if hold is None:
+            raise ValueError("Hold not found or expired")
+        if hold.user_id != user_id or not hold.matches(unit_id, check_in, check_out, time_slot):
+            raise ValueError("Hold does not match the booking")
+        if self._holds.remove(hold_id) is None:
+            raise ValueError("Hold not found or expired") # 방금 만료 처리됨
+        self._unindex_hold(hold)
+        return hold
+
+    def cancel_booking(self, booking_id: str) -> Booking:
+        """예약 취소 (가용성 인덱스에서 즉시 해제)
+
+        예약으로 생긴 포인트 변동(사용, 적립, 초대 리워드)을 되돌리는 원장 항목을
+        상태 변경과 같은 트랜잭션으로 기록합니다.
+        """
+        self._sync_changes()
+        booking = self._booking_by_id.get(booking_id)
+        if not booking:
+            # 마지막 동기화 이후 다른 워커가 만든 예약일 수 있으므로 저장소에서 확인
+            stored = self._repository.get_booking(booking_id)
+            if not stored:
+                raise ValueError("Booking not found")
+            with self._locks.hold(unit_ids=[stored.unit_id]):
+                self._adopt_bookings([stored])
+            booking = self._booking_by_id[booking_id]
+        # 예약 원장 항목은 생성 후 바뀌지 않으므로 락 밖에서 조회 (중복 취소는 저장소가 상태로 걸러냄)
+        posted = self._repository.find_booking_ledger_entries(booking_id)
+        user_ids = sorted({booking.user_id} | {e.user_id for e in posted})
+        with self._locks.hold(unit_ids=[booking.unit_id], user_ids=user_ids):
+            if booking.status == "CANCELLED":
+                return booking
+            entries = self._points_ledger.draft(points_ledger.reversals_of(posted))
+            users = [self._users[u] for u in user_ids if u in self._users]
+            try:
+                cancelled = self._repository.cancel_booking(booking_id, entries)
+            finally:
+                self._refresh_users(users)
+            if cancelled:
+                self._record_points(entries)
+                self._mark_cancelled(booking)
+                return booking
+        # 다른 워커가 먼저 취소함: 그 워커가 기록한 상태와 되돌림 항목을 그대로 따라잡음
+        self._sync_changes()
+        return booking
+
     def join_membership(self, user_id: str, plan_price: int = 50000):
         """멤버십 가입 및 포인트 지급 로직"""
+        self._sync_changes()
         user = self._users.get(user_id)
         if not user:
             raise ValueError("User not found")
         
-        if user.is_member:
-            return # Already member
+        with self._locks.hold(user_ids=[user.id]):
+            if user.is_member:
+                return # Already member
+                
+            # 1. 실제로는 여기서 PG 결제 로직 수행 (50,000원)
             
-        # 1. 실제로는 여기서 PG 결제 로직 수행 (50,000원)
-        
-        # 2. 멤버십 활성화 및 포인트 지급 (즉시 페이백)
-        user.is_member = True
-        user.points += plan_price
-        
+            # 2. 멤버십 활성화 및 포인트 지급 (즉시 페이백). 저장소가 가입 여부를 트랜잭션 안에서 다시 확인
+            entries = self._points_ledger.draft([(user.id, points_ledger.MEMBERSHIP_PAYBACK, plan_price, None)])
+            try:
+                self._repository.save_points(entries)
+            except ValueError:
+                self._refresh_users([user])
+                if user.is_member:
+                    return # 다른 워커에서 이미 가입
+                raise
+            self._refresh_users([user])
+            self._record_points(entries)
+
+    def expire_points(self, as_of: Optional[datetime.date] = None, dry_run: bool = False,
+                      notifier: Optional[points_expiry.Notifier] = None) -> points_expiry.ExpiryResult:
+        """유효기간이 지난 포인트 일괄 소멸 (FIFO) 및 소멸/예정 알림 일괄 발송"""
+        self._sync_changes()
+        as_of = as_of or datetime.date.today()
+        # 배치 중 포인트 변동을 막기 위해 모든 사용자 락을 잡음 (숙소 락은 잡지 않으므로 순서 규칙 유지)
+        with self._locks.hold(user_ids=list(self._users)):
+            user_ids, amounts, issued, kinds, booking_ids = self._points_ledger.columns()
+            user_ids, user_index = np.unique(user_ids.astype(str), return_inverse=True)
+            user_index, amounts, issued = points_expiry.net_reversals(user_index, amounts, issued, kinds, booking_ids)
+            expired, expiring = points_expiry.fifo_expiry(user_index, amounts, issued, len(user_ids), as_of.toordinal())
+            notices = points_expiry.build_notices(user_ids, expired, expiring, as_of)
+            targets = np.flatnonzero(expired)
+            if not dry_run and len(targets):
+                entries = self._points_ledger.draft(
+                    (str(user_ids[i]), points_ledger.EXPIRE, -int(expired[i]), None) for i in targets
+                )
+                users = [self._users[e.user_id] for e in entries if e.user_id in self._users]
+                try:
+                    self._repository.save_points(entries)
+                finally:
+                    self._refresh_users(users)
+                self._record_points(entries)
+        if not dry_run:
+            (notifier or points_expiry.write_outbox)(notices)
+        return points_expiry.ExpiryResult(as_of, len(targets), int(expired.sum()), notices)
+
+    def get_points_balance(self, user_id: str) -> int:
+        """포인트 잔액 (저장소가 원장 합계로 유지하는 값, 다른 워커의 변경 포함)"""
+        user = self._repository.get_user(user_id)
+        return user.points if user else 0
+
+    def get_points_history(self, user_id: str, limit: Optional[int] = None) -> List[LedgerEntry]:
+        """포인트 변동 내역 (최신순)"""
+        self._sync_changes()
+        return self._points_ledger.history(user_id, limit)
+
+    def get_points_statement(self, user_id: str, year: int, month: int) -> Statement:
+        """월별 포인트 명세서 (기초/기말 잔액, 적립/사용 합계, 내역)
+
+        저장소의 원장을 ID 구간으로 조회하므로 다른 워커가 기록한 항목도 포함됩니다.
+        balance_after는 저장 트랜잭션 안에서 계산된 값이라 기초 잔액은 첫 항목(없으면 직전 항목)에서 구합니다.
+        """
+        start_id, end_id = self._points_ledger.month_range(year, month)
+        window = self._repository.find_ledger_entries(user_id, start_id, end_id)
+        if window:
+            opening = window[0].balance_after - window[0].amount
+        else:
+            previous = self._repository.last_ledger_entry_before(user_id, start_id)
+            opening = previous.balance_after if previous else 0
+        return points_ledger.build_statement(user_id, year, month, window, opening)
+
     def find_user_by_invite_code(self, code: str) -> Optional[User]:
-        for user in self._users.values():
-            if user.invite_code == code:
-                return user
-        return None
+        self._sync_changes()
+        user_id = self._user_id_by_invite.get(code)
+        return self._users.get(user_id) if user_id else None
 
     def calculate_price(self, campsite_or_unit, is_member: bool, membership_type: str, time_slot: str, is_weekend: bool) -> int:
-        """가격 계산 로직 (기존 booking.py 로직 이관)"""
-        # campsite_or_unit 처리
-        base_price = 0
-        if isinstance(campsite_or_unit, Campsite):
-             base_price = campsite_or_unit.base_price_weekday
-        elif isinstance(campsite_or_unit, Unit):
-             base_price = campsite_or_unit.price
-        
-        # 주말 할증 (20%)
-        if is_weekend:
-            base_price = int(base_price * 1.2)
-            
-        # 시간대별 조정
-        # time_slot: AM(0.5), PM(0.6), OVERNIGHT(1.0)
-        multiplier = 1.0
-        if time_slot == "AM":
-            multiplier = 0.5
-        elif time_slot == "PM":
-            multiplier = 0.6
-        elif time_slot == "OVERNIGHT":
-            multiplier = 1.0
-            
-        final_price = int(base_price * multiplier)
+        """가격 계산 로직 (규칙은 modules/pricing_rules.py의 실행 계획과 공유)"""
+        return pricing.quote_price(pricing.base_price_of(campsite_or_unit), is_weekend, time_slot, is_member, membership_type)
+
+    def calculate_stay_price(self, campsite_or_unit, is_member: bool, membership_type: str, time_slot: str,
+                             check_in: datetime.date, check_out: datetime.date) -> int:
+        """숙박 기간 총액 (박마다 주말/공휴일/공휴일 전날 할증 적용)"""
+        return pricing.quote_stay(pricing.base_price_of(campsite_or_unit), check_in, check_out, time_slot,
+                                  is_member, membership_type)
+
+    def get_day_type(self, day: datetime.date) -> int:
+        """날짜 유형 (holidays.WEEKDAY / WEEKEND / HOLIDAY / HOLIDAY_EVE)"""
+        return holidays.day_calendar.day_type(day)
 
-        # 멤버십 할인 (100% 할인 = 0원)
+    def add_holidays(self, new_holidays: Dict[datetime.date, str]) -> List[datetime.date]:
+        """임시공휴일 추가: 유형이 바뀐 날짜만 가격표 캐시에서 다시 계산"""
+        with self._registry_lock:
+            changed = holidays.day_calendar.add_holidays(new_holidays)
+            self._price_calendar.refresh_dates(changed)
+            self._dynamic_pricer.invalidate_dates(changed)
+        return changed
+
+    def calculate_dynamic_price(self, unit_id: str, day: datetime.date, time_slot: str = "OVERNIGHT",
+                                is_member: bool = False) -> int:
+        """점유율/예약 시점/지역 수요를 반영한 1박 가격 (오늘부터 1년 이내, 그 밖은 정가)"""
         if is_member:
-            final_price = 0
-            
-        return final_price
+            return 0
+        unit = self.find_unit_by_id(unit_id)
+        if not unit:
+            raise ValueError("Unit not found")
+        calendar = self._get_slot_calendar()
+        offset = day.toordinal() - calendar.base
+        if not 0 <= offset < calendar.horizon:
+            return pricing.quote_stay(unit.price, day, day, time_slot, False)
+        return int(self._dynamic_pricer.prices(unit_id, calendar)[offset, self._dynamic_pricer.slots.index(time_slot)])
 
-    def create_booking(self, unit_id: str, user_id: str, check_in: datetime.date, check_out: datetime.date, guests: int, 
-                       used_points: int = 0, invite_code: str = None, 
-                       # 하위 호환 및 booking.py 파라미터 맞춤
-                       campsite_id: str = None, time_slot: str = None, is_member: bool = False, membership_type: str = None, payment_amount: int = None
-                       ) -> Booking:
-        
+    def get_dynamic_prices(self, unit_id: str, time_slot: str = "OVERNIGHT", days: int = 90) -> Tuple[List[datetime.date], np.ndarray]:
+        """오늘부터 days일 동안의 동적 가격 (캐시된 날짜는 재계산하지 않음)"""
+        if not self.find_unit_by_id(unit_id):
+            raise ValueError("Unit not found")
+        calendar = self._get_slot_calendar()
+        today = datetime.date.fromordinal(calendar.base)
+        prices = self._dynamic_pricer.prices(unit_id, calendar)[:days, self._dynamic_pricer.slots.index(time_slot)]
+        return [today + datetime.timedelta(days=i) for i in range(len(prices))], prices.copy()
+
+    def get_price_calendar(self, campsite_or_unit, time_slot: str = "OVERNIGHT") -> Tuple[List[datetime.date], np.ndarray]:
+        """오늘부터 1년간 날짜별 가격 (캐시된 최저가 달력)"""
+        today = datetime.date.today()
+        prices = self._price_calendar.get(campsite_or_unit, today)[:, self._price_calendar.slots.index(time_slot)]
+        return [today + datetime.timedelta(days=i) for i in range(len(prices))], prices
+
+    def get_cheapest_dates(self, campsite_or_unit, time_slot: str = "OVERNIGHT", count: int = 5) -> List[Tuple[datetime.date, int]]:
+        return self._price_calendar.cheapest_dates(campsite_or_unit, time_slot, count)
+
+    def quote_prices(self, targets: List, dates, slots=pricing.SLOTS, is_member: bool = False,
+                     membership_type: str = None) -> np.ndarray:
+        """숙소/캠핑장 × 날짜 × 시간대 가격 행렬 (calculate_price의 일괄 버전)"""
+        return pricing.quote_matrix(targets, dates, slots, is_member, membership_type)
+
+    def reload_pricing_rules(self, path: str = None) -> List[str]:
+        """요금 규칙 JSON을 다시 읽어 컴파일하고 가격 캐시를 비움 (배포 없이 규칙 변경). 규칙 이름 목록 반환"""
+        spec, _ = pricing_rules.load_rules(path)
+        plan = pricing_rules.compile_rules(spec)
+        with self._registry_lock:
+            pricing.set_plan(plan)
+            self._price_calendar.invalidate()
+            self._dynamic_pricer.invalidate_all()
+        return [step.name for step in plan.steps]
+
+    def _resolve_booking_user(self, user_id: str) -> User:
         user = self._users.get(user_id)
         # 데모 유저가 없으면 생성 (booking.py의 "current_user" 대응)
         if not user and user_id == "current_user":
-             user = User(id="current_user", name="게스트", email="guest@timebank.com")
-             self._users["current_user"] = user
+             try:
+                 user = self.add_user(User(id="current_user", name="게스트", email="guest@timebank.com"))
+             except ValueError:
+                 user = self._users.get("current_user") # 다른 세션이 먼저 생성한 경우
 
         if not user:
              # Fallback
              user = self._users.get("demo_user")
              if not user:
                 raise ValueError("User not found")
-             user_id = user.id
+        return user
 
-        # Unit or Campsite ID resolution
-        target_unit = None
-        if unit_id:
-            target_unit = self.find_unit_by_id(unit_id)
-        
-        # Campsite ID로 들어온 경우 첫 번째 Unit 선택 (간소화)
-        if not target_unit and campsite_id:
-            for c in self._all_campsites:
-                if c.id == campsite_id:
-                    if c.units:
-                        target_unit = c.units[0]
-                    break
-        
-        if not target_unit:
-             # Mock Unit if needed or raise error
-             # raise ValueError("Unit not found")
-             pass 
+    def _resolve_inviter(self, invite_code: Optional[str], user_id: str) -> Tuple[Optional[User], Optional[str]]:
+        """(초대한 사용자, 유효한 초대 코드). 본인 코드나 없는 코드는 무시"""
+        inviter_user = self.find_user_by_invite_code(invite_code) if invite_code else None
+        if inviter_user and inviter_user.id == user_id:
+            inviter_user = None
+        return inviter_user, (invite_code if inviter_user else None)
+
+    @staticmethod
+    def _point_snapshot(users: List[Optional[User]]) -> List[Tuple[User, int, int, int]]:
+        """저장 실패 시 되돌릴 포인트 상태"""
+        seen = {}
+        for u in users:
+            if u is not None and u.id not in seen:
+                seen[u.id] = (u, u.points, u.referral_count, u.total_earnings)
+        return list(seen.values())
 
+    @staticmethod
+    def _restore_points(rollback: List[Tuple[User, int, int, int]]):
+        for u, points, referral_count, total_earnings in rollback:
+            u.points, u.referral_count, u.total_earnings = points, referral_count, total_earnings
+
+    def _refresh_users(self, users: List[User]):
+        """캐시된 사용자의 잔액/멤버십/초대 실적을 저장소 값으로 갱신 (다른 워커의 변경 반영)"""
+        for user in users:
+            stored = self._repository.get_user(user.id)
+            if stored is not None:
+                user.points, user.is_member = stored.points, stored.is_member
+                user.referral_count, user.total_earnings = stored.referral_count, stored.total_earnings
+
+    def _draft_booking(self, user: User, target_unit: Optional[Unit], booking_unit_id: str, check_in: datetime.date,
+                       check_out: datetime.date, guests: int, slot: str, used_points: int,
+                       inviter_user: Optional[User], invite_code: Optional[str], payment_amount: Optional[int],
+                       is_member: bool = False, membership_type: Optional[str] = None, credit_referral: bool = True
+                       ) -> Tuple[Booking, List[User], List[Tuple[str, str, int, Optional[str]]]]:
+        """가격/할인/포인트 사용/리워드를 반영한 예약을 만듦 (사용자 포인트를 직접 변경).
+
+        (예약, 포인트가 변경된 사용자, 원장 posting 목록) 반환. 호출 측이 락을 잡고 저장 실패 시 되돌립니다.
+        credit_referral=False면 초대 할인만 적용하고 리워드는 호출 측이 기록합니다 (단체 예약).
+        """
         # 1. 가격 계산
         if payment_amount is not None:
             final_price = payment_amount
             original_price = payment_amount # 추정
         elif target_unit:
-            original_price = target_unit.price
+            original_price = self.calculate_stay_price(target_unit, is_member, membership_type, slot, check_in, check_out)
             final_price = original_price
         else:
             original_price = 0
             final_price = 0
 
-        inviter_user = None
-        
-        # 2. 초대 코드 할인 적용 (5%)
-        if invite_code:
-            inviter_user = self.find_user_by_invite_code(invite_code)
-            if inviter_user and inviter_user.id != user_id:
-                discount = int(original_price * 0.05)
-                final_price -= discount
-            else:
-                 invite_code = None
+        # 2. 초대 코드 할인 적용 (요금 규칙의 invite_discount)
+        if inviter_user:
+            discount = pricing.get_plan().invite_discount_of(original_price)
+            final_price -= discount
 
         # 3. 포인트 사용
         if used_points > 0:
@@ -310,12 +884,13 @@ class TimeBankSystem:
                 user.points -= used_points
             else:
                 raise ValueError("Not enough points")
-        
-        # 4. 예약 생성
+    
+        # 4. 예약 생성 (생성 시각은 예약번호에 기록된 시각과 일치시킴)
+        booking_id = self._booking_ids.next_id()
         booking = Booking(
-            id=f"bk_{len(self._bookings)+1}",
-            unit_id=unit_id if unit_id else (campsite_id if campsite_id else "unknown"),
-            user_id=user_id,
+            id=booking_id,
+            unit_id=booking_unit_id,
+            user_id=user.id,
             check_in=check_in,
             check_out=check_out,
             guests=guests,
@@ -323,26 +898,192 @@ class TimeBankSystem:
             final_price=final_price,
             used_points=used_points,
             earned_points=0,
-            invite_code_used=invite_code
+            invite_code_used=invite_code,
+            status="CONFIRMED",
+            created_at=self._booking_ids.timestamp_of(booking_id),
+            time_slot=slot,
+            is_member=is_member
         )
-        
+    
         # 5. 리워드 로직
+        touched_users = [user]
+        postings = [(user.id, points_ledger.SPEND, -used_points, booking.id)]
         if final_price > 0:
             reward_points = int(final_price * 0.05)
             user.points += reward_points
             booking.earned_points = reward_points
-            
-            if inviter_user:
-                referral_reward = int(final_price * 0.10)
-                inviter_user.points += referral_reward
-                inviter_user.referral_count += 1
-                inviter_user.total_earnings += referral_reward
+            postings.append((user.id, points_ledger.EARN, reward_points, booking.id))
+        
+            if inviter_user and credit_referral:
+                postings.append(self._credit_referral(inviter_user, final_price, booking.id))
+                touched_users.append(inviter_user)
+        return booking, touched_users, postings
 
-        self._bookings.append(booking)
-        return booking
+    @staticmethod
+    def _credit_referral(inviter_user: User, paid_amount: int, booking_id: str) -> Tuple[str, str, int, Optional[str]]:
+        """초대한 사용자에게 결제 금액의 10% 리워드 (초대 실적 1회). 원장 posting 반환"""
+        referral_reward = int(paid_amount * 0.10)
+        inviter_user.points += referral_reward
+        inviter_user.referral_count += 1
+        inviter_user.total_earnings += referral_reward
+        return inviter_user.id, points_ledger.REFERRAL, referral_reward, booking_id
+
+    def _commit_bookings(self, bookings: List[Booking], touched_users: List[User],
+                         postings: List[Tuple[str, str, int, Optional[str]]], rollback: List[Tuple[User, int, int, int]]):
+        """예약 + 원장 항목을 하나의 트랜잭션으로 저장한 뒤 메모리 인덱스에 반영
+
+        저장소는 원장 항목을 증감으로만 반영하므로, 저장 후(실패 시 포함) 캐시된 사용자를 저장소 값으로 갱신합니다.
+        """
+        entries = self._points_ledger.draft(postings)
+        users = list({u.id: u for u in touched_users}.values())
+        try:
+            if len(bookings) == 1:
+                self._repository.save_booking(bookings[0], entries)
+            else:
+                self._repository.save_bookings(bookings, entries)
+        except Exception:
+            self._restore_points(rollback)
+            self._refresh_users(users)
+            raise
+        self._refresh_users(users)
+        self._adopt_bookings(bookings)
+        self._record_points(entries)
+
+    def create_booking(self, unit_id: str, user_id: str, check_in: datetime.date, check_out: datetime.date, guests: int, 
+                       used_points: int = 0, invite_code: str = None, 
+                       # 하위 호환 및 booking.py 파라미터 맞춤
+                       campsite_id: str = None, time_slot: str = None, is_member: bool = False, membership_type: str = None, payment_amount: int = None,
+                       idempotency_key: str = None, hold_id: str = None
+                       ) -> Booking:
+        """예약 생성. idempotency_key가 같은 재제출(더블 클릭, 리런)은 처음 생성된 예약을 그대로 반환
+
+        hold_id를 주면 해당 임시 확보를 같은 락 안에서 예약으로 전환합니다 (실패 시 확보 유지).
+        """
+        if idempotency_key is not None:
+            return self._idempotent_bookings.run(idempotency_key, lambda: self.create_booking(
+                unit_id, user_id, check_in, check_out, guests, used_points, invite_code, campsite_id=campsite_id,
+                time_slot=time_slot, is_member=is_member, membership_type=membership_type,
+                payment_amount=payment_amount, hold_id=hold_id))
+
+        self._sync_changes()
+        user = self._resolve_booking_user(user_id)
+
+        # Unit or Campsite ID resolution
+        target_unit = None
+        if unit_id:
+            target_unit = self.find_unit_by_id(unit_id)
+        
+        # Campsite ID로 들어온 경우 첫 번째 Unit 선택 (간소화)
+        if not target_unit and campsite_id:
+            campsite = self.get_campsite(campsite_id)
+            if campsite and campsite.units:
+                target_unit = campsite.units[0]
+        
+        if not target_unit:
+             # Mock Unit if needed or raise error
+             # raise ValueError("Unit not found")
+             pass 
+
+        slot = time_slot or "OVERNIGHT"
+        booking_unit_id = target_unit.id if target_unit else (unit_id if unit_id else (campsite_id if campsite_id else "unknown"))
+
+        # 초대한 사용자 확인 (할인 적용은 락 획득 후)
+        inviter_user, invite_code = self._resolve_inviter(invite_code, user.id)
+
+        self._sweep_holds()
+        # 숙소 락 → 사용자(지갑) 락 순서로 획득: 같은 숙소/같은 지갑만 직렬화
+        with self._locks.hold(unit_ids=[booking_unit_id], user_ids=[user.id, inviter_user.id if inviter_user else None]):
+            # 본인의 임시 확보는 가용성 확인 전에 꺼냄
+            claimed = self._claim_hold(hold_id, user.id, booking_unit_id, check_in, check_out, slot) if hold_id else None
+            try:
+                # 0. 중복 예약 확인
+                if target_unit and not self._is_free(target_unit.id, check_in, check_out, slot):
+                    raise ValueError("Unit not available for the selected dates")
+
+                rollback = self._point_snapshot([user, inviter_user])
+                booking, touched_users, postings = self._draft_booking(
+                    user, target_unit, booking_unit_id, check_in, check_out, guests, slot, used_points,
+                    inviter_user, invite_code, payment_amount, is_member, membership_type)
+
+                # 6. 저장 (예약 + 포인트 변경 + 원장 항목을 하나의 트랜잭션으로)
+                self._commit_bookings([booking], touched_users, postings, rollback)
+            except Exception:
+                if claimed:
+                    self._holds.add(claimed)
+                    self._index_hold(claimed)
+                raise
+            return booking
+
+    def create_bookings(self, batch: List[BookingRequest], invite_code: str = None) -> List[Booking]:
+        """단체 예약: 여러 숙소를 한 번에 예약 (전부 성공하거나 전부 실패).
+
+        모든 숙소/사용자 락을 한 번에 획득하고, 전체 가용성 확인과 포인트 차감 후
+        저장소에 한 번의 트랜잭션으로 기록합니다. 하나라도 충돌하면 포인트와 예약을
+        모두 되돌리고 ValueError를 발생시킵니다.
+        가격은 요청별 회원 여부로 계산하고, 초대 리워드는 단체 예약 전체 결제 금액 기준으로
+        한 번만 지급합니다 (첫 유료 예약에 기록되어 그 예약이 취소되면 회수).
+        """
+        self._sync_changes()
+        if not batch:
+            return []
+        resolved = []
+        for request in batch:
+            unit = self.find_unit_by_id(request.unit_id)
+            if not unit:
+                raise ValueError(f"Unit not found: {request.unit_id}")
+            user = self._resolve_booking_user(request.user_id)
+            inviter_user, code = self._resolve_inviter(invite_code, user.id)
+            resolved.append((request, unit, user, inviter_user, code))
+
+        self._sweep_holds()
+        unit_ids = [unit.id for _, unit, _, _, _ in resolved]
+        user_ids = [u.id for _, _, user, inviter, _ in resolved for u in (user, inviter) if u]
+        with self._locks.hold(unit_ids=unit_ids, user_ids=user_ids):
+            # 0. 전체 가용성 확인 (배치 안의 예약끼리 겹치는 경우 포함)
+            claimed = IntervalIndex()
+            for request, unit, _, _, _ in resolved:
+                start, end = stay_range(request.check_in, request.check_out)
+                key = (unit.id, request.time_slot)
+                if not self._is_free(unit.id, request.check_in, request.check_out, request.time_slot) \
+                        or claimed.overlaps(key, start, end):
+                    raise ValueError(f"Unit {unit.id} not available for the selected dates")
+                claimed.add(key, start, end, unit.id)
+
+            rollback = self._point_snapshot([u for _, _, user, inviter, _ in resolved for u in (user, inviter)])
+            bookings, touched_users, postings = [], [], []
+            try:
+                for request, unit, user, inviter_user, code in resolved:
+                    booking, touched, booking_postings = self._draft_booking(
+                        user, unit, unit.id, request.check_in, request.check_out, request.guests,
+                        request.time_slot, request.used_points, inviter_user, code, None, request.is_member,
+                        credit_referral=False)
+                    bookings.append(booking)
+                    touched_users.extend(touched)
+                    postings.extend(booking_postings)
+                referred = [(booking, inviter) for booking, (_, _, _, inviter, _) in zip(bookings, resolved)
+                            if inviter and booking.final_price > 0]
+                if referred:
+                    inviter_user = referred[0][1]
+                    postings.append(self._credit_referral(inviter_user, sum(b.final_price for b, _ in referred),
+                                                          referred[0][0].id))
+                    touched_users.append(inviter_user)
+            except Exception:
+                self._restore_points(rollback)
+                raise
+
+            # 저장 (모든 예약 + 포인트 변경 + 원장 항목을 하나의 트랜잭션으로)
+            self._commit_bookings(bookings, touched_users, postings, rollback)
+            return bookings
 
-# 싱글톤 인스턴스
-_system_instance = TimeBankSystem()
+# 싱글톤 인스턴스 (TIMEBANK_STORAGE / TIMEBANK_DB_PATH 환경 변수로 저장소 선택)
+# import만으로 DB 파일 생성이나 백그라운드 스레드가 생기지 않도록 첫 get_system() 호출 시 생성
+_system_instance: Optional[TimeBankSystem] = None
+_system_lock = threading.Lock()
 
 def get_system() -> TimeBankSystem:
+    global _system_instance
+    if _system_instance is None:
+        with _system_lock:
+            if _system_instance is None:
+                _system_instance = TimeBankSystem(repository=create_repository())
     return _system_instance
@@ -0,0 +1,148 @@
+"""TimeBank 동적 가격 모듈.
+
+pricing.py의 정가(주말/공휴일 할증, 시간대 배수)에 수요 배수를 곱합니다.
+- 숙소 점유율: 해당 날짜 앞뒤 WINDOW_DAYS일의 판매 비율 (rolling 평균)
+- 지역 수요: 같은 지역 숙소 전체의 판매 비율 (rolling 평균)
+- 예약 시점: LAST_MINUTE_DAYS일 이내의 빈 날짜는 막판 할인
+예약이 없는 먼 날짜는 정가 그대로입니다.
+
+점유율은 SlotOccupancy 비트맵에서 NumPy 누적합으로 계산하므로 예약 목록을
+다시 훑지 않습니다. 가격은 숙소별 (날짜, 시간대) 배열로 캐시되며,
+예약이 생기거나 취소되면 영향을 받는 날짜(예약 구간 ± WINDOW_DAYS, 같은 지역 숙소)만
+무효화됩니다. 재계산도 무효화된 날짜 ± WINDOW_DAYS 구간의 점유율만 읽습니다.
+"""
+
+import datetime
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from modules import pricing
+from modules.availability import SlotOccupancy
+from modules.catalog_index import CatalogIndex
+
+WINDOW_DAYS = 3  # 점유율 rolling 반경 (앞뒤 3일 = 7일 구간)
+OCCUPANCY_WEIGHT = 0.3  # 숙소 점유율 민감도 (만실 기준 +30%)
+REGION_WEIGHT = 0.2  # 지역 수요 민감도 (지역 만실 기준 +20%)
+LAST_MINUTE_DAYS = 7
+LAST_MINUTE_DISCOUNT = 0.1  # 완전히 빈 날짜 기준 막판 할인율
+MIN_MULTIPLIER = 0.85
+MAX_MULTIPLIER = 1.3
+
+
+def rolling_mean(load: np.ndarray, radius: int) -> np.ndarray:
+    """마지막 축 기준 [d - radius, d + radius] 평균 (범위 밖 날짜는 분모에서 제외)."""
+    width = 2 * radius + 1
+    pad = [(0, 0)] * (load.ndim - 1) + [(radius, radius)]
+    sums = np.cumsum(np.pad(load, pad), axis=-1)
+    sums = np.concatenate([np.zeros(load.shape[:-1] + (1,)), sums], axis=-1)
+    counts = np.cumsum(np.pad(np.ones(load.shape[-1]), (radius, radius)))
+    counts = np.concatenate([[0.0], counts])
+    return (sums[..., width:] - sums[..., :-width]) / (counts[width:] - counts[:-width])
+
+
+def demand_multiplier(unit_occupancy: np.ndarray, region_occupancy: np.ndarray, lead_days: np.ndarray) -> np.ndarray:
+    """점유율/지역 수요/예약 시점으로 계산한 가격 배수 (벡터 연산)."""
+    multiplier = (1.0 + OCCUPANCY_WEIGHT * unit_occupancy) * (1.0 + REGION_WEIGHT * region_occupancy)
+    last_minute = np.where(lead_days < LAST_MINUTE_DAYS, 1.0 - LAST_MINUTE_DISCOUNT * (1.0 - unit_occupancy), 1.0)
+    return np.clip(multiplier * last_minute, MIN_MULTIPLIER, MAX_MULTIPLIER)
+
+
+def _runs(offsets: np.ndarray, max_gap: int) -> List[Tuple[int, int]]:
+    """정렬된 offsets를 간격이 max_gap 이하인 묶음으로 나눈 [first, last) 인덱스 목록."""
+    breaks = np.flatnonzero(np.diff(offsets) > max_gap) + 1
+    bounds = np.concatenate([[0], breaks, [len(offsets)]])
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+class DynamicPricer:
+    """숙소별 (날짜, 시간대) 동적 가격 캐시.
+
+    캐시는 오늘(SlotOccupancy.base)부터 horizon일을 덮으며, 날짜가 바뀌면
+    예약 시점 요소가 모두 달라지므로 전체를 비웁니다.
+    """
+
+    def __init__(self, catalog: CatalogIndex, slots=pricing.SLOTS):
+        self._catalog = catalog
+        self.slots = tuple(slots)
+        self._lock = threading.Lock()
+        self._base = None
+        self._prices: Dict[str, np.ndarray] = {}  # unit_id -> (horizon, slots) int64
+        self._valid: Dict[str, np.ndarray] = {}  # unit_id -> (horizon,) bool
+        self._base_price: Dict[str, int] = {}
+
+    def _region_units(self, unit_id: str) -> List[str]:
+        campsite = self._catalog.campsite_by_unit.get(unit_id)
+        if campsite is None:
+            return [unit_id]
+        return sorted(self._catalog.by_region.get(campsite.region_id, {unit_id}))
+
+    def _sync(self, occupancy: SlotOccupancy) -> None:
+        if self._base != occupancy.base:
+            self._base = occupancy.base
+            self._prices.clear()
+            self._valid.clear()
+
+    def prices(self, unit_id: str, occupancy: SlotOccupancy) -> np.ndarray:
+        """오늘부터 horizon일의 (days, slots) 동적 가격 배열 (무효화된 날짜만 재계산)."""
+        unit = self._catalog.units[unit_id]
+        with self._lock:
+            self._sync(occupancy)
+            horizon = occupancy.horizon
+            base_price = pricing.base_price_of(unit)
+            if unit_id not in self._prices or self._base_price.get(unit_id) != base_price:
+                self._prices[unit_id] = np.zeros((horizon, len(self.slots)), dtype=np.int64)
+                self._valid[unit_id] = np.zeros(horizon, dtype=bool)
+                self._base_price[unit_id] = base_price
+            stale = np.flatnonzero(~self._valid[unit_id])
+            if len(stale):
+                self._reprice(unit_id, base_price, stale, occupancy)
+            return self._prices[unit_id]
+
+    def _reprice(self, unit_id: str, base_price: int, offsets: np.ndarray, occupancy: SlotOccupancy) -> None:
+        today = datetime.date.fromordinal(occupancy.base)
+        region_units = self._region_units(unit_id)
+        row = region_units.index(unit_id)
+        unit_occupancy = np.empty(len(offsets))
+        region_occupancy = np.empty(len(offsets))
+        # 무효화된 날짜 묶음마다 앞뒤 WINDOW_DAYS일 구간의 점유율만 읽음
+        # (구간 경계는 horizon 경계이거나 rolling 반경 밖이므로 전체 구간으로 계산한 값과 같음)
+        for first, last in _runs(offsets, 2 * WINDOW_DAYS):
+            lo = max(int(offsets[first]) - WINDOW_DAYS, 0)
+            hi = min(int(offsets[last - 1]) + WINDOW_DAYS + 1, occupancy.horizon)
+            load = occupancy.load_matrix(region_units, today + datetime.timedelta(days=lo), hi - lo)
+            run = offsets[first:last] - lo
+            unit_occupancy[first:last] = rolling_mean(load[row], WINDOW_DAYS)[run]
+            region_occupancy[first:last] = rolling_mean(load.mean(axis=0), WINDOW_DAYS)[run]
+        multiplier = demand_multiplier(unit_occupancy, region_occupancy, offsets)
+        static = pricing.quote_base_matrix(np.array([base_price]), occupancy.base + offsets, self.slots)[0]
+        # 누적합 부동소수 오차로 정수 경계 가격이 1원 내려가지 않도록 반올림 후 절삭
+        self._prices[unit_id][offsets] = np.trunc(np.round(static * multiplier[:, None], 6)).astype(np.int64)
+        self._valid[unit_id][offsets] = True
+
+    def invalidate(self, unit_id: str, start: int, end: int) -> None:
+        """예약 구간 [start, end) 변경 시 영향받는 날짜만 무효화 (같은 지역 숙소 포함)."""
+        with self._lock:
+            if self._base is None:
+                return
+            lo = max(start - WINDOW_DAYS - self._base, 0)
+            hi = end + WINDOW_DAYS - self._base
+            for region_unit in self._region_units(unit_id):
+                valid = self._valid.get(region_unit)
+                if valid is not None and hi > lo:
+                    valid[lo:hi] = False
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            for valid in self._valid.values():
+                valid[:] = False
+
+    def invalidate_dates(self, dates: Iterable[datetime.date]) -> None:
+        """요금 규칙(공휴일 등)이 바뀐 날짜를 모든 숙소에서 무효화."""
+        with self._lock:
+            if self._base is None:
+                return
+            offsets = np.array([d.toordinal() - self._base for d in dates], dtype=np.int64)
+            for valid in self._valid.values():
+                valid[offsets[(offsets >= 0) & (offsets < len(valid))]] = False
@@ -0,0 +1,456 @@
+"""TimeBank 이벤트 로그 저장소.
+
+TimeBankSystem의 상태 변경을 추가 전용(append-only) 이벤트 로그로 기록하고,
+N개 이벤트마다 압축 스냅샷을 남겨 재시작 시 "최신 스냅샷 + 이후 로그"만 재생합니다.
+스냅샷을 남기면 그 이전 로그는 잘라내므로 로그 크기는 스냅샷 간격 안에서만 늘어납니다.
+
+이벤트
+- UserRegistered / ProfileUpdated: 사용자 등록 (잔액 0), 프로필(이름, 이메일, 초대 코드) 변경
+- MembershipJoined: 멤버십 가입 (페이백 포인트 포함)
+- BookingCreated / BookingStatusChanged: 예약 생성, 취소 등 상태 변경
+  (취소 시 포인트 이벤트는 같은 종류의 반대 부호 항목으로 같은 레코드에 기록)
+- PointsSpent / PointsEarned: 예약 시 포인트 사용, 5% 적립
+- ReferralCredited: 초대한 사용자에게 지급된 10% 리워드
+- PointsAdjusted: 포인트 잔액 보정 (초기 지급 등)
+- PointsExpired: 유효기간 경과 포인트 소멸
+포인트 이벤트에는 해당 포인트 원장 항목(modules/points_ledger.py)과 부호 있는 증감(delta)이 함께
+기록되며, 재생 시 points_ledger.apply_entry로 사용자 상태에 반영합니다.
+(delta가 없는 이전 버전 이벤트와 UserUpdated는 기록 당시 규칙대로 재생합니다.)
+
+파일 형식
+- events.log: 트랜잭션(이벤트 묶음) 단위 레코드
+  [4바이트 길이][4바이트 CRC32][JSON payload]. 마지막 레코드가 잘려 있으면
+  재시작 시 그 직전까지만 재생하고 잘라냅니다.
+- snapshot.bin: b"TBS1" + zlib(JSON). 컬럼 단위로 직렬화한 사용자/예약과
+  스냅샷 시점의 이벤트 번호, 로그 오프셋을 담습니다.
+  스냅샷 작성: 조회 상태 복사만 락 안에서 하고 직렬화/압축/기록은 락 밖에서 합니다.
+  스냅샷(오프셋 0)을 교체한 뒤 로그를 스냅샷 이후 레코드만 남긴 새 파일로 교체하며,
+  두 교체 사이에 중단되면 재시작 시 이벤트 번호가 스냅샷 이하인 레코드를 건너뜁니다.
+
+쓰기는 그룹 커밋으로 처리합니다. 각 스레드는 레코드를 메모리 버퍼에 추가한 뒤
+동기화 락을 잡고, 먼저 락을 잡은 스레드(리더)가 버퍼 전체를 한 번에 write + fsync
+합니다. 뒤따르는 스레드는 자기 레코드가 이미 동기화되었으면 바로 반환합니다.
+이벤트는 fsync가 끝난 뒤에만 로그 순서대로 조회 상태에 반영하며, 그 전까지의 검증은
+대기 중인 변경을 반영한 사용자 복사본을 기준으로 합니다. 기록에 실패하면 로그를 마지막
+동기화 지점까지 잘라내고, 실패한 묶음과 그 뒤에 대기하던 레코드의 호출자 모두 OSError를 받습니다.
+
+하나의 프로세스만 로그를 쓸 수 있습니다 (여러 워커가 공유하려면 SQLite 저장소 사용).
+
+환경 변수
+- TIMEBANK_EVENT_DIR: 로그/스냅샷 디렉터리 (기본: data/events)
+- TIMEBANK_SNAPSHOT_EVERY: 스냅샷 간격 (이벤트 수, 기본 10000)
+- TIMEBANK_EVENT_FSYNC: "0"이면 fsync 생략 (테스트용)
+"""
+
+import dataclasses
+import datetime
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from modules import points_ledger
+from modules.models import Booking, LedgerEntry, User
+from modules.storage import InMemoryRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_DIR = "data/events"
+DEFAULT_SNAPSHOT_EVERY = 10000
+
+_HEADER = struct.Struct(">II")  # payload 길이, CRC32
+_SNAPSHOT_MAGIC = b"TBS1"
+_USER_FIELDS = [f.name for f in dataclasses.fields(User)]
+_PROFILE_FIELDS = ("name", "email", "invite_code")
+_BOOKING_FIELDS = [f.name for f in dataclasses.fields(Booking)]
+
+
+def _user_to_dict(user: User) -> Dict:
+    return dataclasses.asdict(user)
+
+
+def _booking_to_dict(b: Booking) -> Dict:
+    data = dataclasses.asdict(b)
+    data["check_in"] = b.check_in.toordinal()
+    data["check_out"] = b.check_out.toordinal()
+    data["created_at"] = b.created_at.isoformat()
+    return data
+
+
+def _booking_from_dict(data: Dict) -> Booking:
+    data = dict(data)
+    data["check_in"] = datetime.date.fromordinal(data["check_in"])
+    data["check_out"] = datetime.date.fromordinal(data["check_out"])
+    data["created_at"] = datetime.datetime.fromisoformat(data["created_at"])
+    return Booking(**data)
+
+
+_POINT_EVENTS = ("MembershipJoined", "PointsSpent", "PointsEarned", "ReferralCredited", "PointsAdjusted",
+                 "PointsExpired")
+_LEDGER_FIELDS = [f.name for f in dataclasses.fields(LedgerEntry)]
+# 원장 항목 종류 -> 이벤트 종류
+_LEDGER_EVENT_TYPES = {
+    points_ledger.EARN: "PointsEarned",
+    points_ledger.SPEND: "PointsSpent",
+    points_ledger.REFERRAL: "ReferralCredited",
+    points_ledger.MEMBERSHIP_PAYBACK: "MembershipJoined",
+    points_ledger.ADJUSTMENT: "PointsAdjusted",
+    points_ledger.EXPIRE: "PointsExpired",
+}
+
+
+def _entry_to_dict(entry: LedgerEntry) -> Dict:
+    data = dataclasses.asdict(entry)
+    data["created_at"] = entry.created_at.isoformat()
+    return data
+
+
+def _entry_from_dict(data: Dict) -> LedgerEntry:
+    data = dict(data)
+    data["created_at"] = datetime.datetime.fromisoformat(data["created_at"])
+    return LedgerEntry(**data)
+
+
+def _ledger_event(entry: LedgerEntry) -> Dict:
+    """원장 항목을 포인트 이벤트로 변환 (원장 항목 자체도 함께 기록)."""
+    return {"type": _LEDGER_EVENT_TYPES[entry.kind], "data": {
+        "user_id": entry.user_id, "booking_id": entry.booking_id, "delta": entry.amount,
+        "entry": _entry_to_dict(entry),
+    }}
+
+
+def _apply_points(user: User, event: Dict) -> None:
+    """포인트 관련 이벤트를 사용자 상태에 반영."""
+    kind, data = event["type"], event["data"]
+    if "delta" in data:
+        points_ledger.apply_entry(user, _entry_from_dict(data["entry"]))
+    elif kind == "MembershipJoined":
+        user.is_member = True
+        user.points += data["points"]
+    elif kind in ("PointsSpent", "PointsExpired"):
+        user.points -= data["amount"]
+    elif kind == "PointsEarned":
+        user.points += data["amount"]
+    elif kind == "ReferralCredited":
+        user.points += data["amount"]
+        user.referral_count += 1
+        user.total_earnings += data["amount"]
+    # 이전 버전 PointsAdjusted: 원장 보정 기록만 남김 (User.points는 이미 반영된 잔액)
+
+
+class EventLogRepository(InMemoryRepository):
+    """이벤트 로그 기반 저장소.
+
+    조회는 InMemoryRepository의 인덱스를 그대로 사용하고, 쓰기 요청은
+    이벤트로 변환한 뒤 로그에 기록합니다. 포인트 변동은 원장 항목만 기록하며
+    기록 전에 현재 상태로 잔액을 검증하고 balance_after를 채웁니다.
+    """
+
+    def __init__(self, directory: str = DEFAULT_EVENT_DIR, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+                 fsync: bool = True):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.directory / "events.log"
+        self.snapshot_path = self.directory / "snapshot.bin"
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+
+        self._append_lock = threading.Lock()  # 상태 반영 + 버퍼 추가
+        self._sync_lock = threading.Lock()  # 그룹 커밋 리더 선출
+        self._snapshot_lock = threading.Lock()
+        self._pending: List[Tuple[int, bytes, List[Dict]]] = []  # (seq, 레코드, 이벤트) 기록 대기
+        self._staged_users: Dict[str, User] = {}  # 기록 대기 중인 변경까지 반영한 사용자 복사본
+        self._staged_cancels: Set[str] = set()  # 기록 대기 중인 예약 취소
+        self._failed_seqs: Set[int] = set()  # 기록 실패로 버려진 다른 스레드의 레코드
+        self._seq = 0  # 마지막으로 발급한 이벤트 번호
+        self._synced_seq = 0  # 기록 + 반영이 끝난 마지막 이벤트 번호
+        self._synced_offset = 0  # 동기화된 로그 끝 오프셋
+        self._torn = False  # 기록 실패 후 로그 끝을 아직 잘라내지 못함
+        self._snapshot_seq = 0
+
+        self._recover()
+        self._file = open(self.log_path, "ab")
+
+    # --- 복구 ---
+    def _recover(self) -> None:
+        offset = 0
+        if self.snapshot_path.exists():
+            offset = self._load_snapshot()
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, "r+b") as f:
+            f.seek(offset)
+            data = f.read()
+            pos = 0
+            while pos + _HEADER.size <= len(data):
+                length, crc = _HEADER.unpack_from(data, pos)
+                payload = data[pos + _HEADER.size:pos + _HEADER.size + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                record = json.loads(payload)
+                if record["seq"] > self._snapshot_seq:  # 로그 교체 전에 중단된 경우 스냅샷에 포함된 레코드
+                    for event in record["events"]:
+                        self._apply(event)
+                    self._seq = record["seq"]
+                pos += _HEADER.size + length
+            if pos < len(data):
+                f.truncate(offset + pos)  # 기록 중 중단된 마지막 레코드 제거
+        self._synced_offset = offset + pos
+        self._synced_seq = self._seq
+
+    def _load_snapshot(self) -> int:
+        raw = self.snapshot_path.read_bytes()
+        if not raw.startswith(_SNAPSHOT_MAGIC):
+            raise ValueError(f"Invalid snapshot file: {self.snapshot_path}")
+        state = json.loads(zlib.decompress(raw[len(_SNAPSHOT_MAGIC):]))
+        users, bookings = state["users"], state["bookings"]
+        for values in zip(*(users[name] for name in _USER_FIELDS)):
+            user = User(**dict(zip(_USER_FIELDS, values)))
+            self._users[user.id] = user
+        fields = [name for name in _BOOKING_FIELDS if name in bookings]  # 이전 버전 스냅샷에 없는 필드는 기본값
+        InMemoryRepository.save_bookings(self, [_booking_from_dict(dict(zip(fields, values)))
+                                                for values in zip(*(bookings[name] for name in fields))], [])
+        ledger = state.get("ledger", {})
+        if ledger:
+            entries = [_entry_from_dict(dict(zip(_LEDGER_FIELDS, values)))
+                       for values in zip(*(ledger[name] for name in _LEDGER_FIELDS))]
+            self._append_ledger(entries)
+        self._seq = self._snapshot_seq = state["seq"]
+        return state["offset"]
+
+    # --- 이벤트 반영 ---
+    def _apply(self, event: Dict) -> None:
+        kind, data = event["type"], event["data"]
+        if kind in ("UserRegistered", "UserUpdated"):
+            self._users[data["id"]] = User(**data)
+        elif kind == "ProfileUpdated":
+            user = self._users[data["id"]]
+            for name in _PROFILE_FIELDS:
+                setattr(user, name, data[name])
+        elif kind == "BookingCreated":
+            InMemoryRepository.save_bookings(self, [_booking_from_dict(data)], [])
+        elif kind == "BookingStatusChanged":
+            InMemoryRepository.update_booking_status(self, data["booking_id"], data["status"])
+        elif kind in _POINT_EVENTS:
+            _apply_points(self._users[data["user_id"]], event)
+            if "entry" in data:
+                self._append_ledger([_entry_from_dict(data["entry"])])
+        else:
+            raise ValueError(f"Unknown event type: {kind}")
+
+    def _write(self, events: List[Dict]) -> None:
+        """이벤트 묶음을 하나의 레코드로 기록 (그룹 커밋). 반환 시점에는 조회 상태에도 반영되어 있음."""
+        if not events:
+            return
+        with self._append_lock:
+            self._seq += len(events)
+            seq = self._seq
+            payload = json.dumps({"seq": seq, "ts": datetime.datetime.now().isoformat(), "events": events},
+                                 ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self._pending.append((seq, _HEADER.pack(len(payload), zlib.crc32(payload)) + payload, events))
+        self._commit(seq)
+        if seq - self._snapshot_seq >= self.snapshot_every:
+            self.snapshot()
+
+    def _commit(self, seq: int) -> None:
+        with self._sync_lock:
+            if seq in self._failed_seqs:
+                self._failed_seqs.discard(seq)
+                raise OSError(f"Event log write failed: {self.log_path}")
+            if self._synced_seq >= seq:
+                return  # 다른 스레드(리더)가 이미 함께 기록함
+            with self._append_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                if self._torn:
+                    self._truncate()
+                self._file.write(b"".join(frame for _, frame, _ in batch))
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except OSError:
+                self._discard(batch, seq)
+                raise
+            with self._append_lock:
+                for _, _, events in batch:
+                    for event in events:
+                        self._apply(event)
+                self._synced_seq = batch[-1][0]
+                self._synced_offset += sum(len(frame) for _, frame, _ in batch)
+                if not self._pending:
+                    self._staged_users.clear()
+                    self._staged_cancels.clear()
+
+    def _discard(self, batch: List[Tuple[int, bytes, List[Dict]]], seq: int) -> None:
+        """기록 실패: 로그를 마지막 동기화 지점까지 잘라내고 대기 중인 레코드를 모두 실패 처리."""
+        with self._append_lock:
+            # 뒤에 대기하던 레코드도 실패한 묶음을 전제로 검증되었으므로 함께 버림
+            self._failed_seqs.update(s for s, _, _ in batch + self._pending if s != seq)
+            self._pending = []
+            self._staged_users.clear()
+            self._staged_cancels.clear()
+        self._torn = True
+        try:
+            self._truncate()
+        except OSError:
+            pass  # 다음 기록 전에 다시 시도
+
+    def _truncate(self) -> None:
+        """로그를 마지막 동기화 지점까지 잘라내고 다시 엶 (실패한 레코드 조각 제거)."""
+        try:
+            self._file.close()
+        except OSError:
+            pass  # 버퍼에 남은 미기록 데이터는 버림
+        self._file = open(self.log_path, "r+b")
+        self._file.truncate(self._synced_offset)
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = open(self.log_path, "ab")
+        self._torn = False
+
+    def _stored_user(self, user_id: str) -> Optional[User]:
+        return self._staged_users.get(user_id) or self._users.get(user_id)
+
+    def _stage(self, users: List[User], ledger_entries: List[LedgerEntry]) -> None:
+        """기록 대기 중인 변경까지 포함한 상태로 검증하고 결과를 다음 검증의 기준으로 보관 (_append_lock 안에서 호출)."""
+        self._staged_users.update(self._stage_ledger(ledger_entries, self._stage_users(users)))
+
+    def _user_events(self, user: User) -> List[Dict]:
+        """저장된 상태와 비교해 등록/프로필 변경을 이벤트로 변환 (잔액은 원장 항목으로만 변경)."""
+        stored = self._stored_user(user.id)
+        if stored is None:
+            return [{"type": "UserRegistered", "data": _user_to_dict(dataclasses.replace(user, points=0))}]
+        if any(getattr(stored, name) != getattr(user, name) for name in _PROFILE_FIELDS):
+            return [{"type": "ProfileUpdated", "data": {"id": user.id, **{n: getattr(user, n) for n in _PROFILE_FIELDS}}}]
+        return []
+
+    # --- Repository 구현 ---
+    def save_users(self, users: List[User], ledger_entries: List[LedgerEntry] = ()) -> None:
+        with self._append_lock:
+            events = [e for user in users for e in self._user_events(user)]
+            self._stage(users, ledger_entries)  # 잔액 검증 + balance_after
+        events.extend(_ledger_event(e) for e in ledger_entries)
+        self._write(events)
+
+    def save_bookings(self, bookings: List[Booking], ledger_entries: List[LedgerEntry] = ()) -> None:
+        """예약/포인트 이벤트를 레코드 하나로 기록 (fsync 1회, 재생 시 전부 또는 전무)."""
+        with self._append_lock:
+            self._stage([], ledger_entries)
+        events = [{"type": "BookingCreated", "data": _booking_to_dict(b)} for b in bookings]
+        events.extend(_ledger_event(e) for e in ledger_entries)
+        self._write(events)
+
+    def save_points(self, ledger_entries: List[LedgerEntry]) -> None:
+        with self._append_lock:
+            self._stage([], ledger_entries)
+        self._write([_ledger_event(e) for e in ledger_entries])
+
+    def load_ledger_entries(self) -> List[LedgerEntry]:
+        with self._append_lock:
+            return super().load_ledger_entries()
+
+    def last_ledger_entry_before(self, user_id: str, end_id: str) -> Optional[LedgerEntry]:
+        with self._append_lock:
+            return super().last_ledger_entry_before(user_id, end_id)
+
+    def find_booking_ledger_entries(self, booking_id: str) -> List[LedgerEntry]:
+        with self._append_lock:
+            return super().find_booking_ledger_entries(booking_id)
+
+    def update_booking_status(self, booking_id: str, status: str) -> None:
+        self._write([{"type": "BookingStatusChanged", "data": {"booking_id": booking_id, "status": status}}])
+
+    def cancel_booking(self, booking_id: str, ledger_entries: List[LedgerEntry] = ()) -> bool:
+        """취소 + 되돌림 원장 항목을 레코드 하나로 기록 (기록 대기 중인 취소도 중복으로 봄)."""
+        with self._append_lock:
+            booking = self._bookings.get(booking_id)
+            if booking is None or booking.status != "CONFIRMED" or booking_id in self._staged_cancels:
+                return False
+            self._stage([], ledger_entries)
+            self._staged_cancels.add(booking_id)
+        events = [{"type": "BookingStatusChanged", "data": {"booking_id": booking_id, "status": "CANCELLED"}}]
+        events.extend(_ledger_event(e) for e in ledger_entries)
+        self._write(events)
+        return True
+
+    # --- 스냅샷 ---
+    def snapshot(self) -> None:
+        """현재 상태를 압축 스냅샷으로 저장 (임시 파일에 쓴 뒤 교체)하고 그 이전 로그를 잘라냄."""
+        if not self._snapshot_lock.acquire(blocking=False):
+            return  # 다른 스레드가 스냅샷 작성 중
+        try:
+            with self._append_lock:
+                # 조회 상태는 동기화된 레코드까지만 반영되어 있으므로 기록 대기 중인 레코드는 기다리지 않음.
+                # 락 안에서는 복사만: 사용자는 제자리에서 바뀌므로 복사본, 예약은 상태만 바뀌므로 상태 목록,
+                # 원장 항목은 추가 후 바뀌지 않으므로 참조만 보관
+                seq, offset = self._synced_seq, self._synced_offset
+                users = [dataclasses.replace(u) for u in self._users.values()]
+                bookings = [self._bookings[i] for i in self._sorted_ids]
+                statuses = [b.status for b in bookings]
+                entries = [e for user_entries in self._ledger.values() for e in user_entries]
+            state = {
+                "seq": seq,
+                "offset": 0,  # 아래에서 로그를 offset 이후 레코드만 남기도록 교체
+                "users": {name: [getattr(u, name) for u in users] for name in _USER_FIELDS},
+                "bookings": {name: [getattr(b, name) for b in bookings] for name in _BOOKING_FIELDS},
+                "ledger": {name: [getattr(e, name) for e in entries] for name in _LEDGER_FIELDS},
+            }
+            state["bookings"]["status"] = statuses
+            state["bookings"]["check_in"] = [d.toordinal() for d in state["bookings"]["check_in"]]
+            state["bookings"]["check_out"] = [d.toordinal() for d in state["bookings"]["check_out"]]
+            state["bookings"]["created_at"] = [d.isoformat() for d in state["bookings"]["created_at"]]
+            state["ledger"]["created_at"] = [d.isoformat() for d in state["ledger"]["created_at"]]
+            data = _SNAPSHOT_MAGIC + zlib.compress(
+                json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self._snapshot_seq = seq
+            self._rotate(offset)
+        finally:
+            self._snapshot_lock.release()
+
+    def _rotate(self, offset: int) -> None:
+        """스냅샷에 포함된 로그 앞부분 [0, offset)을 버리고 이후 레코드만 남긴 새 로그로 교체.
+
+        실패하면 기존 로그를 그대로 두며, 재시작 시 스냅샷 이하 레코드는 이벤트 번호로 건너뜁니다.
+        """
+        with self._sync_lock:  # 그룹 커밋과 배타 (이 동안 로그 끝은 _synced_offset으로 고정)
+            if self._torn or offset == 0:
+                return
+            tmp_path = self.log_path.with_suffix(".tmp")
+            try:
+                with open(self.log_path, "rb") as src, open(tmp_path, "wb") as dst:
+                    src.seek(offset)
+                    dst.write(src.read(self._synced_offset - offset))
+                    dst.flush()
+                    if self.fsync:
+                        os.fsync(dst.fileno())
+                self._file.close()
+                os.replace(tmp_path, self.log_path)
+            except OSError:
+                logger.warning("Event log rotation failed: %s", self.log_path, exc_info=True)
+                self._file = open(self.log_path, "ab") if self._file.closed else self._file
+                return
+            self._file = open(self.log_path, "ab")
+            with self._append_lock:
+                self._synced_offset -= offset
+
+    def close(self) -> None:
+        with self._append_lock:
+            seq = self._pending[-1][0] if self._pending else 0
+        if seq:
+            self._commit(seq)
+        self._file.close()
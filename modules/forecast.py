@@ -0,0 +1,186 @@
+"""TimeBank 매출/수요 예측 모듈.
+
+캠핑장별 일 매출(체크인 기준)과 점유율을 과거 예약으로 학습해 향후 N일을 예측합니다.
+
+모델 (캠핑장 × 지표마다 하나, 모든 캠핑장을 행렬 한 번으로 계산)
+    y(t) = 수준 + 추세 × t + 요일 효과 + 공휴일/공휴일 전날 효과
+- 설계 행렬은 날짜만으로 정해지므로 모든 캠핑장이 공유하고, 계수는 정규방정식
+  (X'WX + λI) β = X'WY 를 풀어 구합니다 (W: 최근 날짜일수록 큰 지수 가중치).
+- X'WX, X'WY 누적값만 보관하므로 재학습은 지난 학습 이후 마감된 날짜만 더하는 증분 계산입니다.
+- 학습에는 이미 지난 날짜(오늘 이전)만 사용합니다.
+
+예측 결과는 캐시해 두고 대시보드는 캐시만 읽습니다. start_nightly_refit()으로 띄운
+백그라운드 스레드가 매일 밤 한 번 증분 재학습 후 캐시를 교체합니다.
+
+환경 변수
+- TIMEBANK_FORECAST_HORIZON: 예측 일수 (기본 90)
+- TIMEBANK_FORECAST_HISTORY: 최초 학습 시 사용할 과거 일수 (기본 365)
+- TIMEBANK_FORECAST_HALF_LIFE: 관측 가중치 반감기 일수 (기본 180)
+- TIMEBANK_FORECAST_REFIT_HOUR: 매일 재학습 시각 (기본 3시)
+"""
+
+import datetime
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules import holidays
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZON_DAYS = int(os.getenv("TIMEBANK_FORECAST_HORIZON", "90"))
+DEFAULT_HISTORY_DAYS = int(os.getenv("TIMEBANK_FORECAST_HISTORY", "365"))
+DEFAULT_HALF_LIFE_DAYS = float(os.getenv("TIMEBANK_FORECAST_HALF_LIFE", "180"))
+DEFAULT_REFIT_HOUR = int(os.getenv("TIMEBANK_FORECAST_REFIT_HOUR", "3"))
+
+MEASURES = ("revenue", "occupancy")
+
+_TREND_ORIGIN = datetime.date(2024, 1, 1).toordinal()
+_N_FEATURES = 10  # 상수, 추세, 요일(화~일) 6, 공휴일, 공휴일 전날
+_RIDGE = 1.0  # 관측이 없는 효과(예: 아직 못 본 공휴일)는 0으로 수렴
+
+
+def design_matrix(ordinals: np.ndarray) -> np.ndarray:
+    """날짜 ordinal 배열 -> 설계 행렬 (len × _N_FEATURES)."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    x = np.zeros((len(ordinals), _N_FEATURES))
+    x[:, 0] = 1.0
+    x[:, 1] = (ordinals - _TREND_ORIGIN) / 365.0
+    weekday = (ordinals - 1) % 7  # 월요일 0 (date.weekday()와 같음)
+    rows = np.flatnonzero(weekday > 0)
+    x[rows, 1 + weekday[rows]] = 1.0
+    day_types = holidays.day_calendar.day_types(ordinals)
+    x[:, 8] = day_types == holidays.HOLIDAY
+    x[:, 9] = day_types == holidays.HOLIDAY_EVE
+    return x
+
+
+class SeasonalModel:
+    """여러 시계열을 함께 학습하는 가중 최소제곱 계절 회귀 (증분 학습)."""
+
+    def __init__(self, n_series: int, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        self.decay = 0.5 ** (1.0 / half_life_days)
+        self._xtx = np.zeros((_N_FEATURES, _N_FEATURES))
+        self._xty = np.zeros((_N_FEATURES, n_series))
+        self._last: Optional[int] = None  # 마지막으로 반영한 날짜 ordinal
+        self.n_days = 0
+        self.coef = np.zeros((_N_FEATURES, n_series))
+
+    def update(self, ordinals: np.ndarray, values: np.ndarray) -> None:
+        """이후 날짜의 관측(len(ordinals) × n_series)을 누적하고 계수를 다시 풉니다."""
+        if not len(ordinals):
+            return
+        last = int(ordinals[-1])
+        if self._last is not None:
+            # 기존 누적값도 새 기준일까지 경과한 일수만큼 감쇠
+            shrink = self.decay ** (last - self._last)
+            self._xtx *= shrink
+            self._xty *= shrink
+        x = design_matrix(ordinals)
+        w = self.decay ** (last - np.asarray(ordinals, dtype=np.float64))
+        xw = x * w[:, None]
+        self._xtx += xw.T @ x
+        self._xty += xw.T @ values
+        self._last = last
+        self.n_days += len(ordinals)
+        self.coef = np.linalg.solve(self._xtx + _RIDGE * np.eye(_N_FEATURES), self._xty)
+
+    def predict(self, ordinals: np.ndarray) -> np.ndarray:
+        return design_matrix(ordinals) @ self.coef
+
+
+class Forecaster:
+    """캠핑장별 매출/점유율 예측기 (예측 결과 캐시 + 야간 증분 재학습).
+
+    history(start, days)는 {지표: days × len(keys) 배열}을 반환해야 합니다.
+    """
+
+    def __init__(self, keys: List[str], history: Callable[[datetime.date, int], Dict[str, np.ndarray]],
+                 horizon_days: int = DEFAULT_HORIZON_DAYS, history_days: int = DEFAULT_HISTORY_DAYS,
+                 half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        self.keys = list(keys)
+        self.horizon_days = horizon_days
+        self.history_days = history_days
+        self._history = history
+        self._models = {m: SeasonalModel(len(self.keys), half_life_days) for m in MEASURES}
+        self._lock = threading.Lock()
+        self._fitted_until: Optional[datetime.date] = None  # 이 날짜 전날까지 학습됨
+        self._forecast: Optional[pd.DataFrame] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def fitted_until(self) -> Optional[datetime.date]:
+        return self._fitted_until
+
+    @property
+    def n_days(self) -> int:
+        """학습에 사용한 날짜 수."""
+        return self._models[MEASURES[0]].n_days
+
+    def refit(self, today: Optional[datetime.date] = None) -> pd.DataFrame:
+        """today 전날까지 새로 마감된 날짜만 학습에 더하고 예측 캐시를 다시 만듭니다."""
+        today = today or datetime.date.today()
+        with self._lock:
+            start = self._fitted_until or today - datetime.timedelta(days=self.history_days)
+            days = (today - start).days
+            if days > 0:
+                observed = self._history(start, days)
+                ordinals = np.arange(start.toordinal(), today.toordinal())
+                for measure, model in self._models.items():
+                    model.update(ordinals, np.asarray(observed[measure], dtype=np.float64))
+                self._fitted_until = today
+            if days > 0 or self._forecast is None:
+                self._forecast = self._predict(today)
+            return self._forecast
+
+    def forecast(self, today: Optional[datetime.date] = None) -> pd.DataFrame:
+        """캐시된 예측 (date, campsite_id, revenue, occupancy).
+
+        날짜가 바뀌었는데 야간 재학습이 아직 돌지 않았다면 그 자리에서 증분 재학습합니다.
+        """
+        today = today or datetime.date.today()
+        cached = self._forecast
+        if cached is not None and self._fitted_until == today:
+            return cached
+        return self.refit(today)
+
+    def _predict(self, today: datetime.date) -> pd.DataFrame:
+        ordinals = np.arange(today.toordinal(), today.toordinal() + self.horizon_days)
+        revenue = np.maximum(self._models["revenue"].predict(ordinals), 0.0)
+        occupancy = np.clip(self._models["occupancy"].predict(ordinals), 0.0, 1.0)
+        dates = pd.to_datetime(ordinals - datetime.date(1970, 1, 1).toordinal(), unit="D")
+        return pd.DataFrame({
+            "date": np.repeat(dates, len(self.keys)),
+            "campsite_id": np.tile(self.keys, len(ordinals)),
+            "revenue": revenue.ravel().round().astype(np.int64),
+            "occupancy": occupancy.ravel(),
+        })
+
+    def start_nightly_refit(self, hour: int = DEFAULT_REFIT_HOUR) -> None:
+        """매일 hour시에 증분 재학습하는 데몬 스레드 시작 (이미 실행 중이면 무시)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_nightly, args=(hour,), name="forecast-refit", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run_nightly(self, hour: int) -> None:
+        while not self._stop.is_set():
+            # 한 번 실패해도 스레드는 살려 두고 다음 날 다시 시도 (그 사이 forecast()가 필요 시 재학습)
+            try:
+                self.refit()
+            except Exception:
+                logger.exception("Nightly forecast refit failed")
+            now = datetime.datetime.now()
+            next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += datetime.timedelta(days=1)
+            self._stop.wait((next_run - now).total_seconds())
@@ -0,0 +1,87 @@
+"""TimeBank 임시 확보(hold) 모듈.
+
+날짜를 고른 뒤 결제를 마칠 때까지 (숙소, 기간, 시간대)를 잠시 확보해 두어
+결제 중인 두 사용자가 같은 날짜를 잡지 않도록 합니다.
+
+- 확보 구간은 TimeBankSystem이 가용성 인덱스(IntervalIndex)에 예약과 같이 넣으므로
+  is_available/search_available 결과에 바로 반영됩니다.
+- 만료는 만료 시각 기준 최소 힙으로 처리합니다. 힙의 맨 앞만 확인하므로
+  만료된 것이 없으면 O(1), 만료된 k건은 O(k log n)이며 전체 확보 목록을 훑지 않습니다.
+  해제/예약 전환된 확보는 힙에서 바로 지우지 않고 꺼낼 때 건너뜁니다 (지연 삭제).
+- 확보는 프로세스 메모리에만 유지되며 재시작 시 사라집니다.
+
+환경 변수
+- TIMEBANK_HOLD_TTL: 확보 유지 시간 (기본 600초)
+"""
+
+import datetime
+import heapq
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_HOLD_TTL_SECONDS = int(os.getenv("TIMEBANK_HOLD_TTL", "600"))
+
+
+@dataclass
+class Hold:
+    id: str
+    unit_id: str
+    user_id: str
+    check_in: datetime.date
+    check_out: datetime.date
+    time_slot: str
+    expires_at: datetime.datetime
+
+    def matches(self, unit_id: str, check_in: datetime.date, check_out: datetime.date, time_slot: str) -> bool:
+        return (self.unit_id, self.check_in, self.check_out, self.time_slot) == (unit_id, check_in, check_out, time_slot)
+
+
+class HoldBook:
+    """활성 확보 목록 + 만료 시각 최소 힙."""
+
+    def __init__(self, clock: Callable[[], datetime.datetime] = datetime.datetime.now):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._holds: Dict[str, Hold] = {}
+        self._heap: List[Tuple[datetime.datetime, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._holds)
+
+    def add(self, hold: Hold) -> None:
+        with self._lock:
+            self._holds[hold.id] = hold
+            heapq.heappush(self._heap, (hold.expires_at, hold.id))
+
+    def get(self, hold_id: str) -> Optional[Hold]:
+        hold = self._holds.get(hold_id)
+        if hold is None or hold.expires_at <= self.clock():
+            return None
+        return hold
+
+    def remove(self, hold_id: str) -> Optional[Hold]:
+        with self._lock:
+            return self._holds.pop(hold_id, None)
+
+    def has_expired(self) -> bool:
+        """만료 처리할 확보가 있는지 (힙 맨 앞만 확인)."""
+        heap = self._heap
+        return bool(heap) and heap[0][0] <= self.clock()
+
+    def pop_expired(self) -> List[Hold]:
+        """만료된 확보를 목록에서 제거하여 반환."""
+        now = self.clock()
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, hold_id = heapq.heappop(self._heap)
+                hold = self._holds.get(hold_id)
+                if hold is not None and hold.expires_at <= now:
+                    expired.append(self._holds.pop(hold_id))
+        return expired
+
+    def active(self) -> List[Hold]:
+        now = self.clock()
+        return [h for h in list(self._holds.values()) if h.expires_at > now]
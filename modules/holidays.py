@@ -0,0 +1,147 @@
+"""TimeBank 공휴일 달력 모듈.
+
+한국 공휴일(설날/추석 연휴, 대체공휴일 포함)을 반영한 날짜 유형표를
+미리 계산해 두고, date.toordinal() 기준 배열 인덱스로 O(1) 조회합니다.
+
+날짜 유형
+- WEEKDAY: 평일
+- WEEKEND: 토/일
+- HOLIDAY: 공휴일 및 대체공휴일
+- HOLIDAY_EVE: 공휴일 전날 (평일인 경우)
+
+음력 공휴일(설날, 부처님오신날, 추석)은 한국천문연구원 역법 기준 양력 날짜를
+연도별로 기록합니다. 범위를 넓힐 때는 해당 연도 날짜를 추가해야 합니다.
+"""
+
+import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+WEEKDAY, WEEKEND, HOLIDAY, HOLIDAY_EVE = 0, 1, 2, 3
+DAY_TYPE_LABELS = {WEEKDAY: "평일", WEEKEND: "주말", HOLIDAY: "공휴일", HOLIDAY_EVE: "공휴일 전날"}
+
+FIRST_YEAR = 2024
+LAST_YEAR = 2030
+
+# 대체공휴일 규칙: "national" 토/일/다른 공휴일과 겹치면 대체, "lunar" 일요일/다른 공휴일과 겹치면 대체, "none" 대체 없음
+_FIXED_HOLIDAYS = [
+    ((1, 1), "신정", "none"),
+    ((3, 1), "삼일절", "national"),
+    ((5, 5), "어린이날", "national"),
+    ((6, 6), "현충일", "none"),
+    ((8, 15), "광복절", "national"),
+    ((10, 3), "개천절", "national"),
+    ((10, 9), "한글날", "national"),
+    ((12, 25), "성탄절", "national"),
+]
+
+# 음력 1/1 (설날), 4/8 (부처님오신날), 8/15 (추석)의 양력 날짜
+_LUNAR_DATES = {
+    2024: ((2, 10), (5, 15), (9, 17)),
+    2025: ((1, 29), (5, 5), (10, 6)),
+    2026: ((2, 17), (5, 24), (9, 25)),
+    2027: ((2, 7), (5, 13), (9, 15)),
+    2028: ((1, 26), (5, 2), (10, 3)),
+    2029: ((2, 13), (5, 20), (9, 22)),
+    2030: ((2, 3), (5, 9), (9, 12)),
+}
+
+# 선거일, 임시공휴일 등 비정기 휴일
+_EXTRA_HOLIDAYS = {
+    datetime.date(2024, 4, 10): "국회의원 선거일",
+    datetime.date(2024, 10, 1): "임시공휴일 (국군의 날)",
+    datetime.date(2025, 1, 27): "임시공휴일",
+    datetime.date(2025, 6, 3): "대통령 선거일",
+    datetime.date(2026, 6, 3): "전국동시지방선거일",
+}
+
+
+def _year_holidays(year: int) -> Dict[datetime.date, str]:
+    """해당 연도의 공휴일 (대체공휴일 포함) {날짜: 이름}."""
+    entries: List[Tuple[datetime.date, str, str]] = []
+    for (month, day), name, rule in _FIXED_HOLIDAYS:
+        entries.append((datetime.date(year, month, day), name, rule))
+    if year in _LUNAR_DATES:
+        seollal, buddha, chuseok = (datetime.date(year, m, d) for m, d in _LUNAR_DATES[year])
+        for offset in (-1, 0, 1):
+            entries.append((seollal + datetime.timedelta(days=offset), "설날", "lunar"))
+            entries.append((chuseok + datetime.timedelta(days=offset), "추석", "lunar"))
+        entries.append((buddha, "부처님오신날", "national"))
+
+    names: Dict[datetime.date, str] = {}
+    by_date: Dict[datetime.date, List[str]] = {}
+    for d, name, rule in entries:
+        names[d] = f"{names[d]}·{name}" if d in names else name
+        by_date.setdefault(d, []).append(rule)
+    for d, name in _EXTRA_HOLIDAYS.items():
+        if d.year == year:
+            names.setdefault(d, name)
+
+    # 대체공휴일: 겹치거나 주말에 해당하는 만큼, 이후 첫 번째 비공휴 평일에 지정
+    for d in sorted(by_date):
+        rules = by_date[d]
+        if d.weekday() == 5:
+            needed = rules.count("national")
+        elif d.weekday() == 6:
+            needed = rules.count("national") + rules.count("lunar")
+        else:
+            needed = len(rules) - 1 if any(r != "none" for r in rules) else 0
+        candidate = d
+        for _ in range(needed):
+            candidate += datetime.timedelta(days=1)
+            while candidate.weekday() >= 5 or candidate in names:
+                candidate += datetime.timedelta(days=1)
+            names[candidate] = "대체공휴일"
+    return names
+
+
+class DayTypeCalendar:
+    """날짜 유형표 (FIRST_YEAR ~ LAST_YEAR).
+
+    범위 밖 날짜는 주말 여부만으로 판별합니다.
+    """
+
+    def __init__(self, first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR):
+        self.base = datetime.date(first_year, 1, 1).toordinal()
+        self.end = datetime.date(last_year, 12, 31).toordinal() + 1
+        self.names: Dict[datetime.date, str] = {}
+        for year in range(first_year, last_year + 1):
+            self.names.update(_year_holidays(year))
+        self._types = self._build()
+
+    def _build(self) -> np.ndarray:
+        ordinals = np.arange(self.base, self.end)
+        types = np.where((ordinals - 1) % 7 >= 5, WEEKEND, WEEKDAY).astype(np.int8)
+        holiday_idx = np.array([d.toordinal() - self.base for d in self.names
+                                if self.base <= d.toordinal() < self.end], dtype=np.int64)
+        eve_idx = holiday_idx - 1
+        eve_idx = eve_idx[(eve_idx >= 0) & (types[np.clip(eve_idx, 0, None)] == WEEKDAY)]
+        types[eve_idx] = HOLIDAY_EVE
+        types[holiday_idx] = HOLIDAY
+        return types
+
+    def day_type(self, day: datetime.date) -> int:
+        ordinal = day.toordinal()
+        if self.base <= ordinal < self.end:
+            return int(self._types[ordinal - self.base])
+        return WEEKEND if day.weekday() >= 5 else WEEKDAY
+
+    def day_types(self, ordinals: np.ndarray) -> np.ndarray:
+        """ordinal 배열에 대한 날짜 유형 배열 (벡터 조회)."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        idx = ordinals - self.base
+        inside = (idx >= 0) & (ordinals < self.end)
+        fallback = np.where((ordinals - 1) % 7 >= 5, WEEKEND, WEEKDAY).astype(np.int8)
+        return np.where(inside, self._types[np.clip(idx, 0, len(self._types) - 1)], fallback)
+
+    def add_holidays(self, holidays: Dict[datetime.date, str]) -> List[datetime.date]:
+        """임시공휴일 등을 추가하고 유형이 바뀐 날짜 목록을 반환 (가격표 갱신용)."""
+        before = self._types.copy()
+        self.names.update(holidays)
+        self._types = self._build()
+        changed = np.flatnonzero(before != self._types)
+        return [datetime.date.fromordinal(self.base + int(i)) for i in changed]
+
+
+day_calendar = DayTypeCalendar()
@@ -0,0 +1,125 @@
+"""TimeBank 식별자 생성 모듈.
+
+Snowflake 방식의 64비트 ID를 고정 길이 Crockford Base32 문자열로 인코딩합니다.
+- 41비트: 기준 시각(2025-01-01 UTC) 이후 밀리초
+- 10비트: 노드 번호 (레플리카/프로세스 구분)
+- 12비트: 같은 밀리초 안의 순번
+
+문자열 길이가 고정이므로 사전순 정렬 = 생성 시각순 정렬이며,
+시각 범위 조회는 ID 구간(lower_bound) 조회로 대체할 수 있습니다.
+
+노드 번호는 TIMEBANK_NODE_ID > 공유 저장소에서 발급받은 번호 > 호스트명+PID 해시
+순으로 정합니다. 해시는 워커가 많으면 충돌할 수 있으므로, 여러 워커가 하나의 DB를
+공유할 때는 저장소 발급(SQLiteRepository.claim_node_id)이나 환경 변수를 사용합니다.
+
+환경 변수
+- TIMEBANK_NODE_ID: 0~1023 노드 번호 (미지정 시 저장소 발급 번호, 없으면 호스트명+PID로 계산)
+"""
+
+import os
+import socket
+import logging
+import threading
+import time
+import zlib
+import datetime
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+NODE_BITS = 10
+SEQ_BITS = 12
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SEQ = (1 << SEQ_BITS) - 1
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford Base32
+_ENCODED_LEN = 13  # 64비트 -> 13자
+
+
+def _encode(value: int) -> str:
+    chars = []
+    for _ in range(_ENCODED_LEN):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def _decode(text: str) -> int:
+    value = 0
+    for ch in text:
+        value = (value << 5) | _ALPHABET.index(ch)
+    return value
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _default_node_id() -> int:
+    env = os.getenv("TIMEBANK_NODE_ID")
+    if env:
+        return int(env) & MAX_NODE
+    return zlib.crc32(_owner().encode()) & MAX_NODE
+
+
+def resolve_node_id(claim: Optional[Callable[[str], Optional[int]]] = None) -> int:
+    """워커 시작 시 노드 번호 결정 (선택한 번호와 출처를 로그로 남김).
+
+    claim(owner)은 공유 저장소가 발급한 증가 번호를 반환하며(공유하지 않는 저장소는 None),
+    번호를 MAX_NODE + 1로 나눈 나머지를 사용하므로 동시에 떠 있는 워커가 1024개 미만이면 겹치지 않습니다.
+    """
+    if os.getenv("TIMEBANK_NODE_ID"):
+        node_id, source = _default_node_id(), "TIMEBANK_NODE_ID"
+    else:
+        owner = _owner()
+        claimed = claim(owner) if claim is not None else None
+        if claimed is not None:
+            node_id, source = claimed & MAX_NODE, "repository claim"
+        else:
+            node_id, source = _default_node_id(), f"hash of {owner}"
+    logger.info("Using node id %d (%s)", node_id, source)
+    return node_id
+
+
+def _to_epoch_ms(moment: datetime.datetime) -> int:
+    # naive datetime은 로컬 시각으로 간주 (Booking.created_at과 동일 기준)
+    return int(moment.timestamp() * 1000)
+
+
+class IdGenerator:
+    """시간 순으로 정렬되는 충돌 없는 ID 생성기 (스레드 안전)."""
+
+    def __init__(self, prefix: str = "bk_", node_id: Optional[int] = None):
+        self.prefix = prefix
+        self.node_id = (_default_node_id() if node_id is None else node_id) & MAX_NODE
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._seq = 0
+
+    def next_id(self) -> str:
+        with self._lock:
+            now = int(time.time() * 1000)
+            if now <= self._last_ms:
+                # 같은 밀리초이거나 시계가 뒤로 간 경우: 마지막 시각 기준으로 순번 증가
+                now = self._last_ms
+                self._seq += 1
+                if self._seq > MAX_SEQ:
+                    now += 1
+                    self._seq = 0
+            else:
+                self._seq = 0
+            self._last_ms = now
+            value = ((now - EPOCH_MS) << (NODE_BITS + SEQ_BITS)) | (self.node_id << SEQ_BITS) | self._seq
+        return self.prefix + _encode(value)
+
+    def lower_bound(self, moment: datetime.datetime) -> str:
+        """moment 이후 생성된 모든 ID보다 작거나 같은 경계 ID."""
+        ms = max(_to_epoch_ms(moment) - EPOCH_MS, 0)
+        return self.prefix + _encode(ms << (NODE_BITS + SEQ_BITS))
+
+    def timestamp_of(self, id_value: str) -> datetime.datetime:
+        """ID에 기록된 생성 시각 (로컬 naive datetime)."""
+        value = _decode(id_value[len(self.prefix):])
+        ms = (value >> (NODE_BITS + SEQ_BITS)) + EPOCH_MS
+        return datetime.datetime.fromtimestamp(ms / 1000)
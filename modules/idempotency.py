@@ -0,0 +1,81 @@
+"""TimeBank 멱등성(idempotency) 모듈.
+
+Streamlit은 버튼 더블 클릭/리런 시 같은 제출을 여러 번 실행할 수 있습니다.
+화면이 폼마다 발급한 멱등성 키로 첫 실행 결과를 TTL 캐시에 보관하고,
+같은 키의 재제출에는 가격/포인트 계산과 저장 없이 그 결과를 그대로 돌려줍니다.
+
+- 같은 키가 동시에 들어오면 키 단위 락으로 한 번만 실행합니다.
+- 실패(예외)는 캐시하지 않으므로 같은 키로 다시 시도할 수 있습니다.
+- 캐시는 최대 max_entries개, 항목마다 ttl_seconds 동안 유지되며 오래된 것부터 제거됩니다.
+
+환경 변수
+- TIMEBANK_IDEMPOTENCY_TTL: 결과 보관 시간 (기본 600초)
+- TIMEBANK_IDEMPOTENCY_MAX: 최대 보관 개수 (기본 10000)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+DEFAULT_TTL_SECONDS = float(os.getenv("TIMEBANK_IDEMPOTENCY_TTL", "600"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("TIMEBANK_IDEMPOTENCY_MAX", "10000"))
+
+T = TypeVar("T")
+
+
+class IdempotencyCache:
+    """키 -> 첫 실행 결과를 보관하는 크기 제한 TTL 캐시."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()  # 만료 시각순
+        self._inflight: Dict[Hashable, List] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _evict(self, now: float) -> None:
+        while self._results:
+            key, (expires_at, _) = next(iter(self._results.items()))
+            if expires_at > now and len(self._results) <= self.max_entries:
+                break
+            del self._results[key]
+
+    def get(self, key: Hashable) -> Optional[object]:
+        with self._lock:
+            self._evict(self._clock())
+            hit = self._results.get(key)
+            return hit[1] if hit else None
+
+    def run(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """key로 처음 호출되면 fn()을 실행해 결과를 보관하고, 이후에는 보관된 결과를 반환."""
+        with self._lock:
+            self._evict(self._clock())
+            hit = self._results.get(key)
+            if hit:
+                return hit[1]
+            entry = self._inflight.setdefault(key, [threading.Lock(), 0])  # [키 락, 대기/실행 중인 호출 수]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                # 같은 키의 동시 제출은 먼저 들어온 실행이 끝날 때까지 기다린 뒤 그 결과를 사용
+                with self._lock:
+                    hit = self._results.get(key)
+                if hit:
+                    return hit[1]
+                result = fn()
+                with self._lock:
+                    self._results[key] = (self._clock() + self.ttl_seconds, result)
+                    self._evict(self._clock())
+                return result
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._inflight[key]
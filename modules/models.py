@@ -0,0 +1,93 @@
+"""TimeBank 데이터 모델.
+
+Region > Campsite > Unit 카탈로그와 User, Booking, LedgerEntry(포인트 원장) 엔티티를 정의합니다.
+core_logic과 저장소(storage) 모듈이 함께 사용합니다.
+"""
+
+import datetime
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# --- 데이터 모델 ---
+@dataclass
+class Unit:
+    id: str
+    name: str
+    price: int
+    max_guests: int
+    rating: float
+    image: str
+    tags: List[str]
+
+@dataclass
+class Campsite:
+    id: str
+    region_id: str
+    name: str
+    description: str
+    units: List[Unit]
+    location_desc: str = ""
+    features: List[str] = field(default_factory=list)
+    images: List[str] = field(default_factory=list)
+    base_price_weekday: int = 0  # ui/booking.py에서 참조하는 필드 추가
+    review_count: int = 0        # ui/booking.py에서 참조하는 필드 추가
+    rating: float = 0.0          # ui/booking.py에서 참조하는 필드 추가
+
+@dataclass
+class Region:
+    id: str
+    name: str
+    description: str
+    image: str # Representative image
+
+@dataclass
+class User:
+    id: str
+    name: str
+    email: str
+    is_member: bool = False
+    points: int = 0
+    invite_code: str = field(default_factory=lambda: str(uuid.uuid4())[:8].upper())
+    referral_count: int = 0
+    total_earnings: int = 0 # 총 누적 수익 (포인트)
+
+@dataclass
+class Booking:
+    id: str
+    unit_id: str
+    user_id: str
+    check_in: datetime.date
+    check_out: datetime.date
+    guests: int
+    original_price: int
+    final_price: int
+    used_points: int = 0
+    earned_points: int = 0
+    invite_code_used: Optional[str] = None
+    status: str = "CONFIRMED"
+    time_slot: str = "OVERNIGHT" # AM / PM / OVERNIGHT
+    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+    is_member: bool = False # 멤버십 회원으로 예약했는지 (관리자 회원 구분 필터)
+
+@dataclass
+class BookingRequest:
+    """단체 예약(create_bookings)의 숙소별 요청 1건"""
+    unit_id: str
+    user_id: str
+    check_in: datetime.date
+    check_out: datetime.date
+    guests: int
+    time_slot: str = "OVERNIGHT"
+    used_points: int = 0
+    is_member: bool = False
+
+@dataclass
+class LedgerEntry:
+    id: str
+    user_id: str
+    kind: str # EARN / SPEND / REFERRAL / MEMBERSHIP_PAYBACK / ADJUSTMENT / EXPIRE
+    amount: int # 적립 +, 사용 -
+    balance_after: int
+    booking_id: Optional[str] = None
+    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
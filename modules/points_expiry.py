@@ -0,0 +1,157 @@
+"""TimeBank 포인트 소멸 배치 모듈.
+
+적립 원장 항목(EARN, REFERRAL, MEMBERSHIP_PAYBACK, 양수 ADJUSTMENT)을 발생일 기준
+포인트 묶음(lot)으로 보고, 사용/소멸(음수 항목)은 가장 오래된 묶음부터 차감(FIFO)합니다.
+발생일로부터 유효기간이 지난 묶음의 남은 포인트를 소멸시킵니다.
+예약 취소 되돌림 항목은 net_reversals로 원 항목과 먼저 상쇄하므로, 취소된 적립은 자기 묶음을
+없애고 환불된 사용은 원래 차감한 묶음으로 돌아갑니다 (새 묶음이나 추가 차감이 생기지 않음).
+
+계산은 전체 원장을 컬럼 배열로 펼친 뒤 NumPy 정렬/누적합/bincount로 한 번에 처리하므로
+사용자 수와 관계없이 사용자별 Python 반복이 없습니다.
+
+알림
+- EXPIRED: 이번 실행에서 소멸된 포인트
+- EXPIRING: NOTICE_DAYS일 뒤 소멸 예정인 포인트 (해당 날짜에 한 번 발송)
+알림은 한 번의 notifier(notices) 호출로 일괄 전달되며, 기본 notifier는
+outbox JSONL 파일에 한 번에 기록합니다.
+
+cron 예시 (매일 새벽 3시)
+    0 3 * * * cd /app && python -m modules.points_expiry
+
+환경 변수
+- TIMEBANK_POINTS_VALIDITY_DAYS: 유효기간 (기본 365일)
+- TIMEBANK_POINTS_NOTICE_DAYS: 사전 알림 시점 (기본 30일 전)
+- TIMEBANK_NOTIFY_OUTBOX: 알림 outbox 경로 (기본: data/notifications/points_expiry.jsonl)
+"""
+
+import argparse
+import datetime
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+VALIDITY_DAYS = int(os.getenv("TIMEBANK_POINTS_VALIDITY_DAYS", "365"))
+NOTICE_DAYS = int(os.getenv("TIMEBANK_POINTS_NOTICE_DAYS", "30"))
+DEFAULT_OUTBOX = "data/notifications/points_expiry.jsonl"
+
+EXPIRED = "EXPIRED"
+EXPIRING = "EXPIRING"
+
+
+@dataclass
+class ExpiryNotice:
+    user_id: str
+    kind: str  # EXPIRED / EXPIRING
+    points: int
+    expires_on: datetime.date
+
+
+@dataclass
+class ExpiryResult:
+    as_of: datetime.date
+    expired_users: int
+    expired_points: int
+    notices: List[ExpiryNotice]
+
+
+def net_reversals(user_index: np.ndarray, amounts: np.ndarray, issued: np.ndarray, kinds: np.ndarray,
+                  booking_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """예약 취소 되돌림 항목을 원 항목과 상쇄한 (user_index, amounts, issued).
+
+    취소는 예약에 연결된 항목마다 같은 사용자/종류/예약의 반대 부호 항목을 남기므로
+    (points_ledger.reversals_of), 예약에 연결된 항목은 (사용자, 종류, 예약)별 합계를 원 항목
+    발생일에 둡니다. 완전히 취소된 예약의 항목은 합계 0으로 빠집니다.
+
+    Args:
+        kinds: 원장 항목 종류
+        booking_ids: 연결된 예약 ID (없으면 빈 문자열)
+    """
+    linked = booking_ids != ""
+    if not linked.any():
+        return user_index, amounts, issued
+    _, kind_code = np.unique(kinds[linked].astype(str), return_inverse=True)
+    _, booking_code = np.unique(booking_ids[linked].astype(str), return_inverse=True)
+    n_kinds, n_bookings = int(kind_code.max()) + 1, int(booking_code.max()) + 1
+    key = (user_index[linked].astype(np.int64) * n_kinds + kind_code) * n_bookings + booking_code
+    groups, first, group = np.unique(key, return_index=True, return_inverse=True)
+    net = np.bincount(group, weights=amounts[linked], minlength=len(groups)).astype(np.int64)
+    day = np.full(len(groups), np.iinfo(np.int64).max)
+    np.minimum.at(day, group, issued[linked])
+    keep = net != 0
+    return (np.concatenate([user_index[~linked], user_index[linked][first][keep]]),
+            np.concatenate([amounts[~linked], net[keep]]),
+            np.concatenate([issued[~linked], day[keep]]))
+
+
+def fifo_expiry(user_index: np.ndarray, amounts: np.ndarray, issued: np.ndarray, n_users: int, as_of: int,
+                validity_days: int = VALIDITY_DAYS, notice_days: int = NOTICE_DAYS) -> Tuple[np.ndarray, np.ndarray]:
+    """사용자별 (소멸 대상 포인트, notice_days일 뒤 소멸 예정 포인트) 배열.
+
+    Args:
+        user_index: 원장 항목별 사용자 번호 (0 ~ n_users-1)
+        amounts: 원장 항목 금액 (적립 +, 사용/소멸 -)
+        issued: 원장 항목 발생일 ordinal
+        as_of: 기준일 ordinal (발생일 + validity_days <= as_of 이면 소멸)
+    """
+    lot = amounts > 0
+    consumed = np.bincount(user_index[~lot], weights=-amounts[~lot], minlength=n_users)
+
+    # 사용자 → 발생일 순으로 정렬한 묶음별 누적합에서 사용자 시작 오프셋을 빼면 사용자 내 누적합
+    order = np.lexsort((issued[lot], user_index[lot]))
+    lot_user = user_index[lot][order]
+    lot_amount = amounts[lot][order].astype(np.float64)
+    lot_expires = issued[lot][order] + validity_days
+    totals = np.bincount(lot_user, weights=lot_amount, minlength=n_users)
+    offsets = np.concatenate([[0.0], np.cumsum(totals)[:-1]])
+    within = np.cumsum(lot_amount) - offsets[lot_user]
+    remaining = np.clip(within - consumed[lot_user], 0.0, lot_amount)
+
+    expired = lot_expires <= as_of
+    expiring = lot_expires == as_of + notice_days
+    expired_points = np.bincount(lot_user[expired], weights=remaining[expired], minlength=n_users)
+    expiring_points = np.bincount(lot_user[expiring], weights=remaining[expiring], minlength=n_users)
+    return np.rint(expired_points).astype(np.int64), np.rint(expiring_points).astype(np.int64)
+
+
+def build_notices(user_ids: np.ndarray, expired: np.ndarray, expiring: np.ndarray, as_of: datetime.date,
+                  notice_days: int = NOTICE_DAYS) -> List[ExpiryNotice]:
+    notices = [ExpiryNotice(str(user_ids[i]), EXPIRED, int(expired[i]), as_of) for i in np.flatnonzero(expired)]
+    notice_date = as_of + datetime.timedelta(days=notice_days)
+    notices += [ExpiryNotice(str(user_ids[i]), EXPIRING, int(expiring[i]), notice_date) for i in np.flatnonzero(expiring)]
+    return notices
+
+
+def write_outbox(notices: List[ExpiryNotice], path: Optional[str] = None) -> None:
+    """알림을 outbox JSONL 파일에 일괄 기록 (발송 워커가 읽어 처리)."""
+    if not notices:
+        return
+    path = Path(path or os.getenv("TIMEBANK_NOTIFY_OUTBOX", DEFAULT_OUTBOX))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = "".join(json.dumps({**asdict(n), "expires_on": n.expires_on.isoformat()}, ensure_ascii=False) + "\n"
+                    for n in notices)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
+
+
+Notifier = Callable[[List[ExpiryNotice]], None]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="TimeBank 포인트 소멸 배치")
+    parser.add_argument("--date", help="기준일 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument("--dry-run", action="store_true", help="소멸 처리 없이 대상만 계산")
+    args = parser.parse_args(argv)
+
+    from modules.core_logic import get_system
+    as_of = datetime.date.fromisoformat(args.date) if args.date else None
+    result = get_system().expire_points(as_of, dry_run=args.dry_run)
+    print(f"expired users={result.expired_users} points={result.expired_points:,} "
+          f"notices={len(result.notices)} dry_run={args.dry_run}")
+
+
+if __name__ == "__main__":
+    main()
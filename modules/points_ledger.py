@@ -0,0 +1,177 @@
+"""TimeBank 포인트 원장 모듈.
+
+포인트 변동을 추가 전용 원장(LedgerEntry)으로 기록합니다.
+- EARN: 예약 결제 5% 적립
+- SPEND: 예약 시 포인트 사용 (음수)
+- REFERRAL: 초대한 사용자에게 지급된 10% 리워드
+- MEMBERSHIP_PAYBACK: 멤버십 가입 즉시 페이백
+- ADJUSTMENT: 가입/이관 시 초기 지급 등 수동 보정
+- EXPIRE: 유효기간이 지난 포인트 소멸 (음수, modules/points_expiry.py)
+예약 취소는 해당 예약의 항목을 같은 종류, 반대 부호로 다시 기록해 되돌립니다 (reversals_of).
+
+저장소는 원장 항목만으로 사용자 상태(잔액, 멤버십, 초대 실적)를 갱신합니다 (apply_entry와 같은 규칙).
+원장 ID는 생성 시각순으로 정렬되므로 월별 명세서는 저장소에서 사용자별 ID 구간 하나만 읽습니다
+(month_range, build_statement).
+"""
+
+import bisect
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from modules.id_gen import IdGenerator
+from modules.models import LedgerEntry, User
+
+EARN = "EARN"
+SPEND = "SPEND"
+REFERRAL = "REFERRAL"
+MEMBERSHIP_PAYBACK = "MEMBERSHIP_PAYBACK"
+ADJUSTMENT = "ADJUSTMENT"
+EXPIRE = "EXPIRE"
+
+# 잔액을 음수로 만들 수 없는 차감 항목
+DEBITS = (SPEND, EXPIRE)
+# 지급 포인트로 집계하는 항목 (관리자 통계, 취소 되돌림 항목은 음수로 상계)
+ISSUED = (EARN, REFERRAL, MEMBERSHIP_PAYBACK)
+
+
+@dataclass
+class Statement:
+    user_id: str
+    year: int
+    month: int
+    opening_balance: int
+    closing_balance: int
+    earned: int
+    spent: int
+    entries: List[LedgerEntry]
+
+
+def build_statement(user_id: str, year: int, month: int, window: List[LedgerEntry], opening: int) -> Statement:
+    """해당 월 원장 항목(ID순)과 기초 잔액으로 명세서 작성."""
+    return Statement(
+        user_id=user_id, year=year, month=month,
+        opening_balance=opening,
+        closing_balance=window[-1].balance_after if window else opening,
+        earned=sum(e.amount for e in window if e.amount > 0),
+        spent=-sum(e.amount for e in window if e.amount < 0),
+        entries=window,
+    )
+
+
+def reversals_of(entries: Iterable[LedgerEntry]) -> List[Tuple[str, str, int, Optional[str]]]:
+    """예약 원장 항목을 되돌리는 posting 목록 (사용 포인트 환불, 적립/리워드 회수)."""
+    return [(e.user_id, e.kind, -e.amount, e.booking_id) for e in entries if e.amount]
+
+
+def apply_entry(user: User, entry: LedgerEntry) -> None:
+    """원장 항목 1건을 사용자 상태에 반영하고 entry.balance_after를 채움.
+
+    - 차감(SPEND, EXPIRE)으로 잔액이 음수가 되면 ValueError
+    - MEMBERSHIP_PAYBACK은 멤버십을 활성화 (이미 회원이면 ValueError)
+    - REFERRAL은 초대 실적(횟수, 누적 수익)을 함께 증감 (음수 금액은 취소 환수)
+    """
+    balance = user.points + entry.amount
+    if entry.kind in DEBITS and balance < 0:
+        raise ValueError("Not enough points")
+    if entry.kind == MEMBERSHIP_PAYBACK and entry.amount >= 0:
+        if user.is_member:
+            raise ValueError("Already a member")
+        user.is_member = True
+    elif entry.kind == REFERRAL:
+        user.referral_count += 1 if entry.amount > 0 else -1
+        user.total_earnings += entry.amount
+    user.points = entry.balance_after = balance
+
+
+class PointsLedger:
+    """포인트 원장 및 사용자별 잔액 (메모리 인덱스).
+
+    draft()로 만든 원장 항목은 저장소에 영속화된 뒤 apply()로 반영합니다.
+    같은 사용자의 draft/apply는 호출 측(TimeBankSystem의 사용자 락)에서 직렬화합니다.
+    """
+
+    def __init__(self, node_id: Optional[int] = None):
+        self._ids = IdGenerator("pl_", node_id)
+        self._lock = threading.Lock()
+        self._balances: Dict[str, int] = {}
+        self._entries: Dict[str, List[LedgerEntry]] = {}  # user_id -> ID(시각)순 원장
+        self._entry_ids: Dict[str, List[str]] = {}  # bisect용 ID 목록
+
+    def load(self, entries: Iterable[LedgerEntry]) -> None:
+        with self._lock:
+            self._balances.clear()
+            self._entries.clear()
+            self._entry_ids.clear()
+            for entry in sorted(entries, key=lambda e: e.id):
+                self._append(entry)
+
+    def _append(self, entry: LedgerEntry) -> bool:
+        """항목 반영 (이미 있는 ID면 건너뛰고 False)."""
+        ids = self._entry_ids.setdefault(entry.user_id, [])
+        entries = self._entries.setdefault(entry.user_id, [])
+        if ids and entry.id <= ids[-1]:
+            i = bisect.bisect_left(ids, entry.id)
+            if ids[i] == entry.id:
+                return False
+            ids.insert(i, entry.id)
+            entries.insert(i, entry)
+        else:
+            ids.append(entry.id)
+            entries.append(entry)
+        self._balances[entry.user_id] = self._balances.get(entry.user_id, 0) + entry.amount
+        return True
+
+    def balance(self, user_id: str) -> int:
+        return self._balances.get(user_id, 0)
+
+    def draft(self, postings: Iterable[Tuple[str, str, int, Optional[str]]]) -> List[LedgerEntry]:
+        """(user_id, kind, amount, booking_id) 목록을 원장 항목으로 변환 (금액 0은 제외, 멤버십 가입은 기록).
+
+        balance_after는 이 프로세스가 아는 잔액 기준 추정치이며, 저장소가 트랜잭션 안에서 다시 계산합니다.
+        """
+        running: Dict[str, int] = {}
+        drafted = []
+        for user_id, kind, amount, booking_id in postings:
+            if not amount and kind != MEMBERSHIP_PAYBACK:
+                continue
+            balance = running.get(user_id, self.balance(user_id)) + amount
+            running[user_id] = balance
+            entry_id = self._ids.next_id()
+            drafted.append(LedgerEntry(id=entry_id, user_id=user_id, kind=kind, amount=amount,
+                                       balance_after=balance, booking_id=booking_id,
+                                       created_at=self._ids.timestamp_of(entry_id)))
+        return drafted
+
+    def apply(self, entries: Iterable[LedgerEntry]) -> List[LedgerEntry]:
+        """저장된 항목 반영. 다른 워커 변경 동기화로 같은 항목이 다시 와도 한 번만 반영하며, 새로 반영한 항목을 반환."""
+        with self._lock:
+            return [entry for entry in entries if self._append(entry)]
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """전체 원장을 (user_id, amount, 발생일 ordinal, kind, booking_id) 컬럼 배열로 반환 (일괄 처리용).
+
+        booking_id가 없는 항목은 빈 문자열입니다.
+        """
+        with self._lock:
+            entries = [e for user_entries in self._entries.values() for e in user_entries]
+        user_ids = np.array([e.user_id for e in entries], dtype=object)
+        amounts = np.fromiter((e.amount for e in entries), dtype=np.int64, count=len(entries))
+        issued = np.fromiter((e.created_at.toordinal() for e in entries), dtype=np.int64, count=len(entries))
+        kinds = np.array([e.kind for e in entries], dtype=object)
+        booking_ids = np.array([e.booking_id or "" for e in entries], dtype=object)
+        return user_ids, amounts, issued, kinds, booking_ids
+
+    def history(self, user_id: str, limit: Optional[int] = None) -> List[LedgerEntry]:
+        """최신순 원장 항목."""
+        entries = self._entries.get(user_id, [])
+        return list(reversed(entries[-limit:] if limit else entries))
+
+    def month_range(self, year: int, month: int) -> Tuple[str, str]:
+        """해당 월에 생성된 원장 항목의 ID 구간 [start_id, end_id) (저장소 구간 조회용)."""
+        start = datetime.datetime(year, month, 1)
+        end = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+        return self._ids.lower_bound(start), self._ids.lower_bound(end)
@@ -0,0 +1,172 @@
+"""TimeBank 가격 계산 모듈.
+
+TimeBankSystem.calculate_price의 요금 규칙(주말/공휴일 할증, 시간대 배수, 멤버십 무료)을
+단건 계산과 NumPy 일괄 계산 두 경로로 제공합니다.
+규칙은 modules/pricing_rules.py의 JSON 선언을 컴파일한 실행 계획(PricingPlan)이며,
+두 경로는 같은 단계를 같은 부동소수 연산 순서와 정수 절사로 실행하므로 결과가 항상 일치합니다.
+날짜별 할증 여부는 modules/holidays.py의 날짜 유형표(주말/공휴일/공휴일 전날)를 따릅니다.
+"""
+
+import datetime
+import threading
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from modules import pricing_rules
+from modules.holidays import WEEKDAY, WEEKEND, day_calendar
+from modules.models import Campsite, Unit
+
+SLOTS = ("AM", "PM", "OVERNIGHT")
+
+DateLike = Union[datetime.date, np.datetime64]
+
+_plan_lock = threading.Lock()
+_active_plan = pricing_rules.compile_rules(pricing_rules.load_rules()[0])
+
+
+def get_plan() -> pricing_rules.PricingPlan:
+    return _active_plan
+
+
+def set_plan(plan: pricing_rules.PricingPlan) -> None:
+    """실행 계획 교체 (호출 측에서 가격 캐시를 무효화해야 함)."""
+    global _active_plan
+    with _plan_lock:
+        _active_plan = plan
+
+
+def base_price_of(campsite_or_unit) -> int:
+    """Campsite는 평일 기본가, Unit은 1박 가격을 기준가로 사용."""
+    if isinstance(campsite_or_unit, Campsite):
+        return campsite_or_unit.base_price_weekday
+    if isinstance(campsite_or_unit, Unit):
+        return campsite_or_unit.price
+    return 0
+
+
+def quote_price(base_price: int, is_weekend: bool, time_slot: str, is_member: bool,
+                membership_type: Optional[str] = None) -> int:
+    """단건 가격 계산 (날짜 없이 주말 여부만 아는 경우: 기간 한정 프로모션 미적용)."""
+    plan = get_plan()
+    return plan.quote(base_price, WEEKEND if is_weekend else WEEKDAY, time_slot,
+                      plan.resolve_plan(is_member, membership_type))
+
+
+def quote_day(base_price: int, day: datetime.date, time_slot: str, is_member: bool,
+              membership_type: Optional[str] = None) -> int:
+    """특정 날짜의 단건 가격 (날짜 유형표와 프로모션 기간 반영)."""
+    plan = get_plan()
+    return plan.quote(base_price, day_calendar.day_type(day), time_slot,
+                      plan.resolve_plan(is_member, membership_type), day.toordinal())
+
+
+def to_ordinals(dates: Iterable[DateLike]) -> np.ndarray:
+    """date 목록(또는 datetime64 배열)을 date.toordinal() 값 배열로 변환."""
+    arr = np.asarray(dates)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        # 1970-01-01의 ordinal = 719163
+        return arr.astype("datetime64[D]").astype(np.int64) + 719163
+    return np.fromiter((d.toordinal() for d in arr), dtype=np.int64, count=len(arr))
+
+
+def quote_matrix(targets: Sequence, dates: Iterable[DateLike], slots: Sequence[str] = SLOTS,
+                 is_member: bool = False, membership_type: Optional[str] = None) -> np.ndarray:
+    """숙소(또는 캠핑장) × 날짜 × 시간대 가격 행렬을 한 번에 계산.
+
+    Returns:
+        shape (len(targets), len(dates), len(slots)) 의 int64 배열
+    """
+    base = np.fromiter((base_price_of(t) for t in targets), dtype=np.int64, count=len(targets))
+    return quote_base_matrix(base, to_ordinals(dates), slots, is_member, membership_type)
+
+
+def quote_base_matrix(base_prices: np.ndarray, ordinals: np.ndarray, slots: Sequence[str] = SLOTS,
+                      is_member: bool = False, membership_type: Optional[str] = None) -> np.ndarray:
+    """기준가 배열 × 날짜(ordinal) 배열 × 시간대 가격 행렬 (quote_matrix의 내부 구현)."""
+    plan = get_plan()
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    return plan.quote_matrix(np.asarray(base_prices), ordinals, day_calendar.day_types(ordinals), tuple(slots),
+                             plan.resolve_plan(is_member, membership_type))
+
+
+def stay_nights(check_in: datetime.date, check_out: datetime.date) -> np.ndarray:
+    """숙박일(ordinal) 배열. 당일 이용(check_out <= check_in)은 check_in 하루."""
+    start = check_in.toordinal()
+    return np.arange(start, max(check_out.toordinal(), start + 1), dtype=np.int64)
+
+
+def quote_stay(base_price: int, check_in: datetime.date, check_out: datetime.date, time_slot: str,
+               is_member: bool, membership_type: Optional[str] = None) -> int:
+    """숙박 기간 총액: 박마다 그 날의 날짜 유형으로 계산한 가격의 합."""
+    nightly = quote_base_matrix(np.array([base_price]), stay_nights(check_in, check_out), (time_slot,),
+                                is_member, membership_type)
+    return int(nightly.sum())
+
+
+def date_range(start: datetime.date, days: int) -> np.ndarray:
+    """start부터 days일 동안의 datetime64[D] 배열."""
+    return np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + days)
+
+
+class PriceCalendar:
+    """숙소/캠핑장별 향후 N일 × 시간대 가격표 캐시 (최저가 달력용).
+
+    - 최초 조회 시 quote_matrix로 한 번에 계산해 메모리에 보관합니다.
+    - 기준가가 바뀌면 해당 숙소 행만, refresh_dates()로 지정한 날짜는
+      해당 열만 다시 계산합니다.
+    - 날짜가 넘어가면 겹치는 구간은 재사용하고 새로 들어온 날짜만 계산합니다.
+    """
+
+    def __init__(self, days: int = 365, slots: Sequence[str] = SLOTS):
+        self.days = days
+        self.slots = tuple(slots)
+        self._entries = {}  # target.id -> (start_ordinal, base_price, prices[days, slots])
+
+    def _compute(self, target, start_ordinal: int, offset: int = 0, count: int = None) -> np.ndarray:
+        count = self.days - offset if count is None else count
+        start = datetime.date.fromordinal(start_ordinal + offset)
+        return quote_matrix([target], date_range(start, count), self.slots)[0]
+
+    def get(self, target, today: datetime.date = None) -> np.ndarray:
+        """오늘부터 days일의 (days, slots) 가격 배열."""
+        start = (today or datetime.date.today()).toordinal()
+        base = base_price_of(target)
+        entry = self._entries.get(target.id)
+        if entry is None or entry[1] != base:
+            prices = self._compute(target, start)
+        elif entry[0] != start:
+            shift = start - entry[0]
+            prices = entry[2]
+            if 0 < shift < self.days:
+                tail = self._compute(target, start, self.days - shift, shift)
+                prices = np.concatenate([prices[shift:], tail])
+            else:
+                prices = self._compute(target, start)
+        else:
+            return entry[2]
+        self._entries[target.id] = (start, base, prices)
+        return prices
+
+    def refresh_dates(self, dates: Iterable[datetime.date]) -> None:
+        """요금 규칙(공휴일 등)이 바뀐 날짜만 모든 캐시에서 다시 계산."""
+        ordinals = np.array(sorted({d.toordinal() for d in dates}), dtype=np.int64)
+        for start, base, prices in list(self._entries.values()):
+            offsets = ordinals - start
+            inside = (offsets >= 0) & (offsets < self.days)
+            if inside.any():
+                prices[offsets[inside]] = quote_base_matrix(np.array([base]), ordinals[inside], self.slots)[0]
+
+    def invalidate(self, target_id: str = None) -> None:
+        if target_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(target_id, None)
+
+    def cheapest_dates(self, target, time_slot: str, count: int = 5, today: datetime.date = None):
+        """가장 저렴한 날짜 count개 [(date, price), ...] (같은 가격이면 빠른 날짜 우선)."""
+        today = today or datetime.date.today()
+        column = self.get(target, today)[:, self.slots.index(time_slot)]
+        order = np.argsort(column, kind="stable")[:count]
+        return [(today + datetime.timedelta(days=int(i)), int(column[i])) for i in order]
+
@@ -0,0 +1,166 @@
+"""TimeBank 요금 규칙 모듈.
+
+요금 규칙(할증, 할인, 멤버십 플랜, 프로모션 기간)을 JSON으로 선언하고,
+한 번 컴파일한 평면 실행 계획(PricingPlan)으로 단건/일괄 가격을 계산합니다.
+
+규칙 형식 (rules 목록 순서대로 적용, 단계마다 원 단위 절사)
+{
+  "rules": [
+    {"name": "주말/공휴일 할증", "multiplier": 1.2, "day_types": ["WEEKEND", "HOLIDAY", "HOLIDAY_EVE"]},
+    {"name": "오전 이용", "multiplier": 0.5, "slots": ["AM"]},
+    {"name": "연말 프로모션", "discount": 0.1, "start": "2026-12-01", "end": "2026-12-24"},
+    {"name": "멤버십 이용권", "discount": 1.0, "plans": ["M_SMART", "M_ROYAL"]}
+  ],
+  "default_plan": "M_SMART",      # 플랜 미지정 멤버에게 적용할 플랜
+  "invite_discount": 0.05         # 초대 코드 할인율
+}
+- multiplier 또는 discount(= 1 - 할인율) 중 하나를 지정합니다.
+- 조건(day_types, slots, start~end(포함), plans)을 생략하면 모든 경우에 적용됩니다.
+  plans 조건이 있는 규칙은 해당 플랜 멤버에게만 적용됩니다.
+
+환경 변수
+- TIMEBANK_PRICING_RULES: 규칙 JSON 파일 경로 (미지정 시 DEFAULT_RULES 사용)
+"""
+
+import datetime
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules import holidays
+
+DAY_TYPE_CODES = {"WEEKDAY": holidays.WEEKDAY, "WEEKEND": holidays.WEEKEND,
+                  "HOLIDAY": holidays.HOLIDAY, "HOLIDAY_EVE": holidays.HOLIDAY_EVE}
+
+DEFAULT_RULES = {
+    "rules": [
+        {"name": "주말/공휴일 할증", "multiplier": 1.2, "day_types": ["WEEKEND", "HOLIDAY", "HOLIDAY_EVE"]},
+        {"name": "오전 이용", "multiplier": 0.5, "slots": ["AM"]},
+        {"name": "오후 이용", "multiplier": 0.6, "slots": ["PM"]},
+        {"name": "멤버십 이용권", "discount": 1.0, "plans": ["M_SMART", "M_ROYAL"]},
+    ],
+    "default_plan": "M_SMART",
+    "invite_discount": 0.05,
+}
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """컴파일된 규칙 한 단계: 조건을 만족하면 가격 × factor 후 절사."""
+    name: str
+    factor: float
+    day_mask: np.ndarray  # 날짜 유형 코드 -> 적용 여부 (길이 4)
+    slots: Optional[frozenset]  # None이면 모든 시간대
+    start: Optional[int]  # ordinal (포함)
+    end: Optional[int]  # ordinal (포함)
+    plans: Optional[frozenset]  # None이면 모든 고객
+
+
+class PricingPlan:
+    """평면 실행 계획. 단건(quote)과 일괄(quote_matrix) 경로가 같은 단계를 같은 순서로 실행합니다."""
+
+    def __init__(self, steps: Sequence[PlanStep], default_plan: Optional[str], invite_discount: float):
+        self.steps = tuple(steps)
+        self.default_plan = default_plan
+        self.invite_discount = invite_discount
+
+    def resolve_plan(self, is_member: bool, membership_type: Optional[str]) -> Optional[str]:
+        """멤버십 플랜 이름 (비회원은 None)."""
+        if not is_member:
+            return None
+        known = {p for step in self.steps if step.plans for p in step.plans}
+        return membership_type if membership_type in known else self.default_plan
+
+    def quote(self, base_price: int, day_type: int, time_slot: str, plan: Optional[str] = None,
+              ordinal: Optional[int] = None) -> int:
+        """단건 가격. ordinal이 없으면 기간 조건이 있는 규칙(프로모션)은 적용하지 않습니다."""
+        price = base_price
+        for step in self.steps:
+            if not step.day_mask[day_type]:
+                continue
+            if step.slots is not None and time_slot not in step.slots:
+                continue
+            if step.plans is not None and plan not in step.plans:
+                continue
+            if step.start is not None or step.end is not None:
+                if ordinal is None:
+                    continue
+                if (step.start is not None and ordinal < step.start) or (step.end is not None and ordinal > step.end):
+                    continue
+            price = int(price * step.factor)
+        return price
+
+    def quote_matrix(self, base_prices: np.ndarray, ordinals: np.ndarray, day_types: np.ndarray,
+                     slots: Sequence[str], plan: Optional[str] = None) -> np.ndarray:
+        """기준가 × 날짜 × 시간대 가격 행렬 (int64)."""
+        price = np.broadcast_to(np.asarray(base_prices, dtype=np.float64)[:, None, None],
+                                (len(base_prices), len(ordinals), len(slots)))
+        for step in self.steps:
+            if step.plans is not None and plan not in step.plans:
+                continue
+            applies = step.day_mask[day_types]
+            if step.start is not None:
+                applies = applies & (ordinals >= step.start)
+            if step.end is not None:
+                applies = applies & (ordinals <= step.end)
+            slot_mask = np.array([step.slots is None or s in step.slots for s in slots])
+            factor = np.where(applies[:, None] & slot_mask[None, :], step.factor, 1.0)
+            price = np.trunc(price * factor[None, :, :])
+        return np.asarray(price, dtype=np.int64)
+
+    def invite_discount_of(self, price: int) -> int:
+        return int(price * self.invite_discount)
+
+
+def _parse_date(value: Optional[str]) -> Optional[int]:
+    return datetime.date.fromisoformat(value).toordinal() if value else None
+
+
+def compile_rules(spec: Dict) -> PricingPlan:
+    """규칙 선언을 실행 계획으로 컴파일 (형식 오류는 ValueError)."""
+    steps: List[PlanStep] = []
+    for i, rule in enumerate(spec.get("rules", [])):
+        name = rule.get("name", f"rule_{i}")
+        if ("multiplier" in rule) == ("discount" in rule):
+            raise ValueError(f"Rule '{name}' must define exactly one of multiplier/discount")
+        factor = float(rule["multiplier"]) if "multiplier" in rule else 1.0 - float(rule["discount"])
+        if factor < 0:
+            raise ValueError(f"Rule '{name}' has a negative factor")
+        day_mask = np.ones(len(DAY_TYPE_CODES), dtype=bool)
+        if "day_types" in rule:
+            unknown = set(rule["day_types"]) - set(DAY_TYPE_CODES)
+            if unknown:
+                raise ValueError(f"Rule '{name}' has unknown day types: {sorted(unknown)}")
+            day_mask[:] = False
+            day_mask[[DAY_TYPE_CODES[t] for t in rule["day_types"]]] = True
+        start, end = _parse_date(rule.get("start")), _parse_date(rule.get("end"))
+        if start is not None and end is not None and end < start:
+            raise ValueError(f"Rule '{name}' ends before it starts")
+        steps.append(PlanStep(
+            name=name,
+            factor=factor,
+            day_mask=day_mask,
+            slots=frozenset(rule["slots"]) if "slots" in rule else None,
+            start=start,
+            end=end,
+            plans=frozenset(rule["plans"]) if "plans" in rule else None,
+        ))
+    return PricingPlan(steps, spec.get("default_plan"), float(spec.get("invite_discount", 0.0)))
+
+
+def load_rules(path: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
+    """(규칙 선언, 파일 경로) 반환.
+
+    path와 TIMEBANK_PRICING_RULES가 모두 없을 때만 기본 규칙을 사용하며,
+    지정한 파일이 없으면 FileNotFoundError (잘못된 경로로 기본 요금이 적용되지 않도록).
+    """
+    path = path or os.getenv("TIMEBANK_PRICING_RULES")
+    if not path:
+        return DEFAULT_RULES, None
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Pricing rules file not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f), path
@@ -0,0 +1,141 @@
+"""TimeBank 통계 롤업 모듈.
+
+관리자 통계용 집계(매출, 예약 수, 지급 포인트, 점유)를 예약 생성/취소와 원장 기록 시점에 증분 갱신합니다.
+통계 화면은 원본 예약을 다시 집계하지 않고 미리 계산된 셀만 읽습니다.
+
+집계 단위(grain)와 키
+- day: 날짜 ordinal / month: YYYYMM
+- campsite, region: id
+- campsite_month, region_month: (id, YYYYMM)
+모든 셀은 회원 여부(is_member)로 한 번 더 나뉩니다.
+
+측정값
+- revenue(결제 금액), bookings(예약 수): 체크인 날짜 기준
+- points(지급 포인트): 원장의 적립/초대 리워드/멤버십 페이백 항목 합 (apply_points).
+  예약 항목은 예약과 같은 셀에, 예약 없는 항목은 발생일의 day/month 셀에만 더하며,
+  취소 시 되돌림 항목(음수)이 같은 셀에서 상계됩니다.
+- nights(점유 숙소-일): 숙박한 날짜마다 기록 (OVERNIGHT 1, 당일 이용 AM/PM 0.5)
+예약 1건은 grain마다 셀 하나(숙박일마다 nights 셀 하나)만 갱신하므로 O(숙박일 수)입니다.
+점유율은 nights / (숙소 수 × 일수)로 조회 시 계산합니다.
+"""
+
+import calendar
+import datetime
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.availability import stay_range
+from modules.models import Booking
+
+GRAINS = ("day", "month", "campsite", "region", "campsite_month", "region_month")
+MEASURES = ("revenue", "bookings", "points", "nights")
+SLOT_WEIGHTS = {"OVERNIGHT": 1.0, "AM": 0.5, "PM": 0.5}
+
+_REVENUE, _BOOKINGS, _POINTS, _NIGHTS = range(len(MEASURES))
+
+
+def month_key(day: datetime.date) -> int:
+    return day.year * 100 + day.month
+
+
+def _days_in_month(key: int) -> int:
+    return calendar.monthrange(key // 100, key % 100)[1]
+
+
+class BookingRollups:
+    """grain별 (키, 회원 여부) -> [revenue, bookings, points, nights] 집계."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells: Dict[str, Dict[Tuple[Hashable, bool], np.ndarray]] = {
+            grain: defaultdict(lambda: np.zeros(len(MEASURES))) for grain in GRAINS
+        }
+        self._first_night: Optional[int] = None
+        self._last_night: Optional[int] = None
+
+    def apply(self, booking: Booking, campsite_id: Optional[str], region_id: Optional[str], sign: int = 1) -> None:
+        """확정 예약 반영 (sign=1) 또는 취소 반영 (sign=-1)."""
+        member = bool(booking.is_member)
+        cells = self._cells
+        check_in_month = month_key(booking.check_in)
+        amounts = sign * np.array([booking.final_price, 1, 0.0, 0.0])  # 포인트는 원장 항목으로 반영
+        start, end = stay_range(booking.check_in, booking.check_out)
+        weight = sign * SLOT_WEIGHTS.get(booking.time_slot, 1.0)
+        with self._lock:
+            for grain, key in (("day", start), ("month", check_in_month), ("campsite", campsite_id),
+                               ("region", region_id), ("campsite_month", (campsite_id, check_in_month)),
+                               ("region_month", (region_id, check_in_month))):
+                cells[grain][key, member] += amounts
+            cells["campsite"][campsite_id, member][_NIGHTS] += weight * (end - start)
+            cells["region"][region_id, member][_NIGHTS] += weight * (end - start)
+            for night in range(start, end):
+                month = month_key(datetime.date.fromordinal(night))
+                cells["day"][night, member][_NIGHTS] += weight
+                cells["month"][month, member][_NIGHTS] += weight
+                cells["campsite_month"][(campsite_id, month), member][_NIGHTS] += weight
+                cells["region_month"][(region_id, month), member][_NIGHTS] += weight
+            self._first_night = start if self._first_night is None else min(self._first_night, start)
+            self._last_night = end - 1 if self._last_night is None else max(self._last_night, end - 1)
+
+    def apply_points(self, amount: int, day: datetime.date, is_member: bool,
+                     campsite_id: Optional[str] = None, region_id: Optional[str] = None) -> None:
+        """지급 포인트 원장 항목 1건 반영 (캠핑장을 모르면 day/month 셀에만)."""
+        month = month_key(day)
+        keys = [("day", day.toordinal()), ("month", month)]
+        if campsite_id is not None:
+            keys += [("campsite", campsite_id), ("region", region_id),
+                     ("campsite_month", (campsite_id, month)), ("region_month", (region_id, month))]
+        with self._lock:
+            for grain, key in keys:
+                self._cells[grain][key, is_member][_POINTS] += amount
+
+    def totals(self, is_member: Optional[bool] = None) -> Dict[str, float]:
+        """전체 합계 (month grain 셀 합, 예약 없는 포인트 항목 포함)."""
+        with self._lock:
+            values = [v for (_, member), v in self._cells["month"].items()
+                      if is_member is None or member == is_member]
+        total = np.sum(values, axis=0) if values else np.zeros(len(MEASURES))
+        return dict(zip(MEASURES, total.tolist()))
+
+    def frame(self, grain: str, is_member: Optional[bool] = None,
+              units: Optional[Dict[Hashable, int]] = None, total_units: int = 0) -> pd.DataFrame:
+        """grain별 집계 DataFrame (key, revenue, bookings, points, nights, occupancy).
+
+        is_member가 None이면 회원/비회원 셀을 합칩니다.
+        units: campsite/region id -> 숙소 수, total_units: 전체 숙소 수 (점유율 분모)
+        """
+        if grain not in GRAINS:
+            raise ValueError(f"Unknown rollup grain: {grain}")
+        merged: Dict[Hashable, np.ndarray] = {}
+        with self._lock:
+            for (key, member), values in self._cells[grain].items():
+                if is_member is None or member == is_member:
+                    merged[key] = merged.get(key, 0) + values
+            span = (self._last_night - self._first_night + 1) if self._first_night is not None else 0
+        keys = list(merged)
+        data = np.array([merged[k] for k in keys]).reshape(len(keys), len(MEASURES))
+        df = pd.DataFrame(data, columns=list(MEASURES))
+        df.insert(0, "key", keys)
+        for name in ("revenue", "bookings", "points"):
+            df[name] = df[name].round().astype(np.int64)
+        df["occupancy"] = df["nights"] / self._capacity(grain, keys, units or {}, total_units, span)
+        return df.sort_values("key", key=lambda s: s.map(str)).reset_index(drop=True)
+
+    @staticmethod
+    def _capacity(grain: str, keys: List[Hashable], units: Dict[Hashable, int], total_units: int,
+                  span: int) -> np.ndarray:
+        """점유율 분모: 숙소 수 × 해당 기간 일수 (분모가 0이면 NaN)."""
+        if grain == "day":
+            capacity = [total_units for _ in keys]
+        elif grain == "month":
+            capacity = [total_units * _days_in_month(k) for k in keys]
+        elif grain in ("campsite", "region"):
+            capacity = [units.get(k, 0) * span for k in keys]
+        else:
+            capacity = [units.get(k[0], 0) * _days_in_month(k[1]) for k in keys]
+        capacity = np.array(capacity, dtype=np.float64)
+        return np.where(capacity > 0, capacity, np.nan)
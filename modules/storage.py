@@ -0,0 +1,646 @@
+"""TimeBank 저장소(Repository) 모듈.
+
+TimeBankSystem이 사용하는 예약/사용자/포인트 영속화 계층입니다.
+- InMemoryRepository: 프로세스 메모리에만 보관 (테스트 및 로컬 데모용)
+- SQLiteRepository: WAL 모드 SQLite 파일 (여러 Streamlit 워커가 하나의 DB를 공유하며,
+  changes 테이블로 서로의 변경을 따라잡음)
+- EventLogRepository: 이벤트 로그 + 스냅샷 (modules/event_log.py, 단일 프로세스)
+
+사용자의 포인트 잔액, 멤버십, 초대 실적은 포인트 원장 항목으로만 변경됩니다.
+저장소는 쓰기 트랜잭션 안에서 저장된 잔액(users.points)에 각 항목을 더해 검증/반영하므로,
+프로세스마다 캐시한 User 값으로 다른 워커의 변경을 덮어쓰지 않습니다.
+
+환경 변수
+- TIMEBANK_STORAGE: "sqlite"(기본), "eventlog" 또는 "memory"
+- TIMEBANK_DB_PATH: SQLite 파일 경로 (기본: data/timebank.db)
+"""
+
+import os
+import bisect
+import sqlite3
+import datetime
+import threading
+import dataclasses
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from modules import points_ledger
+from modules.models import Booking, LedgerEntry, User
+
+DEFAULT_DB_PATH = "data/timebank.db"
+
+
+class Repository:
+    """저장소 인터페이스.
+
+    TimeBankSystem은 이 메서드들만 사용하므로, 구현체를 교체해도
+    비즈니스 로직은 변경되지 않습니다.
+    """
+
+    def load_users(self) -> List[User]:
+        raise NotImplementedError
+
+    def load_bookings(self) -> List[Booking]:
+        raise NotImplementedError
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """저장된 최신 사용자 상태 (다른 워커가 반영한 포인트/멤버십 포함)."""
+        raise NotImplementedError
+
+    def save_user(self, user: User) -> None:
+        """사용자 신규 등록 또는 프로필(이름, 이메일, 초대 코드) 갱신."""
+        self.save_users([user])
+
+    def save_users(self, users: List[User], ledger_entries: List[LedgerEntry] = ()) -> None:
+        """사용자 일괄 등록/프로필 갱신 + 원장 항목을 하나의 트랜잭션으로 저장.
+
+        신규 사용자의 잔액은 0에서 시작하며 (초기 지급은 원장 항목으로 기록),
+        기존 사용자의 포인트/멤버십/초대 실적은 여기서 덮어쓰지 않습니다.
+        """
+        raise NotImplementedError
+
+    def save_booking(self, booking: Booking, ledger_entries: List[LedgerEntry] = ()) -> None:
+        """예약 1건과 포인트 원장 항목을 하나의 트랜잭션으로 저장."""
+        self.save_bookings([booking], ledger_entries)
+
+    def save_bookings(self, bookings: List[Booking], ledger_entries: List[LedgerEntry] = ()) -> None:
+        """여러 예약(단체 예약)을 원장 항목과 함께 하나의 트랜잭션으로 저장 (하나라도 실패하면 전체 취소).
+
+        원장 항목의 balance_after는 저장 시점의 잔액으로 다시 채워지며,
+        차감으로 잔액이 부족하면 ValueError를 발생시킵니다 (points_ledger.apply_entry 규칙).
+        """
+        raise NotImplementedError
+
+    def save_points(self, ledger_entries: List[LedgerEntry]) -> None:
+        """예약 없는 포인트 변동(멤버십 페이백, 잔액 보정, 소멸) 저장."""
+        raise NotImplementedError
+
+    def load_ledger_entries(self) -> List[LedgerEntry]:
+        raise NotImplementedError
+
+    def find_ledger_entries(self, user_id: str, start_id: str, end_id: str) -> List[LedgerEntry]:
+        """사용자의 start_id <= id < end_id 원장 항목 (ID = 생성 시각순)."""
+        raise NotImplementedError
+
+    def last_ledger_entry_before(self, user_id: str, end_id: str) -> Optional[LedgerEntry]:
+        """사용자의 id < end_id 원장 항목 중 마지막 것 (기초 잔액 조회용, 없으면 None)."""
+        raise NotImplementedError
+
+    def find_booking_ledger_entries(self, booking_id: str) -> List[LedgerEntry]:
+        """예약에 연결된 원장 항목 (ID순)."""
+        raise NotImplementedError
+
+    def update_booking_status(self, booking_id: str, status: str) -> None:
+        raise NotImplementedError
+
+    def cancel_booking(self, booking_id: str, ledger_entries: List[LedgerEntry] = ()) -> bool:
+        """확정 예약을 취소하고 되돌림 원장 항목을 하나의 트랜잭션으로 저장.
+
+        이미 취소된(또는 없는) 예약이면 아무것도 기록하지 않고 False를 반환합니다.
+        """
+        raise NotImplementedError
+
+    def get_booking(self, booking_id: str) -> Optional[Booking]:
+        raise NotImplementedError
+
+    def claim_node_id(self, owner: str) -> Optional[int]:
+        """워커마다 새 번호를 발급 (ID 생성기 노드 번호용). 다른 프로세스와 공유하지 않는 저장소는 None."""
+        return None
+
+    def change_seq(self) -> int:
+        """마지막 변경 번호. 다른 프로세스와 공유하지 않는 저장소는 변경 추적 없이 0."""
+        return 0
+
+    def changes_since(self, seq: int) -> Tuple[int, List[User], List[Booking], List[LedgerEntry]]:
+        """seq 이후 다른 워커를 포함해 커밋된 (새 변경 번호, 사용자, 예약, 원장 항목).
+
+        자기 프로세스가 쓴 변경도 포함되므로 호출 측은 이미 반영한 항목을 건너뛰어야 합니다.
+        """
+        return seq, [], [], []
+
+    def find_bookings_by_user(self, user_id: str) -> List[Booking]:
+        raise NotImplementedError
+
+    def find_bookings_by_unit(self, unit_id: str) -> List[Booking]:
+        raise NotImplementedError
+
+    def find_bookings_between(self, start_id: str, end_id: str, limit: Optional[int] = None) -> List[Booking]:
+        """start_id <= id < end_id 인 예약을 id 역순(최신순)으로 조회.
+
+        예약 ID는 생성 시각순으로 정렬되므로 시각 구간 조회가 곧 ID 구간 스캔입니다.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryRepository(Repository):
+    """기존 동작과 동일한 메모리 저장소 (재시작 시 초기화됨).
+
+    사용자/예약은 복사본으로 보관하고 반환하므로 호출 측 캐시와 저장 상태가 서로 바뀌지 않습니다.
+    """
+
+    def __init__(self):
+        self._users: Dict[str, User] = {}
+        self._bookings: Dict[str, Booking] = {}
+        self._by_user: Dict[str, List[Booking]] = {}
+        self._by_unit: Dict[str, List[Booking]] = {}
+        self._sorted_ids: List[str] = []
+        self._ledger: Dict[str, List[LedgerEntry]] = {}  # user_id -> ID순 원장
+        self._ledger_by_booking: Dict[str, List[LedgerEntry]] = {}
+
+    def load_users(self) -> List[User]:
+        return [dataclasses.replace(u) for u in self._users.values()]
+
+    def load_bookings(self) -> List[Booking]:
+        return [dataclasses.replace(b) for b in self._bookings.values()]
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        user = self._users.get(user_id)
+        return dataclasses.replace(user) if user else None
+
+    def _stored_user(self, user_id: str) -> Optional[User]:
+        """검증 기준이 되는 현재 사용자 상태."""
+        return self._users.get(user_id)
+
+    def _stage_users(self, users: List[User]) -> Dict[str, User]:
+        """등록/프로필 갱신 결과 (저장 상태는 바꾸지 않은 복사본)."""
+        staged = {}
+        for user in users:
+            stored = self._stored_user(user.id)
+            staged[user.id] = (dataclasses.replace(stored, name=user.name, email=user.email, invite_code=user.invite_code)
+                               if stored else dataclasses.replace(user, points=0))
+        return staged
+
+    def _stage_ledger(self, ledger_entries: List[LedgerEntry], staged: Dict[str, User]) -> Dict[str, User]:
+        """원장 항목을 사용자 복사본에 반영 (잔액 검증 + balance_after 계산). 실패하면 저장 상태는 그대로."""
+        for entry in ledger_entries:
+            user = staged.get(entry.user_id)
+            if user is None:
+                stored = self._stored_user(entry.user_id)
+                if stored is None:
+                    raise ValueError(f"User not found: {entry.user_id}")
+                user = staged[entry.user_id] = dataclasses.replace(stored)
+            points_ledger.apply_entry(user, entry)
+        return staged
+
+    def save_users(self, users: List[User], ledger_entries: List[LedgerEntry] = ()) -> None:
+        self._users.update(self._stage_ledger(ledger_entries, self._stage_users(users)))
+        self._append_ledger(ledger_entries)
+
+    def save_bookings(self, bookings: List[Booking], ledger_entries: List[LedgerEntry] = ()) -> None:
+        self._users.update(self._stage_ledger(ledger_entries, {}))
+        for booking in bookings:
+            booking = dataclasses.replace(booking)
+            self._bookings[booking.id] = booking
+            bisect.insort(self._sorted_ids, booking.id)
+            self._by_user.setdefault(booking.user_id, []).append(booking)
+            self._by_unit.setdefault(booking.unit_id, []).append(booking)
+        self._append_ledger(ledger_entries)
+
+    def save_points(self, ledger_entries: List[LedgerEntry]) -> None:
+        self._users.update(self._stage_ledger(ledger_entries, {}))
+        self._append_ledger(ledger_entries)
+
+    def _append_ledger(self, ledger_entries: List[LedgerEntry]) -> None:
+        for entry in ledger_entries:
+            entries = self._ledger.setdefault(entry.user_id, [])
+            if entries and entry.id < entries[-1].id:
+                bisect.insort(entries, entry, key=lambda e: e.id)
+            else:
+                entries.append(entry)
+            if entry.booking_id:
+                bisect.insort(self._ledger_by_booking.setdefault(entry.booking_id, []), entry, key=lambda e: e.id)
+
+    def load_ledger_entries(self) -> List[LedgerEntry]:
+        return [e for entries in self._ledger.values() for e in entries]
+
+    def find_ledger_entries(self, user_id: str, start_id: str, end_id: str) -> List[LedgerEntry]:
+        entries = self._ledger.get(user_id, [])
+        lo = bisect.bisect_left(entries, start_id, key=lambda e: e.id)
+        hi = bisect.bisect_left(entries, end_id, key=lambda e: e.id)
+        return entries[lo:hi]
+
+    def last_ledger_entry_before(self, user_id: str, end_id: str) -> Optional[LedgerEntry]:
+        entries = self._ledger.get(user_id, [])
+        i = bisect.bisect_left(entries, end_id, key=lambda e: e.id)
+        return entries[i - 1] if i else None
+
+    def find_booking_ledger_entries(self, booking_id: str) -> List[LedgerEntry]:
+        return list(self._ledger_by_booking.get(booking_id, []))
+
+    def update_booking_status(self, booking_id: str, status: str) -> None:
+        booking = self._bookings.get(booking_id)
+        if booking:
+            booking.status = status
+
+    def cancel_booking(self, booking_id: str, ledger_entries: List[LedgerEntry] = ()) -> bool:
+        booking = self._bookings.get(booking_id)
+        if booking is None or booking.status != "CONFIRMED":
+            return False
+        self._users.update(self._stage_ledger(ledger_entries, {}))
+        self._append_ledger(ledger_entries)
+        booking.status = "CANCELLED"
+        return True
+
+    def get_booking(self, booking_id: str) -> Optional[Booking]:
+        booking = self._bookings.get(booking_id)
+        return dataclasses.replace(booking) if booking else None
+
+    def find_bookings_by_user(self, user_id: str) -> List[Booking]:
+        return [dataclasses.replace(b) for b in self._by_user.get(user_id, [])]
+
+    def find_bookings_by_unit(self, unit_id: str) -> List[Booking]:
+        return [dataclasses.replace(b) for b in self._by_unit.get(unit_id, [])]
+
+    def find_bookings_between(self, start_id: str, end_id: str, limit: Optional[int] = None) -> List[Booking]:
+        lo = bisect.bisect_left(self._sorted_ids, start_id)
+        hi = bisect.bisect_left(self._sorted_ids, end_id)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return [dataclasses.replace(self._bookings[i]) for i in reversed(self._sorted_ids[lo:hi])]
+
+
+# --- SQLite ---
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    is_member INTEGER NOT NULL DEFAULT 0,
+    points INTEGER NOT NULL DEFAULT 0,
+    invite_code TEXT NOT NULL,
+    referral_count INTEGER NOT NULL DEFAULT 0,
+    total_earnings INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    id TEXT PRIMARY KEY,
+    unit_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    check_in TEXT NOT NULL,
+    check_out TEXT NOT NULL,
+    guests INTEGER NOT NULL,
+    original_price INTEGER NOT NULL,
+    final_price INTEGER NOT NULL,
+    used_points INTEGER NOT NULL DEFAULT 0,
+    earned_points INTEGER NOT NULL DEFAULT 0,
+    invite_code_used TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    time_slot TEXT NOT NULL DEFAULT 'OVERNIGHT',
+    is_member INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_user ON bookings (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_bookings_unit ON bookings (unit_id, time_slot, check_in);
+CREATE TABLE IF NOT EXISTS points_ledger (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    balance_after INTEGER NOT NULL,
+    booking_id TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_user ON points_ledger (user_id, id);
+CREATE INDEX IF NOT EXISTS idx_ledger_booking ON points_ledger (booking_id);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    ref_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_claims (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    claimed_at TEXT NOT NULL
+);
+"""
+
+_USER_COLUMNS = "id, name, email, is_member, points, invite_code, referral_count, total_earnings"
+_BOOKING_COLUMNS = (
+    "id, unit_id, user_id, check_in, check_out, guests, original_price, final_price, "
+    "used_points, earned_points, invite_code_used, status, created_at, time_slot, is_member"
+)
+# 기존 DB 파일에 없는 컬럼 추가 (테이블, 컬럼, 정의)
+_MIGRATIONS = [
+    ("bookings", "is_member", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+# 신규 사용자는 잔액 0으로 등록, 기존 사용자는 프로필만 갱신 (잔액/멤버십/초대 실적은 원장 항목으로만 변경)
+_REGISTER_USER = (
+    "INSERT INTO users (id, name, email, is_member, invite_code, referral_count, total_earnings) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET name=excluded.name, email=excluded.email, invite_code=excluded.invite_code"
+)
+# 쓰기 트랜잭션(BEGIN IMMEDIATE) 안에서 읽으므로 users.points가 곧 원장 기준 잔액 (원장 SUM은 오프라인 대사에서만 사용)
+_USER_POINTS = "SELECT points FROM users WHERE id = ?"
+_SET_POINTS = "UPDATE users SET points = ? WHERE id = ?"
+_JOIN_MEMBERSHIP = "UPDATE users SET is_member = 1 WHERE id = ? AND is_member = 0"
+_CREDIT_REFERRAL = "UPDATE users SET referral_count = referral_count + ?, total_earnings = total_earnings + ? WHERE id = ?"
+_CANCEL_BOOKING = "UPDATE bookings SET status = 'CANCELLED' WHERE id = ? AND status = 'CONFIRMED'"
+_INSERT_BOOKING = f"INSERT INTO bookings ({_BOOKING_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_LEDGER_COLUMNS = "id, user_id, kind, amount, balance_after, booking_id, created_at"
+_INSERT_LEDGER = f"INSERT INTO points_ledger ({_LEDGER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+# 같은 숙소/시간대의 확정 예약 중 [check_in, check_out) 구간이 겹치는 것 (당일 이용은 하루로 취급)
+# 다른 워커가 따라잡을 변경 기록 (쓰기와 같은 트랜잭션에서 추가, kind: user/booking/ledger)
+_RECORD_CHANGE = "INSERT INTO changes (kind, ref_id) VALUES (?, ?)"
+_LAST_CHANGE = "SELECT COALESCE(MAX(seq), 0) FROM changes"
+_CHANGED_IDS = "SELECT DISTINCT ref_id FROM changes WHERE kind = ? AND seq > ? AND seq <= ?"
+# 워커 노드 번호 발급 (AUTOINCREMENT라 행을 지워도 번호는 재사용되지 않음, 최근 기록만 보관)
+_CLAIM_NODE = "INSERT INTO node_claims (owner, claimed_at) VALUES (?, ?)"
+_PRUNE_NODE_CLAIMS = "DELETE FROM node_claims WHERE seq <= ?"
+_NODE_CLAIM_HISTORY = 1024
+_FIND_CONFLICT = (
+    "SELECT id FROM bookings WHERE unit_id = ? AND time_slot = ? AND status = 'CONFIRMED' "
+    "AND check_in < ? AND MAX(check_out, date(check_in, '+1 day')) > ? LIMIT 1"
+)
+
+
+def _user_params(user: User) -> tuple:
+    return (user.id, user.name, user.email, int(user.is_member), user.invite_code,
+            user.referral_count, user.total_earnings)
+
+
+def _booking_params(b: Booking) -> tuple:
+    return (b.id, b.unit_id, b.user_id, b.check_in.isoformat(), b.check_out.isoformat(), b.guests,
+            b.original_price, b.final_price, b.used_points, b.earned_points, b.invite_code_used,
+            b.status, b.created_at.isoformat(), b.time_slot, int(b.is_member))
+
+
+def _ledger_params(e: LedgerEntry) -> tuple:
+    return (e.id, e.user_id, e.kind, e.amount, e.balance_after, e.booking_id, e.created_at.isoformat())
+
+
+def _apply_ledger(conn: sqlite3.Connection, ledger_entries: List[LedgerEntry]) -> None:
+    """원장 항목을 현재 트랜잭션 안에서 기록 (points_ledger.apply_entry와 같은 규칙).
+
+    잔액은 트랜잭션 안에서 읽은 users.points에 항목을 더해 계산하고 (원장 전체를 합산하지 않음),
+    사용자 행의 멤버십/초대 실적은 조건부/증분 UPDATE로만 바꿉니다.
+    """
+    balances: Dict[str, int] = {}
+    for entry in ledger_entries:
+        if entry.user_id not in balances:
+            row = conn.execute(_USER_POINTS, (entry.user_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"User not found: {entry.user_id}")
+            balances[entry.user_id] = row[0]
+        balance = balances[entry.user_id] + entry.amount
+        if entry.kind in points_ledger.DEBITS and balance < 0:
+            raise ValueError("Not enough points")
+        if entry.kind == points_ledger.MEMBERSHIP_PAYBACK and entry.amount >= 0:
+            if not conn.execute(_JOIN_MEMBERSHIP, (entry.user_id,)).rowcount:
+                raise ValueError("Already a member")
+        elif entry.kind == points_ledger.REFERRAL:
+            conn.execute(_CREDIT_REFERRAL, (1 if entry.amount > 0 else -1, entry.amount, entry.user_id))
+        balances[entry.user_id] = entry.balance_after = balance
+    conn.executemany(_INSERT_LEDGER, [_ledger_params(e) for e in ledger_entries])
+    conn.executemany(_RECORD_CHANGE, [("ledger", e.id) for e in ledger_entries])
+    conn.executemany(_RECORD_CHANGE, [("user", user_id) for user_id in balances])
+    for user_id, balance in balances.items():
+        if not conn.execute(_SET_POINTS, (balance, user_id)).rowcount:
+            raise ValueError(f"User not found: {user_id}")
+
+
+def _row_to_ledger(row) -> LedgerEntry:
+    return LedgerEntry(id=row[0], user_id=row[1], kind=row[2], amount=row[3], balance_after=row[4],
+                       booking_id=row[5], created_at=datetime.datetime.fromisoformat(row[6]))
+
+
+def _row_to_user(row) -> User:
+    return User(id=row[0], name=row[1], email=row[2], is_member=bool(row[3]), points=row[4],
+                invite_code=row[5], referral_count=row[6], total_earnings=row[7])
+
+
+def _row_to_booking(row) -> Booking:
+    return Booking(
+        id=row[0], unit_id=row[1], user_id=row[2],
+        check_in=datetime.date.fromisoformat(row[3]),
+        check_out=datetime.date.fromisoformat(row[4]),
+        guests=row[5], original_price=row[6], final_price=row[7],
+        used_points=row[8], earned_points=row[9], invite_code_used=row[10],
+        status=row[11], created_at=datetime.datetime.fromisoformat(row[12]), time_slot=row[13],
+        is_member=bool(row[14]),
+    )
+
+
+class SQLiteRepository(Repository):
+    """WAL 모드 SQLite 저장소.
+
+    - 스레드마다 별도 커넥션을 사용합니다 (Streamlit 세션 스레드 대응).
+    - 모든 쿼리는 고정 SQL + 바인딩 파라미터로 실행되어 sqlite3의
+      statement cache(prepared statement)를 재사용합니다.
+    - 쓰기는 BEGIN IMMEDIATE 트랜잭션으로 처리하며, WAL 덕분에
+      다른 프로세스의 읽기는 쓰기 중에도 막히지 않습니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """스키마 생성 후, 이전 버전 DB 파일에 없는 컬럼을 추가."""
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        for table, column, definition in _MIGRATIONS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.conn = conn
+        return conn
+
+    def load_users(self) -> List[User]:
+        rows = self._conn().execute(f"SELECT {_USER_COLUMNS} FROM users").fetchall()
+        return [_row_to_user(r) for r in rows]
+
+    def load_bookings(self) -> List[Booking]:
+        rows = self._conn().execute(f"SELECT {_BOOKING_COLUMNS} FROM bookings ORDER BY created_at").fetchall()
+        return [_row_to_booking(r) for r in rows]
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        row = self._conn().execute(f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?", (user_id,)).fetchone()
+        return _row_to_user(row) if row else None
+
+    def save_users(self, users: List[User], ledger_entries: List[LedgerEntry] = ()) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_REGISTER_USER, [_user_params(u) for u in users])
+            conn.executemany(_RECORD_CHANGE, [("user", u.id) for u in users])
+            _apply_ledger(conn, ledger_entries)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def save_bookings(self, bookings: List[Booking], ledger_entries: List[LedgerEntry] = ()) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 워커 프로세스가 먼저 같은 구간을 예약했는지 트랜잭션 안에서 재확인
+            for booking in bookings:
+                check_out = max(booking.check_out, booking.check_in + datetime.timedelta(days=1))
+                conflict = conn.execute(_FIND_CONFLICT, (booking.unit_id, booking.time_slot,
+                                                         check_out.isoformat(), booking.check_in.isoformat())).fetchone()
+                if conflict:
+                    raise ValueError(f"Unit already booked ({conflict[0]})")
+                # 같은 배치 안의 예약끼리도 겹치면 위 조회에서 걸리도록 하나씩 삽입
+                conn.execute(_INSERT_BOOKING, _booking_params(booking))
+                conn.execute(_RECORD_CHANGE, ("booking", booking.id))
+            _apply_ledger(conn, ledger_entries)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def save_points(self, ledger_entries: List[LedgerEntry]) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _apply_ledger(conn, ledger_entries)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def load_ledger_entries(self) -> List[LedgerEntry]:
+        rows = self._conn().execute(f"SELECT {_LEDGER_COLUMNS} FROM points_ledger ORDER BY id").fetchall()
+        return [_row_to_ledger(r) for r in rows]
+
+    def find_ledger_entries(self, user_id: str, start_id: str, end_id: str) -> List[LedgerEntry]:
+        rows = self._conn().execute(
+            f"SELECT {_LEDGER_COLUMNS} FROM points_ledger WHERE user_id = ? AND id >= ? AND id < ? ORDER BY id",
+            (user_id, start_id, end_id)
+        ).fetchall()
+        return [_row_to_ledger(r) for r in rows]
+
+    def last_ledger_entry_before(self, user_id: str, end_id: str) -> Optional[LedgerEntry]:
+        # (user_id, id) 인덱스를 역순으로 한 행만 읽음
+        row = self._conn().execute(
+            f"SELECT {_LEDGER_COLUMNS} FROM points_ledger WHERE user_id = ? AND id < ? ORDER BY id DESC LIMIT 1",
+            (user_id, end_id)
+        ).fetchone()
+        return _row_to_ledger(row) if row else None
+
+    def find_booking_ledger_entries(self, booking_id: str) -> List[LedgerEntry]:
+        rows = self._conn().execute(
+            f"SELECT {_LEDGER_COLUMNS} FROM points_ledger WHERE booking_id = ? ORDER BY id", (booking_id,)
+        ).fetchall()
+        return [_row_to_ledger(r) for r in rows]
+
+    def update_booking_status(self, booking_id: str, status: str) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE bookings SET status = ? WHERE id = ?", (status, booking_id))
+            conn.execute(_RECORD_CHANGE, ("booking", booking_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def cancel_booking(self, booking_id: str, ledger_entries: List[LedgerEntry] = ()) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 워커가 먼저 취소했으면 되돌림 항목을 중복 기록하지 않음
+            if not conn.execute(_CANCEL_BOOKING, (booking_id,)).rowcount:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(_RECORD_CHANGE, ("booking", booking_id))
+            _apply_ledger(conn, ledger_entries)
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_booking(self, booking_id: str) -> Optional[Booking]:
+        row = self._conn().execute(f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE id = ?", (booking_id,)).fetchone()
+        return _row_to_booking(row) if row else None
+
+    def claim_node_id(self, owner: str) -> Optional[int]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = conn.execute(_CLAIM_NODE, (owner, datetime.datetime.now().isoformat())).lastrowid
+            conn.execute(_PRUNE_NODE_CLAIMS, (seq - _NODE_CLAIM_HISTORY,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return seq
+
+    def change_seq(self) -> int:
+        return self._conn().execute(_LAST_CHANGE).fetchone()[0]
+
+    def changes_since(self, seq: int) -> Tuple[int, List[User], List[Booking], List[LedgerEntry]]:
+        conn = self._conn()
+        # 세 조회가 같은 시점을 보도록 읽기 트랜잭션으로 묶음 (WAL이므로 쓰기를 막지 않음)
+        conn.execute("BEGIN")
+        try:
+            last = conn.execute(_LAST_CHANGE).fetchone()[0]
+            if last <= seq:
+                return seq, [], [], []
+            users = conn.execute(f"SELECT {_USER_COLUMNS} FROM users WHERE id IN ({_CHANGED_IDS})",
+                                 ("user", seq, last)).fetchall()
+            bookings = conn.execute(
+                f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE id IN ({_CHANGED_IDS}) ORDER BY id",
+                ("booking", seq, last)).fetchall()
+            entries = conn.execute(
+                f"SELECT {_LEDGER_COLUMNS} FROM points_ledger WHERE id IN ({_CHANGED_IDS}) ORDER BY id",
+                ("ledger", seq, last)).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return (last, [_row_to_user(r) for r in users], [_row_to_booking(r) for r in bookings],
+                [_row_to_ledger(r) for r in entries])
+
+    def find_bookings_by_user(self, user_id: str) -> List[Booking]:
+        rows = self._conn().execute(
+            f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE user_id = ? ORDER BY created_at", (user_id,)
+        ).fetchall()
+        return [_row_to_booking(r) for r in rows]
+
+    def find_bookings_by_unit(self, unit_id: str) -> List[Booking]:
+        rows = self._conn().execute(
+            f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE unit_id = ? ORDER BY check_in", (unit_id,)
+        ).fetchall()
+        return [_row_to_booking(r) for r in rows]
+
+    def find_bookings_between(self, start_id: str, end_id: str, limit: Optional[int] = None) -> List[Booking]:
+        rows = self._conn().execute(
+            f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE id >= ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (start_id, end_id, -1 if limit is None else limit)
+        ).fetchall()
+        return [_row_to_booking(r) for r in rows]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_repository() -> Repository:
+    """환경 변수 설정에 따라 저장소 구현체를 생성합니다."""
+    backend = os.getenv("TIMEBANK_STORAGE", "sqlite").lower()
+    if backend == "memory":
+        return InMemoryRepository()
+    if backend == "eventlog":
+        from modules.event_log import DEFAULT_EVENT_DIR, DEFAULT_SNAPSHOT_EVERY, EventLogRepository
+        return EventLogRepository(os.getenv("TIMEBANK_EVENT_DIR", DEFAULT_EVENT_DIR),
+                                  int(os.getenv("TIMEBANK_SNAPSHOT_EVERY", DEFAULT_SNAPSHOT_EVERY)),
+                                  fsync=os.getenv("TIMEBANK_EVENT_FSYNC", "1") != "0")
+    return SQLiteRepository(os.getenv("TIMEBANK_DB_PATH", DEFAULT_DB_PATH))
@@ -4,6 +4,7 @@
 """
 
 import os
+import uuid
 import streamlit as st
 from PIL import Image, UnidentifiedImageError, ImageDraw
 
@@ -68,3 +69,17 @@ def create_placeholder_image(width: int = 400, height: int = 300, text: str = "N
     draw.line((0, 0) + img.size, fill=(150, 150, 150), width=3)
     draw.line((0, img.size[1], img.size[0], 0), fill=(150, 150, 150), width=3)
     return img
+
+def form_idempotency_key(form_id: str, *inputs) -> str:
+    """
+    예약 폼의 멱등성 키를 반환합니다.
+    입력값이 같은 동안은 세션에 저장된 같은 키를 재사용하고(더블 클릭/리런 중복 방지),
+    입력값이 바뀌면 새 키를 발급합니다.
+    """
+    state_key = f"_idempotency_{form_id}"
+    signature = repr(inputs)
+    saved = st.session_state.get(state_key)
+    if not saved or saved[0] != signature:
+        saved = (signature, uuid.uuid4().hex)
+        st.session_state[state_key] = saved
+    return saved[1]
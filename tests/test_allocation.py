@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단체 배정(최소 비용 커버)이 전수 조사 결과와 같은 최소 비용을 찾는지 테스트
+"""
+
+import os
+import sys
+import itertools
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import allocation
+
+
+def _brute_force(capacities, costs, guests):
+    """모든 부분집합 중 수용 인원 합 >= guests 인 최소 비용 (없으면 None)."""
+    best = None
+    for size in range(len(capacities) + 1):
+        for combo in itertools.combinations(range(len(capacities)), size):
+            if capacities[list(combo)].sum() >= guests:
+                cost = costs[list(combo)].sum()
+                best = cost if best is None else min(best, cost)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_solve_cover_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 11))
+    capacities = rng.integers(1, 9, size=n)
+    # 같은 가격/수용 인원이 자주 겹치도록 좁은 범위에서 뽑음 (지배 제거의 동률 처리 확인)
+    costs = rng.integers(1, 6, size=n) * 10000
+    guests = int(rng.integers(1, capacities.sum() + 4))
+
+    chosen = allocation.solve_cover(capacities, costs, guests)
+    expected = _brute_force(capacities, costs, guests)
+    if expected is None:
+        assert chosen is None
+        return
+    assert chosen is not None
+    assert len(set(chosen.tolist())) == len(chosen)
+    assert capacities[chosen].sum() >= guests
+    assert costs[chosen].sum() == expected
+
+
+def test_trivial_cases():
+    capacities, costs = np.array([4, 2]), np.array([100, 50])
+    assert len(allocation.solve_cover(capacities, costs, 0)) == 0
+    assert allocation.solve_cover(capacities, costs, 7) is None
+    assert sorted(allocation.solve_cover(capacities, costs, 6).tolist()) == [0, 1]
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예약 컬럼 미러 테스트: 용량 확장/취소 반영 후 조건 조회(rows)와 DataFrame 값이 예약 목록 전수 조사와 같은지
+"""
+
+import os
+import sys
+import random
+import datetime
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.booking_columns import BookingColumns
+from modules.id_gen import IdGenerator
+from modules.models import Booking
+
+START = datetime.date(2026, 3, 1)
+
+
+def _locate(unit_id):
+    return (f"c_{unit_id[-1]}", "r_even" if int(unit_id[-1]) % 2 == 0 else "r_odd") if unit_id != "u9" else (None, None)
+
+
+def _bookings(seed, count=300):
+    rng = random.Random(seed)
+    ids = IdGenerator("bk_", node_id=seed)
+    created = datetime.datetime(2026, 1, 1, 9, 0)
+    bookings = []
+    for _ in range(count):
+        check_in = START + datetime.timedelta(days=rng.randrange(40))
+        created += datetime.timedelta(seconds=rng.choice([0, 1, 90]))
+        bookings.append(Booking(
+            id=ids.next_id(), unit_id=f"u{rng.randrange(10)}", user_id=f"user{rng.randrange(7)}",
+            check_in=check_in, check_out=check_in + datetime.timedelta(days=rng.randint(0, 3)),
+            guests=rng.randint(1, 6), original_price=rng.randrange(0, 400000, 1000),
+            final_price=rng.randrange(0, 400000, 1000), used_points=rng.choice([0, 0, 5000]),
+            earned_points=rng.randrange(0, 20000), invite_code_used=None,
+            status="CONFIRMED", time_slot=rng.choice(["OVERNIGHT", "AM", "PM"]), created_at=created,
+            is_member=rng.random() < 0.5,
+        ))
+    return bookings
+
+
+def _columns(bookings, seed):
+    """용량 4에서 시작해 여러 번 확장되도록 나눠 추가하고 일부를 취소."""
+    columns = BookingColumns(_locate, capacity=4)
+    rng = random.Random(seed)
+    pos = 0
+    while pos < len(bookings):
+        step = rng.randint(1, 40)
+        columns.extend(bookings[pos:pos + step])
+        for b in rng.sample(bookings[:pos + step], k=min(3, pos + step)):
+            b.status = "CANCELLED"
+            columns.set_status(b.id, "CANCELLED")
+        pos += step
+    columns.extend(bookings[:10])  # 이미 있는 예약은 다시 추가되지 않음
+    return columns
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("filters", [
+    {},
+    {"status": "CONFIRMED"},
+    {"status": "CANCELLED", "is_member": True},
+    {"start": START + datetime.timedelta(days=10), "end": START + datetime.timedelta(days=20)},
+    {"end": START + datetime.timedelta(days=5), "is_member": False},
+    {"status": "NO_SUCH_STATUS"},
+])
+def test_rows_match_brute_force(seed, filters):
+    bookings = _bookings(seed)
+    columns = _columns(bookings, seed)
+    assert len(columns) == len(bookings)
+
+    start, end = filters.get("start"), filters.get("end")
+    expected = [row for row, b in enumerate(bookings)
+                if (start is None or b.check_in >= start) and (end is None or b.check_in <= end)
+                and ("is_member" not in filters or b.is_member == filters["is_member"])
+                and ("status" not in filters or b.status == filters["status"])]
+    rows = columns.rows(newest_first=False, **filters)
+    assert rows.tolist() == expected
+    # 최신순: 생성 시각 내림차순 (같은 시각이면 나중에 추가된 행 먼저)
+    newest = columns.rows(**filters)
+    assert newest.tolist() == sorted(expected, key=lambda row: (bookings[row].created_at, row), reverse=True)
+
+
+def test_frame_values_match_bookings():
+    bookings = _bookings(11)
+    columns = _columns(bookings, 11)
+    frame = columns.frame(labels={"region_id": {"r_even": "짝수 지역", "r_odd": "홀수 지역"}})
+    assert frame["id"].tolist() == [b.id for b in bookings]
+    for name in ("unit_id", "user_id", "time_slot", "status", "guests", "final_price", "used_points", "is_member"):
+        assert frame[name].tolist() == [getattr(b, name) for b in bookings], name
+    assert [d.date() for d in frame["check_in"]] == [b.check_in for b in bookings]
+    assert [d.date() for d in frame["check_out"]] == [b.check_out for b in bookings]
+    assert frame["created_at"].tolist() == [b.created_at for b in bookings]
+    assert frame["campsite_id"].tolist() == [_locate(b.unit_id)[0] or "" for b in bookings]
+    region_labels = {"r_even": "짝수 지역", "r_odd": "홀수 지역", None: ""}
+    assert frame["region_id"].tolist() == [region_labels[_locate(b.unit_id)[1]] for b in bookings]
+
+    subset = columns.rows(status="CANCELLED")
+    assert columns.frame(subset)["id"].tolist() == [bookings[row].id for row in subset]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관리자 예약 조회의 keyset 페이지네이션이 전체 정렬 결과와 같은 순서로 빠짐/중복 없이 넘어가는지 테스트
+"""
+
+import os
+import sys
+import random
+import datetime
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.booking_columns import SORT_COLUMNS, BookingColumns
+from modules.id_gen import IdGenerator
+from modules.models import Booking
+
+START = datetime.date(2026, 3, 1)
+
+
+def _bookings(seed, count=157):
+    """정렬 키 동률이 많은 예약 목록 (같은 가격, 같은 체크인, 같은 생성 시각)."""
+    rng = random.Random(seed)
+    ids = IdGenerator("bk_", node_id=seed)
+    created = datetime.datetime(2026, 1, 1, 9, 0)
+    bookings = []
+    for _ in range(count):
+        check_in = START + datetime.timedelta(days=rng.randrange(20))
+        created += datetime.timedelta(minutes=rng.choice([0, 0, 1, 7]))
+        bookings.append(Booking(
+            id=ids.next_id(), unit_id=f"u{rng.randrange(6)}", user_id=f"user{rng.randrange(4)}",
+            check_in=check_in, check_out=check_in + datetime.timedelta(days=rng.randint(1, 3)), guests=2,
+            original_price=100000, final_price=rng.choice([50000, 80000, 80000, 120000]),
+            status=rng.choice(["CONFIRMED", "CONFIRMED", "CANCELLED"]), created_at=created,
+            is_member=rng.random() < 0.4,
+        ))
+    return bookings
+
+
+def _full_sort(bookings, sort_by, descending, start=None, end=None, is_member=None, status=None):
+    """조건에 맞는 예약을 (정렬 키, 입력 순서)로 전체 정렬한 ID 목록."""
+    rows = [(row, b) for row, b in enumerate(bookings)
+            if (start is None or b.check_in >= start) and (end is None or b.check_in <= end)
+            and (is_member is None or b.is_member == is_member) and (status is None or b.status == status)]
+    rows.sort(key=lambda item: (getattr(item[1], sort_by), item[0]), reverse=descending)
+    return [b.id for _, b in rows]
+
+
+def _page_through(columns, limit, **filters):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = columns.page(after=cursor, limit=limit, **filters)
+        assert len(page.frame) <= limit
+        ids.extend(page.frame["id"].tolist())
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids, page.total, pages
+        assert pages <= page.total  # 커서가 전진하지 않으면 무한 반복
+
+
+@pytest.mark.parametrize("sort_by", SORT_COLUMNS)
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit", [1, 7, 50, 500])
+def test_pages_match_full_sort(sort_by, descending, limit):
+    bookings = _bookings(seed=len(sort_by) + limit)
+    columns = BookingColumns(lambda unit_id: (f"c_{unit_id}", "r1"), capacity=8)
+    columns.extend(bookings[:60])
+    columns.extend(bookings[60:])
+
+    ids, total, _ = _page_through(columns, limit, sort_by=sort_by, descending=descending)
+    assert ids == _full_sort(bookings, sort_by, descending)
+    assert total == len(bookings)
+
+
+@pytest.mark.parametrize("filters", [
+    {"status": "CONFIRMED"},
+    {"is_member": True},
+    {"start": START + datetime.timedelta(days=5), "end": START + datetime.timedelta(days=12)},
+    {"is_member": False, "status": "CANCELLED", "start": START + datetime.timedelta(days=3)},
+])
+def test_filtered_pages_match_full_sort(filters):
+    bookings = _bookings(seed=7)
+    columns = BookingColumns(lambda unit_id: (f"c_{unit_id}", "r1"))
+    columns.extend(bookings)
+
+    for sort_by in SORT_COLUMNS:
+        ids, total, _ = _page_through(columns, 9, sort_by=sort_by, descending=True, **filters)
+        expected = _full_sort(bookings, sort_by, True, **filters)
+        assert ids == expected and total == len(expected)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예약 취소 시 포인트 되돌림 테스트 (예약 -> 취소 -> 잔액/초대 실적 원상 복구)
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core_logic import TimeBankSystem
+from modules.event_log import EventLogRepository
+from modules.models import User
+from modules.storage import InMemoryRepository, SQLiteRepository
+
+
+@pytest.fixture(params=["memory", "sqlite", "eventlog"])
+def system(request, tmp_path):
+    if request.param == "memory":
+        repository = InMemoryRepository()
+    elif request.param == "sqlite":
+        repository = SQLiteRepository(str(tmp_path / "timebank.db"))
+    else:
+        repository = EventLogRepository(str(tmp_path / "events"), fsync=False)
+    yield TimeBankSystem(repository)
+    repository.close()
+
+
+def _state(system, user_id):
+    user = system._repository.get_user(user_id)
+    return user.points, user.referral_count, user.total_earnings
+
+
+def test_cancel_restores_points_and_referral(system):
+    guest = system.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=30000))
+    inviter = system.get_user("demo_user")
+    unit = system.get_all_campsites()[0].units[0]
+    check_in = datetime.date.today() + datetime.timedelta(days=30)
+    before = {uid: _state(system, uid) for uid in (guest.id, inviter.id)}
+
+    booking = system.create_booking(unit.id, guest.id, check_in, check_in + datetime.timedelta(days=2), 2,
+                                    used_points=10000, invite_code=inviter.invite_code)
+    assert booking.earned_points > 0
+    assert _state(system, inviter.id)[1] == before[inviter.id][1] + 1
+
+    system.cancel_booking(booking.id)
+    assert {uid: _state(system, uid) for uid in (guest.id, inviter.id)} == before
+    assert system.get_points_balance(guest.id) == before[guest.id][0]
+    assert system.is_available(unit.id, check_in, check_in + datetime.timedelta(days=2))
+
+    # 중복 취소는 포인트를 다시 되돌리지 않음
+    system.cancel_booking(booking.id)
+    assert {uid: _state(system, uid) for uid in (guest.id, inviter.id)} == before
+
+
+def test_cancel_is_recorded_once_in_repository(system):
+    unit = system.get_all_campsites()[0].units[0]
+    check_in = datetime.date.today() + datetime.timedelta(days=40)
+    booking = system.create_booking(unit.id, "demo_user", check_in, check_in + datetime.timedelta(days=1), 2)
+    system.cancel_booking(booking.id)
+
+    # 다른 워커가 먼저 취소한 경우: 저장소는 되돌림 항목을 기록하지 않음
+    assert not system._repository.cancel_booking(booking.id, [])
+    entries = system._repository.find_booking_ledger_entries(booking.id)
+    assert sum(e.amount for e in entries) == 0
+    assert system._repository.get_booking(booking.id).status == "CANCELLED"
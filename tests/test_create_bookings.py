@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단체 예약(create_bookings) 테스트: 회원 가격 적용, 초대 리워드는 단체 예약당 한 번
+"""
+
+import os
+import sys
+import datetime
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import points_ledger
+from modules.core_logic import TimeBankSystem
+from modules.models import BookingRequest, User
+from modules.storage import InMemoryRepository
+
+CHECK_IN = datetime.date.today() + datetime.timedelta(days=30)
+CHECK_OUT = CHECK_IN + datetime.timedelta(days=2)
+
+
+def _system():
+    system = TimeBankSystem(InMemoryRepository())
+    system.add_user(User(id="guest", name="손님", email="guest@timebank.com"))
+    return system
+
+
+def test_member_requests_are_priced_as_members():
+    system = _system()
+    units = system.get_all_campsites()[0].units[:2]
+    bookings = system.create_bookings([
+        BookingRequest(units[0].id, "guest", CHECK_IN, CHECK_OUT, 2, is_member=True),
+        BookingRequest(units[1].id, "guest", CHECK_IN, CHECK_OUT, 2),
+    ])
+    member_price = system.calculate_stay_price(units[0], True, None, "OVERNIGHT", CHECK_IN, CHECK_OUT)
+    guest_price = system.calculate_stay_price(units[1], False, None, "OVERNIGHT", CHECK_IN, CHECK_OUT)
+    assert member_price != system.calculate_stay_price(units[0], False, None, "OVERNIGHT", CHECK_IN, CHECK_OUT)
+    assert [b.original_price for b in bookings] == [member_price, guest_price]
+    assert bookings[0].is_member and not bookings[1].is_member
+
+
+def test_referral_is_credited_once_per_group():
+    system = _system()
+    inviter = system.get_user("demo_user")
+    units = [u for c in system.get_all_campsites() for u in c.units][:3]
+    before = system._repository.get_user(inviter.id)
+
+    bookings = system.create_bookings([BookingRequest(u.id, "guest", CHECK_IN, CHECK_OUT, 2) for u in units],
+                                      invite_code=inviter.invite_code)
+    reward = int(sum(b.final_price for b in bookings) * 0.10)
+    after = system._repository.get_user(inviter.id)
+    assert after.referral_count == before.referral_count + 1
+    assert after.total_earnings == before.total_earnings + reward
+    assert after.points == before.points + reward
+    referrals = [e for b in bookings for e in system._repository.find_booking_ledger_entries(b.id)
+                 if e.kind == points_ledger.REFERRAL]
+    assert [(e.booking_id, e.amount) for e in referrals] == [(bookings[0].id, reward)]
+
+    # 리워드가 기록된 예약을 취소하면 단체 리워드 전체를 회수
+    system.cancel_booking(bookings[0].id)
+    restored = system._repository.get_user(inviter.id)
+    assert (restored.points, restored.referral_count, restored.total_earnings) == \
+        (before.points, before.referral_count, before.total_earnings)
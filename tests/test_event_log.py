@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+이벤트 로그 저장소 복구 테스트: 잘린/손상된 마지막 레코드 제거, 스냅샷 + 이후 로그 재생 결과가 기록 당시 상태와 같은지,
+스냅샷 후 로그 교체(중단 포함)
+"""
+
+import os
+import sys
+import datetime
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core_logic import TimeBankSystem
+from modules.event_log import _HEADER, EventLogRepository
+from modules.models import User
+
+START = datetime.date.today() + datetime.timedelta(days=10)
+
+
+def _state(repository):
+    return (sorted(repository.load_users(), key=lambda u: u.id),
+            sorted(repository.load_bookings(), key=lambda b: b.id),
+            sorted(repository.load_ledger_entries(), key=lambda e: e.id))
+
+
+def _fill(repository, bookings=12):
+    """사용자 등록, 예약(포인트 사용/적립/초대 리워드), 취소, 멤버십 가입을 기록."""
+    system = TimeBankSystem(repository)
+    inviter = system.get_user("demo_user")
+    system.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=20000))
+    units = [u for c in system.get_all_campsites() for u in c.units]
+    created = []
+    for i in range(bookings):
+        check_in = START + datetime.timedelta(days=i)
+        created.append(system.create_booking(units[i % len(units)].id, "guest", check_in,
+                                             check_in + datetime.timedelta(days=1), 2, used_points=500,
+                                             invite_code=inviter.invite_code))
+    for booking in created[::3]:
+        system.cancel_booking(booking.id)
+    system.join_membership("guest")
+    return system
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    directory = str(tmp_path / "events")
+    repository = EventLogRepository(directory, fsync=False)
+    _fill(repository)
+    expected = _state(repository)
+    repository.close()
+    log_path = repository.log_path
+    size = log_path.stat().st_size
+
+    # 헤더만 쓰고 payload 도중 중단된 레코드
+    with open(log_path, "ab") as f:
+        f.write(_HEADER.pack(500, 0) + b'{"seq": 999, "ev')
+    reopened = EventLogRepository(directory, fsync=False)
+    assert _state(reopened) == expected
+    assert log_path.stat().st_size == size
+
+    # 잘라낸 뒤 이어 쓴 레코드도 다시 열면 그대로 재생됨
+    reopened.save_users([User(id="late", name="늦은 손님", email="late@timebank.com")])
+    expected = _state(reopened)
+    reopened.close()
+    again = EventLogRepository(directory, fsync=False)
+    assert _state(again) == expected and again.get_user("late") is not None
+    again.close()
+
+
+def test_crc_mismatch_drops_last_record(tmp_path):
+    directory = str(tmp_path / "events")
+    repository = EventLogRepository(directory, fsync=False)
+    _fill(repository)
+    before_last = _state(repository)
+    size = repository.log_path.stat().st_size
+    repository.save_users([User(id="late", name="늦은 손님", email="late@timebank.com")])
+    repository.close()
+
+    # 마지막 레코드 payload의 한 바이트를 바꿈 (길이는 맞지만 CRC 불일치)
+    data = bytearray(repository.log_path.read_bytes())
+    data[size + _HEADER.size + 5] ^= 0xFF
+    repository.log_path.write_bytes(bytes(data))
+
+    reopened = EventLogRepository(directory, fsync=False)
+    assert _state(reopened) == before_last and reopened.get_user("late") is None
+    assert reopened.log_path.stat().st_size == size
+    reopened.close()
+
+
+def test_snapshot_plus_replay_matches_live_state(tmp_path):
+    directory = str(tmp_path / "events")
+    repository = EventLogRepository(directory, snapshot_every=7, fsync=False)
+    _fill(repository, bookings=20)
+    assert repository.snapshot_path.exists()
+    expected = _state(repository)
+    repository.close()
+
+    reopened = EventLogRepository(directory, snapshot_every=7, fsync=False)
+    assert _state(reopened) == expected
+    # 스냅샷 이후에 기록된 레코드도 재생되어야 같은 상태가 됨
+    reopened.snapshot()
+    system = TimeBankSystem(reopened)
+    assert expected[1][1].status == "CONFIRMED"
+    system.cancel_booking(expected[1][1].id)
+    expected = _state(reopened)
+    reopened.close()
+    assert _state(EventLogRepository(directory, snapshot_every=7, fsync=False)) == expected
+
+
+def test_snapshot_rotates_log(tmp_path):
+    directory = str(tmp_path / "events")
+    repository = EventLogRepository(directory, fsync=False)
+    _fill(repository)
+    size = repository.log_path.stat().st_size
+    repository.snapshot()
+    # 스냅샷에 포함된 레코드는 로그에서 잘려 나가고 이후 기록은 새 로그 끝에 이어 씀
+    assert repository.log_path.stat().st_size == 0 < size
+    repository.save_users([User(id="late", name="늦은 손님", email="late@timebank.com")])
+    tail = repository.log_path.stat().st_size
+    assert 0 < tail < size
+    expected = _state(repository)
+    repository.close()
+
+    reopened = EventLogRepository(directory, fsync=False)
+    assert _state(reopened) == expected and reopened.log_path.stat().st_size == tail
+    reopened.close()
+
+
+def test_interrupted_rotation_skips_snapshotted_records(tmp_path):
+    directory = str(tmp_path / "events")
+    repository = EventLogRepository(directory, fsync=False)
+    _fill(repository)
+    expected = _state(repository)
+    old_log = repository.log_path.read_bytes()
+    repository.snapshot()
+    repository.close()
+
+    # 스냅샷은 교체했지만 로그 교체 전에 중단된 상황: 스냅샷 이하 레코드를 다시 반영하지 않음
+    repository.log_path.write_bytes(old_log)
+    reopened = EventLogRepository(directory, fsync=False)
+    assert _state(reopened) == expected
+    reopened.close()
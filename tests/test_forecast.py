@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매출/점유율 예측 테스트: 요일/추세/공휴일로 만든 합성 시계열을 학습해 향후 값을 맞히는지, 증분 재학습이 한 번에 학습한 결과와 같은지,
+야간 재학습이 실패해도 스레드가 살아 있는지
+"""
+
+import os
+import sys
+import datetime
+import logging
+import time
+
+import numpy as np
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import holidays
+from modules.forecast import Forecaster
+
+TODAY = datetime.date(2026, 9, 1)
+WEEKDAY_REVENUE = np.array([100, 90, 95, 110, 180, 320, 260], dtype=float) * 1000
+KEYS = ["c_a", "c_b"]
+SCALE = np.array([1.0, 0.4])
+
+
+def _truth(ordinals):
+    """캠핑장별 (매출, 점유율): 요일 패턴 + 완만한 추세 + 공휴일 할증."""
+    ordinals = np.asarray(ordinals)
+    weekday = (ordinals - 1) % 7
+    trend = (ordinals - TODAY.toordinal()) / 365.0
+    day_types = holidays.day_calendar.day_types(ordinals)
+    holiday = (day_types == holidays.HOLIDAY) * 150000.0 + (day_types == holidays.HOLIDAY_EVE) * 80000.0
+    revenue = (WEEKDAY_REVENUE[weekday] + 30000.0 * trend + holiday)[:, None] * SCALE
+    occupancy = np.clip(0.2 + 0.6 * (weekday >= 4) + 0.05 * trend + (holiday > 0) * 0.15, 0, 1)[:, None] * SCALE
+    return revenue, occupancy
+
+
+def _history(start, days):
+    revenue, occupancy = _truth(np.arange(start.toordinal(), start.toordinal() + days))
+    return {"revenue": revenue, "occupancy": occupancy}
+
+
+def test_forecast_recovers_seasonal_pattern():
+    forecaster = Forecaster(KEYS, _history, horizon_days=60, history_days=730)
+    frame = forecaster.refit(TODAY)
+    assert len(frame) == 60 * len(KEYS) and forecaster.fitted_until == TODAY and forecaster.n_days == 730
+
+    revenue, occupancy = _truth(np.arange(TODAY.toordinal(), TODAY.toordinal() + 60))
+    predicted_revenue = frame["revenue"].to_numpy().reshape(60, len(KEYS))
+    predicted_occupancy = frame["occupancy"].to_numpy().reshape(60, len(KEYS))
+    # 릿지 항(λ=1)이 수준/공휴일 계수를 조금 줄이므로 최대값의 5% 안에서 일치
+    assert (np.abs(predicted_revenue - revenue) < 0.05 * revenue.max(axis=0)).all()
+    assert np.abs(predicted_occupancy - occupancy).max() < 0.05
+    # 요일별 평균 매출의 순위는 캠핑장마다 실제 패턴과 같음
+    weekday = (np.arange(TODAY.toordinal(), TODAY.toordinal() + 60) - 1) % 7
+    for col in range(len(KEYS)):
+        means = [predicted_revenue[weekday == d, col].mean() for d in range(7)]
+        assert np.argsort(means).tolist() == np.argsort(WEEKDAY_REVENUE).tolist()
+
+
+def test_incremental_refit_matches_single_fit():
+    later = TODAY + datetime.timedelta(days=45)
+    incremental = Forecaster(KEYS, _history, horizon_days=30, history_days=365)
+    incremental.refit(TODAY)
+    incremental.refit(TODAY + datetime.timedelta(days=1))
+    incremental.refit(later)
+
+    single = Forecaster(KEYS, _history, horizon_days=30, history_days=365 + 45)
+    single.refit(later)
+    assert incremental.n_days == single.n_days == 365 + 45
+    for measure in ("revenue", "occupancy"):
+        assert np.allclose(incremental._models[measure].coef, single._models[measure].coef, rtol=1e-9, atol=1e-6)
+    # 같은 날 다시 호출하면 학습 없이 캐시 반환
+    assert incremental.forecast(later) is incremental.forecast(later)
+
+
+def test_nightly_thread_survives_failed_refit(caplog):
+    calls = []
+
+    def broken_history(start, days):
+        calls.append(start)
+        raise RuntimeError("history query failed")
+
+    forecaster = Forecaster(KEYS, broken_history, horizon_days=30, history_days=60)
+    with caplog.at_level(logging.ERROR, logger="modules.forecast"):
+        forecaster.start_nightly_refit()
+        deadline = time.monotonic() + 5
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # 실패를 기록한 뒤에도 다음 재학습 시각까지 대기 중
+        assert calls and forecaster._thread.is_alive()
+        assert "Nightly forecast refit failed" in caplog.text and "history query failed" in caplog.text
+    forecaster.stop()
+    forecaster._thread.join(timeout=5)
+    assert not forecaster._thread.is_alive()
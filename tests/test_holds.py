@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임시 확보(hold) 테스트: 만료 힙의 지연 삭제, 만료 시 가용성 복구, 예약 전환
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core_logic import TimeBankSystem
+from modules.holds import Hold, HoldBook
+from modules.models import User
+from modules.storage import InMemoryRepository
+
+NOW = datetime.datetime(2026, 5, 1, 12, 0)
+CHECK_IN = datetime.date.today() + datetime.timedelta(days=25)
+CHECK_OUT = CHECK_IN + datetime.timedelta(days=2)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+def _hold(hold_id, seconds):
+    return Hold(hold_id, "u1", "guest", CHECK_IN, CHECK_OUT, "OVERNIGHT", NOW + datetime.timedelta(seconds=seconds))
+
+
+def test_heap_pops_in_expiry_order_and_skips_removed():
+    clock = _Clock()
+    book = HoldBook(clock)
+    for hold_id, seconds in [("h3", 30), ("h1", 10), ("h2", 20), ("h4", 40)]:
+        book.add(_hold(hold_id, seconds))
+    assert not book.has_expired()
+
+    # 해제된 확보는 힙에 남아 있다가 꺼낼 때 건너뜀 (지연 삭제)
+    assert book.remove("h2").id == "h2"
+    assert len(book) == 3 and len(book._heap) == 4
+    clock.advance(25)
+    assert book.has_expired()
+    assert [h.id for h in book.pop_expired()] == ["h1"]
+    assert len(book._heap) == 2 and not book.has_expired()
+    assert book.get("h1") is None and book.get("h3").id == "h3"
+
+    clock.advance(100)
+    assert [h.id for h in book.pop_expired()] == ["h3", "h4"]
+    assert len(book) == 0 and not book._heap and book.active() == []
+
+
+def test_get_hides_expired_before_sweep():
+    clock = _Clock()
+    book = HoldBook(clock)
+    book.add(_hold("h1", 10))
+    clock.advance(10)
+    assert book.get("h1") is None and book.active() == []
+    assert len(book) == 1  # 목록에서는 다음 정리 때 제거
+
+
+@pytest.fixture
+def system():
+    system = TimeBankSystem(InMemoryRepository())
+    system._holds.clock = _Clock()
+    system.add_user(User(id="guest", name="손님", email="guest@timebank.com"))
+    return system
+
+
+def test_hold_blocks_others_until_expiry(system):
+    unit = system.get_all_campsites()[0].units[0]
+    hold = system.hold_unit(unit.id, "guest", CHECK_IN, CHECK_OUT, ttl_seconds=60)
+    assert not system.is_available(unit.id, CHECK_IN, CHECK_OUT)
+    assert CHECK_IN in system.get_unavailable_dates(unit.id, days=60)
+    with pytest.raises(ValueError):
+        system.create_booking(unit.id, "demo_user", CHECK_IN, CHECK_OUT, 2)
+    with pytest.raises(ValueError):
+        system.hold_unit(unit.id, "demo_user", CHECK_IN, CHECK_OUT)
+
+    system._holds.clock.advance(60)
+    assert system.is_available(unit.id, CHECK_IN, CHECK_OUT)
+    assert CHECK_IN not in system.get_unavailable_dates(unit.id, days=60)
+    assert system.get_hold(hold.id) is None
+    with pytest.raises(ValueError, match="Hold not found"):
+        system.create_booking(unit.id, "guest", CHECK_IN, CHECK_OUT, 2, hold_id=hold.id)
+
+
+def test_hold_converts_to_booking(system):
+    unit = system.get_all_campsites()[0].units[0]
+    hold = system.hold_unit(unit.id, "guest", CHECK_IN, CHECK_OUT, ttl_seconds=60)
+
+    # 다른 사용자/다른 기간으로는 전환할 수 없고 확보는 유지됨
+    with pytest.raises(ValueError, match="Hold does not match"):
+        system.create_booking(unit.id, "demo_user", CHECK_IN, CHECK_OUT, 2, hold_id=hold.id)
+    with pytest.raises(ValueError, match="Hold does not match"):
+        system.create_booking(unit.id, "guest", CHECK_IN, CHECK_OUT + datetime.timedelta(days=1), 2, hold_id=hold.id)
+    assert system.get_hold(hold.id) is hold
+
+    booking = system.create_booking(unit.id, "guest", CHECK_IN, CHECK_OUT, 2, hold_id=hold.id)
+    assert booking.status == "CONFIRMED" and system.get_hold(hold.id) is None
+    # 전환 후 확보가 만료되어도 예약 구간은 그대로 막혀 있음
+    system._holds.clock.advance(600)
+    assert not system.is_available(unit.id, CHECK_IN, CHECK_OUT)
+
+    system.cancel_booking(booking.id)
+    assert system.is_available(unit.id, CHECK_IN, CHECK_OUT)
+
+
+def test_release_frees_the_dates(system):
+    unit = system.get_all_campsites()[0].units[0]
+    hold = system.hold_unit(unit.id, "guest", CHECK_IN, CHECK_OUT, ttl_seconds=60)
+    assert system.release_hold(hold.id) and not system.release_hold(hold.id)
+    assert system.is_available(unit.id, CHECK_IN, CHECK_OUT)
+    booking = system.create_booking(unit.id, "demo_user", CHECK_IN, CHECK_OUT, 2)
+    assert booking.user_id == "demo_user"
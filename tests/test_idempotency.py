@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+멱등성 캐시 테스트: 같은 키는 한 번만 실행, TTL 만료와 최대 개수 초과 시 오래된 결과부터 제거
+"""
+
+import os
+import sys
+import datetime
+import threading
+import time
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core_logic import TimeBankSystem
+from modules.idempotency import IdempotencyCache
+from modules.storage import InMemoryRepository
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_result_expires_after_ttl():
+    clock = _Clock()
+    cache = IdempotencyCache(ttl_seconds=60, clock=clock)
+    calls = []
+    assert cache.run("k", lambda: calls.append(1) or len(calls)) == 1
+    clock.now += 59
+    assert cache.run("k", lambda: calls.append(1) or len(calls)) == 1
+    assert cache.get("k") == 1
+    clock.now += 1
+    assert cache.get("k") is None and len(cache) == 0
+    assert cache.run("k", lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_oldest_results_are_evicted_over_max_entries():
+    clock = _Clock()
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=3, clock=clock)
+    for i in range(5):
+        cache.run(f"k{i}", lambda i=i: i)
+        clock.now += 1
+    assert len(cache) == 3
+    assert [cache.get(f"k{i}") for i in range(5)] == [None, None, 2, 3, 4]
+    # 가장 오래된 k2부터 TTL 만료
+    clock.now = 1000.0 + 2 + 60
+    assert [cache.get(f"k{i}") for i in range(2, 5)] == [None, 3, 4]
+
+
+def test_failures_are_not_cached():
+    cache = IdempotencyCache(ttl_seconds=60, clock=_Clock())
+
+    def fail():
+        raise ValueError("Unit not available for the selected dates")
+
+    with pytest.raises(ValueError):
+        cache.run("k", fail)
+    assert cache.get("k") is None
+    assert cache.run("k", lambda: "ok") == "ok"
+
+
+def test_concurrent_submissions_run_once():
+    cache = IdempotencyCache(ttl_seconds=60)
+    calls, results = [], []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    threads = [threading.Thread(target=lambda: results.append(cache.run("k", slow))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len(results) == 8 and all(r is results[0] for r in results)
+    assert not cache._inflight
+
+
+def test_resubmitted_booking_is_created_once():
+    system = TimeBankSystem(InMemoryRepository())
+    unit = system.get_all_campsites()[0].units[0]
+    check_in = datetime.date.today() + datetime.timedelta(days=15)
+    first = system.create_booking(unit.id, "demo_user", check_in, check_in + datetime.timedelta(days=1), 2,
+                                  idempotency_key="form-1")
+    again = system.create_booking(unit.id, "demo_user", check_in, check_in + datetime.timedelta(days=1), 2,
+                                  idempotency_key="form-1")
+    assert again is first and len(system._bookings) == 1
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+숙소 × 날짜 점유 격자(occupancy)가 예약을 날짜별로 펼쳐 센 전수 조사 결과와 같은지 테스트
+"""
+
+import os
+import sys
+import random
+import datetime
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.booking_columns import BookingColumns
+from modules.core_logic import TimeBankSystem
+from modules.id_gen import IdGenerator
+from modules.models import Booking
+from modules.rollups import SLOT_WEIGHTS
+from modules.storage import InMemoryRepository
+
+START = datetime.date(2026, 6, 1)
+
+
+def _bookings(seed, count=400):
+    rng = random.Random(seed)
+    ids = IdGenerator("bk_", node_id=seed)
+    bookings = []
+    for _ in range(count):
+        # 조회 구간 앞/뒤로 걸치는 예약과 당일 이용(체크아웃 = 체크인) 포함
+        check_in = START + datetime.timedelta(days=rng.randrange(-10, 70))
+        slot = rng.choice(["OVERNIGHT", "OVERNIGHT", "AM", "PM"])
+        nights = 0 if slot != "OVERNIGHT" and rng.random() < 0.7 else rng.randint(1, 6)
+        bookings.append(Booking(
+            id=ids.next_id(), unit_id=f"u{rng.randrange(8)}", user_id="guest",
+            check_in=check_in, check_out=check_in + datetime.timedelta(days=nights), guests=2,
+            original_price=100000, final_price=100000, time_slot=slot,
+            status=rng.choice(["CONFIRMED", "CONFIRMED", "CONFIRMED", "CANCELLED"]),
+            created_at=datetime.datetime(2026, 1, 1),
+        ))
+    return bookings
+
+
+def _brute_force(bookings, unit_ids, start, days):
+    grid = np.zeros((len(unit_ids), days))
+    row_of = {unit_id: row for row, unit_id in enumerate(unit_ids)}
+    for b in bookings:
+        if b.status != "CONFIRMED" or b.unit_id not in row_of:
+            continue
+        last = max(b.check_out, b.check_in + datetime.timedelta(days=1))
+        day = b.check_in
+        while day < last:
+            offset = (day - start).days
+            if 0 <= offset < days:
+                grid[row_of[b.unit_id], offset] += SLOT_WEIGHTS[b.time_slot]
+            day += datetime.timedelta(days=1)
+    return np.minimum(grid, 1.0)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_occupancy_matches_brute_force(seed):
+    bookings = _bookings(seed)
+    columns = BookingColumns(lambda unit_id: ("c1", "r1"), capacity=16)
+    columns.extend(bookings)
+    # 목록 순서대로 행을 만들고, 목록에 없는 숙소(u7)와 예약이 없는 숙소(u_empty)도 처리
+    unit_ids = ["u3", "u0", "u_empty", "u1", "u2", "u6", "u5", "u4"]
+    days = random.Random(seed).choice([1, 31, 60])
+    grid = columns.occupancy(unit_ids, START, days)
+    assert grid.shape == (len(unit_ids), days) and grid.dtype == np.float32
+    assert np.allclose(grid, _brute_force(bookings, unit_ids, START, days), atol=1e-6)
+
+
+def test_grid_follows_bookings_and_cancellations():
+    system = TimeBankSystem(InMemoryRepository())
+    unit = system.get_all_campsites()[0].units[0]
+    start = datetime.date.today()
+    check_in = start + datetime.timedelta(days=3)
+    before = system.get_occupancy_grid(start, days=10)
+    assert before.loc[unit.id].sum() == 0
+
+    booking = system.create_booking(unit.id, "demo_user", check_in, check_in + datetime.timedelta(days=2), 2)
+    grid = system.get_occupancy_grid(start, days=10)
+    assert grid is not before
+    assert grid.loc[unit.id].tolist() == [0, 0, 0, 1, 1, 0, 0, 0, 0, 0]
+    assert system.get_occupancy_grid(start, days=10) is grid  # 예약 변경 전까지 캐시 재사용
+
+    system.cancel_booking(booking.id)
+    assert system.get_occupancy_grid(start, days=10).loc[unit.id].sum() == 0
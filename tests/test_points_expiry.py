@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+포인트 소멸(FIFO) 테스트: 예약 취소 되돌림 항목은 원 항목과 상쇄된 뒤 묶음을 계산
+"""
+
+import os
+import sys
+import datetime
+
+import numpy as np
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import points_expiry
+from modules.core_logic import TimeBankSystem
+from modules.models import User
+from modules.storage import InMemoryRepository
+
+
+def _expiry(rows, n_users, as_of, validity_days=365, notice_days=30):
+    """rows: (user, amount, 발생일, kind, booking_id) 목록."""
+    user_index, amounts, issued, kinds, booking_ids = (np.array(column, dtype=dtype) for column, dtype in
+                                                       zip(zip(*rows), (np.int64, np.int64, np.int64, object, object)))
+    user_index, amounts, issued = points_expiry.net_reversals(user_index, amounts, issued, kinds, booking_ids)
+    return points_expiry.fifo_expiry(user_index, amounts, issued, n_users, as_of, validity_days, notice_days)
+
+
+def test_cancelled_booking_is_netted_against_its_entries():
+    rows = [
+        (0, 1000, 0, "ADJUSTMENT", ""),
+        (0, -600, 100, "SPEND", "bk1"),
+        (0, 50, 100, "EARN", "bk1"),
+        (1, 80, 100, "REFERRAL", "bk1"),
+        # 300일째 취소: 사용 환불은 0일째 묶음으로 돌아가고, 적립/리워드 묶음은 사라짐
+        (0, 600, 300, "SPEND", "bk1"),
+        (0, -50, 300, "EARN", "bk1"),
+        (1, -80, 300, "REFERRAL", "bk1"),
+    ]
+    expired, _ = _expiry(rows, 2, as_of=400)
+    assert expired.tolist() == [1000, 0]
+    # 되돌림을 일반 항목으로 보면 300일째 600포인트 묶음이 새로 생기고 0일째 묶음이 650 차감됨
+    assert points_expiry.fifo_expiry(np.array([r[0] for r in rows]), np.array([r[1] for r in rows]),
+                                     np.array([r[2] for r in rows]), 2, 400)[0].tolist() == [350, 0]
+
+
+def test_uncancelled_booking_keeps_fifo_consumption():
+    rows = [
+        (0, 1000, 0, "ADJUSTMENT", ""),
+        (0, -600, 100, "SPEND", "bk1"),
+        (0, 50, 100, "EARN", "bk1"),
+        (0, -200, 120, "SPEND", "bk2"),
+        (0, 200, 130, "SPEND", "bk2"),  # bk2만 취소
+    ]
+    expired, _ = _expiry(rows, 1, as_of=400)
+    assert expired.tolist() == [400]
+    expired, expiring = _expiry(rows, 1, as_of=435)
+    assert expired.tolist() == [400] and expiring.tolist() == [50]
+
+
+def test_expire_points_after_cancellation():
+    system = TimeBankSystem(InMemoryRepository())
+    system.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=30000))
+    unit = system.get_all_campsites()[0].units[0]
+    check_in = datetime.date.today() + datetime.timedelta(days=30)
+    booking = system.create_booking(unit.id, "guest", check_in, check_in + datetime.timedelta(days=1), 2,
+                                    used_points=10000)
+    system.cancel_booking(booking.id)
+
+    later = datetime.date.today() + datetime.timedelta(days=400)
+    result = system.expire_points(later, dry_run=True)
+    assert [(n.user_id, n.points) for n in result.notices if n.kind == points_expiry.EXPIRED] == [("guest", 30000)]
+
+
+def test_fifo_matches_hand_computed_schedule():
+    # 유효기간 100일, 예고 10일
+    rows = [
+        (0, 300, 0, "ADJUSTMENT", ""),    # 묶음 A: 100일 만료
+        (0, 200, 20, "EARN", "bk1"),      # 묶음 B: 120일 만료
+        (0, -350, 50, "SPEND", "bk2"),    # A 300 전부 + B 50 차감
+        (0, 100, 60, "REFERRAL", "bk3"),  # 묶음 C: 160일 만료
+        (0, -20, 90, "EXPIRE", ""),       # B에서 20 추가 차감 -> B 130 남음
+        (1, 500, 10, "MEMBERSHIP_PAYBACK", ""),  # 묶음 D: 110일 만료
+        (1, -100, 30, "SPEND", "bk4"),    # D 400 남음
+        (2, 70, 0, "EARN", "bk5"),        # 사용 없음
+    ]
+    # (기준일, 사용자별 소멸, 사용자별 예고)
+    schedule = [
+        (90, [0, 0, 0], [0, 0, 70]),
+        (100, [0, 0, 70], [0, 400, 0]),
+        (110, [0, 400, 70], [130, 0, 0]),
+        (120, [130, 400, 70], [0, 0, 0]),
+        (150, [130, 400, 70], [100, 0, 0]),
+        (160, [230, 400, 70], [0, 0, 0]),
+    ]
+    for as_of, expected, notices in schedule:
+        expired, expiring = _expiry(rows, 3, as_of, validity_days=100, notice_days=10)
+        assert expired.tolist() == expected, as_of
+        assert expiring.tolist() == notices, as_of
+
+
+def test_second_run_on_same_day_expires_nothing():
+    system = TimeBankSystem(InMemoryRepository())
+    system.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=8000))
+    system.add_user(User(id="other", name="다른 손님", email="other@timebank.com", points=500))
+    unit = system.get_all_campsites()[0].units[0]
+    check_in = datetime.date.today() + datetime.timedelta(days=30)
+    system.create_booking(unit.id, "guest", check_in, check_in + datetime.timedelta(days=1), 2, used_points=3000)
+
+    # 모든 항목이 오늘 발생했으므로 400일 뒤에는 남은 잔액 전부가 소멸
+    before = {u: system.get_points_balance(u) for u in ("guest", "other", "demo_user")}
+    later = datetime.date.today() + datetime.timedelta(days=400)
+    sent = []
+    first = system.expire_points(later, notifier=sent.extend)
+    assert first.expired_points == sum(before.values())
+    assert first.expired_users == sum(1 for points in before.values() if points > 0)
+    assert all(system.get_points_balance(u) == 0 for u in before)
+
+    second = system.expire_points(later, notifier=sent.extend)
+    assert (second.expired_users, second.expired_points) == (0, 0)
+    assert [n for n in second.notices if n.kind == points_expiry.EXPIRED] == []
+    assert sum(n.points for n in sent if n.kind == points_expiry.EXPIRED) == first.expired_points
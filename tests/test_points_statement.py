@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+월별 포인트 명세서의 기초 잔액 조회 테스트 (저장소별 직전 원장 항목 1건 조회)
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import points_ledger
+from modules.core_logic import TimeBankSystem
+from modules.event_log import EventLogRepository
+from modules.models import User
+from modules.storage import InMemoryRepository, SQLiteRepository
+
+
+@pytest.fixture(params=["memory", "sqlite", "eventlog"])
+def repository(request, tmp_path):
+    if request.param == "memory":
+        repository = InMemoryRepository()
+    elif request.param == "sqlite":
+        repository = SQLiteRepository(str(tmp_path / "timebank.db"))
+    else:
+        repository = EventLogRepository(str(tmp_path / "events"), fsync=False)
+    yield repository
+    repository.close()
+
+
+def test_last_entry_before(repository):
+    ledger = points_ledger.PointsLedger()
+    repository.save_users([User(id="a", name="A", email="a@timebank.com"),
+                           User(id="b", name="B", email="b@timebank.com")])
+    entries = []
+    for user_id, amount in [("a", 100), ("b", 7), ("a", -30), ("a", 5)]:
+        drafted = ledger.draft([(user_id, points_ledger.ADJUSTMENT, amount, None)])
+        repository.save_points(drafted)
+        ledger.apply(drafted)
+        entries.extend(drafted)
+    a1, b1, a2, a3 = entries
+
+    assert repository.last_ledger_entry_before("a", a1.id) is None
+    assert repository.last_ledger_entry_before("a", b1.id).id == a1.id
+    assert repository.last_ledger_entry_before("a", a3.id).id == a2.id
+    last = repository.last_ledger_entry_before("a", "pl_~")
+    assert (last.id, last.balance_after) == (a3.id, 75)
+    assert repository.last_ledger_entry_before("b", "pl_~").id == b1.id
+    assert repository.last_ledger_entry_before("nobody", "pl_~") is None
+
+
+def test_empty_month_opens_with_previous_balance(repository):
+    system = TimeBankSystem(repository)
+    system.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=1200))
+    later = datetime.date.today() + datetime.timedelta(days=62)
+    statement = system.get_points_statement("guest", later.year, later.month)
+    assert statement.opening_balance == statement.closing_balance == 1200
+    assert not statement.entries
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요금 규칙 파일 로드 테스트 (기본 규칙은 경로를 지정하지 않았을 때만 사용)
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import pricing_rules
+
+
+def test_defaults_only_without_path(monkeypatch):
+    monkeypatch.delenv("TIMEBANK_PRICING_RULES", raising=False)
+    spec, path = pricing_rules.load_rules()
+    assert spec is pricing_rules.DEFAULT_RULES and path is None
+
+
+def test_explicit_missing_path_raises(tmp_path, monkeypatch):
+    monkeypatch.delenv("TIMEBANK_PRICING_RULES", raising=False)
+    with pytest.raises(FileNotFoundError):
+        pricing_rules.load_rules(str(tmp_path / "missing.json"))
+
+
+def test_missing_path_from_env_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("TIMEBANK_PRICING_RULES", str(tmp_path / "missing.json"))
+    with pytest.raises(FileNotFoundError):
+        pricing_rules.load_rules()
+
+
+def test_explicit_path_is_loaded(tmp_path):
+    rules = {"rules": [{"name": "평일 할인", "discount": 0.1, "day_types": ["WEEKDAY"]}], "invite_discount": 0.05}
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps(rules, ensure_ascii=False), encoding="utf-8")
+    spec, path = pricing_rules.load_rules(str(rules_path))
+    assert spec == rules and path == str(rules_path)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일괄 가격 행렬(quote_matrix)이 단건 가격(quote_day)과 셀마다 같은지 테스트
+"""
+
+import os
+import sys
+import datetime
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import pricing, pricing_rules
+from modules.models import Unit
+
+PROMO_RULES = {
+    "rules": [
+        {"name": "주말/공휴일 할증", "multiplier": 1.2, "day_types": ["WEEKEND", "HOLIDAY", "HOLIDAY_EVE"]},
+        {"name": "공휴일 전날 할증", "multiplier": 1.1, "day_types": ["HOLIDAY_EVE"]},
+        {"name": "오전 이용", "multiplier": 0.5, "slots": ["AM"]},
+        {"name": "오후 이용", "multiplier": 0.6, "slots": ["PM"]},
+        {"name": "봄 프로모션", "discount": 0.15, "start": "2026-03-01", "end": "2026-05-31"},
+        {"name": "로열 할인", "discount": 0.3, "plans": ["M_ROYAL"]},
+    ],
+    "default_plan": "M_SMART",
+    "invite_discount": 0.05,
+}
+
+
+def _unit(index, price):
+    return Unit(id=f"u{index}", name=f"숙소 {index}", price=price, max_guests=4, rating=4.5, image="", tags=[])
+
+
+@pytest.fixture(params=["default", "promo"])
+def plan(request):
+    previous = pricing.get_plan()
+    spec = pricing_rules.DEFAULT_RULES if request.param == "default" else PROMO_RULES
+    pricing.set_plan(pricing_rules.compile_rules(spec))
+    yield pricing.get_plan()
+    pricing.set_plan(previous)
+
+
+@pytest.mark.parametrize("is_member, membership_type", [(False, None), (True, None), (True, "M_ROYAL")])
+def test_matrix_matches_scalar_quotes(plan, is_member, membership_type):
+    units = [_unit(i, price) for i, price in enumerate([0, 9990, 55000, 123457, 350000])]
+    start = datetime.date(2026, 1, 1)
+    dates = [start + datetime.timedelta(days=d) for d in range(365)]
+
+    matrix = pricing.quote_matrix(units, dates, pricing.SLOTS, is_member, membership_type)
+    assert matrix.shape == (len(units), len(dates), len(pricing.SLOTS))
+    expected = np.array([[[pricing.quote_day(unit.price, day, slot, is_member, membership_type)
+                           for slot in pricing.SLOTS] for day in dates] for unit in units])
+    mismatches = np.argwhere(matrix != expected)
+    assert not len(mismatches), [(units[u].id, dates[d], pricing.SLOTS[s], matrix[u, d, s], expected[u, d, s])
+                                 for u, d, s in mismatches[:5]]
+
+
+def test_datetime64_dates_match_date_objects(plan):
+    units = [_unit(0, 77000)]
+    dates = [datetime.date(2026, 12, 20) + datetime.timedelta(days=d) for d in range(20)]
+    as_datetime64 = np.array(dates, dtype="datetime64[D]")
+    assert np.array_equal(pricing.quote_matrix(units, dates), pricing.quote_matrix(units, as_datetime64))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관리자 통계의 지급 포인트가 포인트 원장(적립/초대 리워드/멤버십 페이백, 취소 상계)과 일치하는지 테스트
+"""
+
+import os
+import sys
+import datetime
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import points_ledger
+from modules.core_logic import TimeBankSystem
+from modules.models import User
+from modules.storage import InMemoryRepository
+
+
+def _issued(system):
+    return sum(e.amount for e in system._repository.load_ledger_entries() if e.kind in points_ledger.ISSUED)
+
+
+def test_rollup_points_follow_ledger():
+    system = TimeBankSystem(InMemoryRepository())
+    guest = system.add_user(User(id="guest", name="손님", email="guest@timebank.com"))
+    inviter = system.get_user("demo_user")
+    system.join_membership(guest.id)
+    unit = system.get_all_campsites()[0].units[0]
+    check_in = datetime.date.today() + datetime.timedelta(days=30)
+
+    kept = system.create_booking(unit.id, guest.id, check_in, check_in + datetime.timedelta(days=1), 2,
+                                 invite_code=inviter.invite_code)
+    cancelled = system.create_booking(unit.id, guest.id, check_in + datetime.timedelta(days=3),
+                                      check_in + datetime.timedelta(days=5), 2, invite_code=inviter.invite_code)
+    system.cancel_booking(cancelled.id)
+
+    totals = system.get_booking_totals()
+    assert totals["points"] == _issued(system) > kept.earned_points
+    assert totals["bookings"] == 1
+    # 멤버십 페이백은 예약이 없으므로 월 통계에만, 예약 포인트는 캠핑장 통계에도 반영
+    monthly = system.get_booking_stats("month")
+    assert monthly["points"].sum() == totals["points"]
+    by_campsite = system.get_booking_stats("campsite")
+    assert by_campsite["points"].sum() == totals["points"] - 50000
+
+    # 재시작(저장소에서 복원)해도 같은 값
+    restored = TimeBankSystem(system._repository)
+    assert restored.get_booking_totals()["points"] == totals["points"]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+같은 SQLite DB를 공유하는 두 워커(TimeBankSystem)가 서로의 등록/예약/취소를 따라잡는지,
+서로 다른 ID 노드 번호를 발급받는지 테스트
+"""
+
+import os
+import sys
+import datetime
+import logging
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core_logic import TimeBankSystem
+from modules.models import User
+from modules.storage import SQLiteRepository
+
+CHECK_IN = datetime.date.today() + datetime.timedelta(days=20)
+CHECK_OUT = CHECK_IN + datetime.timedelta(days=2)
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    # 같은 프로세스(같은 호스트명+PID) 안의 두 워커도 DB에서 서로 다른 노드 번호를 발급받음
+    monkeypatch.delenv("TIMEBANK_NODE_ID", raising=False)
+    path = str(tmp_path / "timebank.db")
+    systems = [TimeBankSystem(SQLiteRepository(path)) for _ in range(2)]
+    yield systems
+    for system in systems:
+        system._repository.close()
+
+
+def test_workers_claim_distinct_node_ids(workers, tmp_path, monkeypatch, caplog):
+    a, b = workers
+    assert a._booking_ids.node_id != b._booking_ids.node_id
+    assert a._points_ledger._ids.node_id == a._hold_ids.node_id == a._booking_ids.node_id
+
+    # 환경 변수로 지정하면 발급 없이 그 번호를 사용하고, 선택한 번호를 로그로 남김
+    monkeypatch.setenv("TIMEBANK_NODE_ID", "77")
+    with caplog.at_level(logging.INFO, logger="modules.id_gen"):
+        c = TimeBankSystem(SQLiteRepository(str(tmp_path / "timebank.db")))
+    assert c._booking_ids.node_id == 77 and "Using node id 77 (TIMEBANK_NODE_ID)" in caplog.text
+    c._repository.close()
+
+
+def test_bookings_and_users_from_other_worker_are_visible(workers):
+    a, b = workers
+    unit = a.get_all_campsites()[0].units[0]
+    b.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=5000))
+    booking = b.create_booking(unit.id, "guest", CHECK_IN, CHECK_OUT, 2, used_points=1000)
+
+    assert a.get_user("guest").points == 4000 + booking.earned_points
+    assert a.find_user_by_email("guest@timebank.com").id == "guest"
+    assert not a.is_available(unit.id, CHECK_IN, CHECK_OUT)
+    assert unit not in a.search_available(CHECK_IN, CHECK_OUT, 2)
+    assert a.get_booking_totals() == b.get_booking_totals()
+    assert [e.id for e in a.get_points_history("guest")] == [e.id for e in b.get_points_history("guest")]
+    with pytest.raises(ValueError):
+        a.create_booking(unit.id, "demo_user", CHECK_IN, CHECK_OUT, 2)
+
+
+def test_cancel_by_other_worker_is_not_reverted_twice(workers):
+    a, b = workers
+    unit = a.get_all_campsites()[0].units[1]
+    a.add_user(User(id="guest", name="손님", email="guest@timebank.com", points=5000))
+    booking = a.create_booking(unit.id, "guest", CHECK_IN, CHECK_OUT, 2, used_points=1000)
+    assert b.get_booking_totals()["bookings"] == 1
+
+    b.cancel_booking(booking.id)
+    # a는 아직 확정 상태로 알고 있으며, 취소 요청 시 b가 기록한 상태와 되돌림 항목을 따라잡음
+    assert a._booking_by_id[booking.id].status == "CONFIRMED"
+    cancelled = a.cancel_booking(booking.id)
+    assert cancelled.status == "CANCELLED"
+    assert a.is_available(unit.id, CHECK_IN, CHECK_OUT) and b.is_available(unit.id, CHECK_IN, CHECK_OUT)
+    assert a.get_user("guest").points == 5000 == a._repository.get_user("guest").points
+    assert a._points_ledger.balance("guest") == b._points_ledger.balance("guest") == 5000
+    assert a.get_booking_totals() == b.get_booking_totals()
+    entries = a._repository.find_booking_ledger_entries(booking.id)
+    assert sum(e.amount for e in entries) == 0 and len(entries) == 4
+
+
+def test_cancel_racing_other_worker_follows_repository(workers):
+    a, b = workers
+    unit = a.get_all_campsites()[1].units[0]
+    booking = a.create_booking(unit.id, "demo_user", CHECK_IN, CHECK_OUT, 2)
+    repository_cancel = a._repository.cancel_booking
+
+    def cancel_after_other_worker(booking_id, ledger_entries=()):
+        # a가 동기화한 직후 b가 먼저 취소 -> 조건부 UPDATE가 거절됨
+        b.cancel_booking(booking_id)
+        return repository_cancel(booking_id, ledger_entries)
+
+    a._repository.cancel_booking = cancel_after_other_worker
+    assert a.cancel_booking(booking.id).status == "CANCELLED"
+    assert a.is_available(unit.id, CHECK_IN, CHECK_OUT)
+    assert a.get_booking_totals() == b.get_booking_totals()
+    assert a._points_ledger.balance("demo_user") == a._repository.get_user("demo_user").points
@@ -4,17 +4,62 @@
 """
 
 import streamlit as st
+import altair as alt
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from modules.core_logic import get_system
 
 system = get_system()
 
+PAGE_SIZE = 50
+SORT_LABELS = {"created_at": "생성일", "check_in": "체크인", "final_price": "결제금액"}
+
+
+def _format_booking_page(df: pd.DataFrame) -> pd.DataFrame:
+    """화면에 보이는 한 페이지(최대 PAGE_SIZE행)만 표시용으로 가공."""
+    return pd.DataFrame({
+        "예약번호": df["id"],
+        "지역": df["region_id"],
+        "캠핑장": df["campsite_id"],
+        "숙소": df["unit_id"],
+        "고객": df["user_id"],
+        "체크인": df["check_in"],
+        "체크아웃": df["check_out"],
+        "시간": df["time_slot"],
+        "상태": df["status"],
+        "회원여부": df["is_member"].map({True: "회원", False: "비회원"}),
+        "결제금액": [f"{x:,}원" for x in df["final_price"]],
+        "생성일": df["created_at"].dt.strftime("%Y-%m-%d %H:%M"),
+    })
+
+def _format_rollup(df: pd.DataFrame, label: str, names: dict) -> pd.DataFrame:
+    """지역/캠핑장 롤업을 표시용으로 가공."""
+    return pd.DataFrame({
+        label: df["key"].map(lambda k: names.get(k, k)),
+        "매출": df["revenue"].map(lambda v: f"{v:,}원"),
+        "예약": df["bookings"],
+        "점유율": df["occupancy"].map(lambda v: "-" if pd.isna(v) else f"{v:.1%}"),
+    })
+
+
+def _render_occupancy_heatmap(grid: pd.DataFrame, row_title: str):
+    """행(숙소 또는 캠핑장) × 날짜 점유율 히트맵."""
+    df = grid.rename_axis(index="행", columns="날짜").stack().rename("점유율").reset_index()
+    chart = alt.Chart(df).mark_rect().encode(
+        x=alt.X("날짜:T", title=None, axis=alt.Axis(format="%m/%d", tickCount="week")),
+        y=alt.Y("행:N", sort=list(grid.index), title=row_title),
+        color=alt.Color("점유율:Q", scale=alt.Scale(scheme="blues", domain=[0, 1])),
+        tooltip=[alt.Tooltip("행:N", title=row_title), alt.Tooltip("날짜:T", format="%Y-%m-%d"),
+                 alt.Tooltip("점유율:Q", format=".0%")],
+    ).properties(height=max(160, 14 * len(grid)))
+    st.altair_chart(chart, width="stretch")
+
+
 def render_admin_page():
     """관리자 탭 화면."""
     st.header("🛠️ 관리자 대시보드")
     
-    tab_booking, tab_assets, tab_stats = st.tabs(["예약 현황", "자산 관리", "통계 분석"])
+    tab_booking, tab_assets, tab_stats, tab_occupancy = st.tabs(["예약 현황", "자산 관리", "통계 분석", "점유 현황"])
     
     with tab_booking:
         st.subheader("실시간 예약 내역")
@@ -39,72 +84,51 @@ def render_admin_page():
                 default=["회원", "비회원"]
             )
 
-        if system._bookings:
-            # 1. 데이터 수집
-            data = []
-            for b in system._bookings:
-                # 캠핑장 정보 조회
-                campsite = next((c for c in system._campsites if c.id == b.campsite_id), None)
-                c_type = campsite.type if campsite else "Unknown"
-                
-                # 예약 날짜 타입 보정 (문자열, datetime, date 등 혼재 가능성 대비)
-                b_date = b.date
-                if isinstance(b_date, str):
-                    try:
-                        b_date = datetime.strptime(b_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        pass # 파싱 실패 시 원본 유지 혹은 에러 처리
-                elif isinstance(b_date, datetime):
-                    b_date = b_date.date()
-
-                data.append({
-                    "예약번호": b.id,
-                    "모델 종류": c_type,
-                    "캠핑장": b.campsite_id,
-                    "고객": b.user_id,
-                    "예약일자": b_date, # 필터링용 원본 데이터 (Date 객체)
-                    "시간": b.time_slot,
-                    "상태": b.status,
-                    "회원여부": "회원" if b.is_member else "비회원",
-                    "결제금액": b.payment_amount, # 정렬용 숫자
-                    "생성일": b.created_at
-                })
-            
-            df = pd.DataFrame(data)
-            
-            # 2. 필터링 로직
-            # 2-1. 날짜 필터 (date_range가 튜플로 시작, 종료일 모두 있을 때만)
-            if isinstance(date_range, tuple) and len(date_range) == 2:
-                start_date, end_date = date_range
-                df = df[(df["예약일자"] >= start_date) & (df["예약일자"] <= end_date)]
-            
-            # 2-2. 회원 필터
-            if member_filter:
-                df = df[df["회원여부"].isin(member_filter)]
-            
-            # 3. 화면 표시용 가공
-            display_df = df.copy()
-            display_df["결제금액"] = display_df["결제금액"].apply(lambda x: f"{x:,}원")
-            # 생성일이 datetime 객체인 경우 포맷팅
-            if not display_df.empty:
-                 display_df["생성일"] = display_df["생성일"].apply(lambda x: x.strftime("%Y-%m-%d %H:%M") if hasattr(x, 'strftime') else str(x))
-            
-            st.markdown(f"총 **{len(display_df)}**건의 예약이 조회되었습니다.")
-            
-            # 최신순 정렬 (기본) - 사용자가 컬럼 클릭으로 변경 가능
-            if not display_df.empty:
-                display_df = display_df.sort_values(by="생성일", ascending=False)
-            
+        # 회원 구분: 둘 다(또는 아무것도) 선택하지 않으면 필터 없음
+        is_member = None
+        if len(member_filter) == 1:
+            is_member = member_filter[0] == "회원"
+        start_date, end_date = (date_range if isinstance(date_range, tuple) and len(date_range) == 2 else (None, None))
+
+        col_sort, col_order = st.columns([2, 1])
+        with col_sort:
+            sort_by = st.selectbox("정렬 기준", list(SORT_LABELS.keys()), format_func=SORT_LABELS.get)
+        with col_order:
+            descending = st.radio("정렬 순서", ["내림차순", "오름차순"], horizontal=True) == "내림차순"
+
+        # 조건이 바뀌면 첫 페이지부터 (페이지별 시작 커서를 세션에 보관)
+        query = (start_date, end_date, is_member, sort_by, descending)
+        if st.session_state.get("admin_booking_query") != query:
+            st.session_state["admin_booking_query"] = query
+            st.session_state["admin_booking_cursors"] = [None]
+        cursors = st.session_state["admin_booking_cursors"]
+
+        # 현재 페이지만 조회 (정렬/페이지네이션은 예약 컬럼 저장소에서 처리)
+        page = system.query_bookings_page(start_date, end_date, is_member, sort_by=sort_by, descending=descending,
+                                          after=cursors[-1], limit=PAGE_SIZE)
+
+        if page.total:
+            st.markdown(f"총 **{page.total}**건의 예약이 조회되었습니다. ({len(cursors)}페이지)")
             st.dataframe(
-                display_df, 
+                _format_booking_page(page.frame),
                 width="stretch",
                 column_config={
-                    "예약일자": st.column_config.DateColumn("예약 날짜", format="YYYY-MM-DD"),
+                    "체크인": st.column_config.DateColumn("체크인", format="YYYY-MM-DD"),
+                    "체크아웃": st.column_config.DateColumn("체크아웃", format="YYYY-MM-DD"),
                 },
                 hide_index=True
             )
+            col_prev, _, col_next = st.columns([1, 3, 1])
+            with col_prev:
+                if st.button("◀ 이전", disabled=len(cursors) == 1, width="stretch"):
+                    cursors.pop()
+                    st.rerun()
+            with col_next:
+                if st.button("다음 ▶", disabled=page.next_cursor is None, width="stretch"):
+                    cursors.append(page.next_cursor)
+                    st.rerun()
         else:
-            st.info("아직 접수된 예약이 없습니다.")
+            st.info("조건에 맞는 예약이 없습니다.")
             
     with tab_assets:
         st.subheader("등록된 카라반 목록")
@@ -118,21 +142,97 @@ def render_admin_page():
                         c_data.append({
                             "ID": c.id,
                             "이름": c.name,
-                            "유형": c.type,
+                            "숙소 수": len(c.units),
                             "기본가(평일)": f"{c.base_price_weekday:,}",
-                            "기본가(주말)": f"{c.base_price_weekend:,}"
+                            "평점": c.rating
                         })
                     st.table(c_data)
                 else:
                     st.write("등록된 캠핑장이 없습니다.")
 
     with tab_stats:
-        st.subheader("매출 분석 (Simulation)")
-        st.warning("데이터가 충분하지 않아 시뮬레이션 데이터를 표시합니다.")
-        
-        # 가상의 매출 데이터 차트
-        chart_data = pd.DataFrame({
-            "Month": ["1월", "2월", "3월", "4월", "5월", "6월"],
-            "Revenue": [1500, 2300, 3100, 2800, 4200, 5100]
-        })
-        st.bar_chart(chart_data.set_index("Month"))
+        st.subheader("매출 분석")
+        member_view = st.radio("고객 구분", ["전체", "회원", "비회원"], horizontal=True, key="admin_stats_member")
+        stats_member = {"전체": None, "회원": True, "비회원": False}[member_view]
+
+        totals = system.get_booking_totals(stats_member)
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("총 매출", f"{int(totals['revenue']):,}원")
+        m2.metric("확정 예약", f"{int(totals['bookings']):,}건")
+        m3.metric("지급 포인트", f"{int(totals['points']):,}P")
+        m4.metric("점유 숙소-일", f"{totals['nights']:,.1f}")
+
+        if not totals["bookings"]:
+            st.info("확정된 예약이 없습니다.")
+        else:
+            monthly = system.get_booking_stats("month", stats_member)
+            monthly["월"] = monthly["key"].map(lambda k: f"{k // 100}-{k % 100:02d}")
+            st.markdown("##### 월별 매출 (체크인 기준)")
+            st.bar_chart(monthly.set_index("월")[["revenue"]].rename(columns={"revenue": "매출"}))
+
+            daily = system.get_booking_stats("day", stats_member)
+            daily["날짜"] = pd.to_datetime(daily["key"].map(date.fromordinal))
+            st.markdown("##### 일별 점유율")
+            st.line_chart(daily.set_index("날짜")[["occupancy"]].rename(columns={"occupancy": "점유율"}))
+
+            region_names = {r.id: r.name for r in system.get_regions()}
+            campsite_names = {c.id: c.name for c in system.get_all_campsites()}
+            col_region, col_campsite = st.columns(2)
+            with col_region:
+                st.markdown("##### 지역별")
+                st.dataframe(_format_rollup(system.get_booking_stats("region", stats_member), "지역", region_names),
+                             hide_index=True, width="stretch")
+            with col_campsite:
+                st.markdown("##### 캠핑장별")
+                st.dataframe(_format_rollup(system.get_booking_stats("campsite", stats_member), "캠핑장", campsite_names),
+                             hide_index=True, width="stretch")
+
+            if stats_member is None:
+                st.markdown("##### 회원 / 비회원")
+                split = pd.DataFrame([
+                    {"구분": label, **system.get_booking_totals(flag)}
+                    for label, flag in (("회원", True), ("비회원", False))
+                ])
+                st.dataframe(pd.DataFrame({
+                    "구분": split["구분"],
+                    "매출": split["revenue"].map(lambda v: f"{int(v):,}원"),
+                    "예약": split["bookings"].astype(int),
+                    "지급 포인트": split["points"].astype(int),
+                }), hide_index=True, width="stretch")
+
+        st.divider()
+        st.subheader("매출 / 점유율 예측")
+        # 백그라운드에서 매일 밤 재학습된 예측 캐시를 읽기만 함
+        forecast = system.get_forecast()
+        fitted_until, fitted_days = system.get_forecast_status()
+        campsite_names = {c.id: c.name for c in system.get_all_campsites()}
+        forecast_scope = st.selectbox("캠핑장", ["전체"] + [campsite_names[k] for k in forecast["campsite_id"].unique()],
+                                      key="admin_forecast_scope")
+        if forecast_scope == "전체":
+            daily_forecast = forecast.groupby("date").agg(revenue=("revenue", "sum"), occupancy=("occupancy", "mean"))
+        else:
+            daily_forecast = forecast[forecast["campsite_id"].map(campsite_names) == forecast_scope].set_index("date")
+        if not daily_forecast["revenue"].any():
+            st.info("학습할 지난 날짜의 확정 예약이 없어 예측값이 0으로 표시됩니다.")
+        f1, f2 = st.columns(2)
+        f1.metric(f"향후 {len(daily_forecast)}일 예상 매출", f"{int(daily_forecast['revenue'].sum()):,}원")
+        f2.metric("예상 평균 점유율", f"{daily_forecast['occupancy'].mean():.1%}")
+        st.line_chart(daily_forecast[["revenue"]].rename(columns={"revenue": "예상 매출"}))
+        st.line_chart(daily_forecast[["occupancy"]].rename(columns={"occupancy": "예상 점유율"}))
+        st.caption(f"{fitted_until} 전날까지 {fitted_days}일 학습 · 요일/공휴일 효과 + 추세 모델, 매일 밤 재학습")
+
+    with tab_occupancy:
+        st.subheader("숙소별 점유 현황 (향후 6개월)")
+        # 예약이 바뀌기 전까지 캐시된 격자를 사용하므로 재방문 시 다시 계산하지 않음
+        grid = system.get_occupancy_grid()
+        campsites = system.get_all_campsites()
+        scope = st.selectbox("범위", ["전체 (캠핑장 평균)"] + [c.name for c in campsites], key="admin_occupancy_scope")
+        if scope == "전체 (캠핑장 평균)":
+            campsite_of_unit = {u.id: c.name for c in campsites for u in c.units}
+            by_campsite = grid.groupby(grid.index.map(campsite_of_unit), sort=False).mean()
+            _render_occupancy_heatmap(by_campsite, "캠핑장")
+        else:
+            campsite = next(c for c in campsites if c.name == scope)
+            unit_names = {u.id: u.name for u in campsite.units}
+            _render_occupancy_heatmap(grid.loc[list(unit_names)].rename(index=unit_names), "숙소")
+        st.caption(f"평균 점유율 {grid.values.mean():.1%} · 숙박 1, 당일 이용(오전/오후) 0.5 기준")
@@ -5,12 +5,15 @@ Airbnb 스타일의 카드 그리드 UI를 채택하여 시각적 경험을 강
 """
 
 import streamlit as st
+import altair as alt
+import pandas as pd
 import datetime
 import os
 import glob
 from modules.core_logic import get_system
+from modules.holidays import WEEKDAY
 from modules.image_generator import image_gen
-from modules.utils import load_image_safe
+from modules.utils import load_image_safe, form_idempotency_key
 
 system = get_system()
 
@@ -23,6 +26,21 @@ def _load_latest_image(region_id):
     files.sort(key=os.path.getmtime, reverse=True)
     return files[0]
 
+def _render_price_heatmap(dates, prices):
+    """1년 날짜별 가격 히트맵 (주차 × 요일, 캐시된 가격표 사용)."""
+    first_monday = dates[0] - datetime.timedelta(days=dates[0].weekday())
+    df = pd.DataFrame({"날짜": pd.to_datetime(dates), "가격": prices})
+    df["주차"] = [first_monday + datetime.timedelta(weeks=(d - first_monday).days // 7) for d in dates]
+    df["요일"] = ["월화수목금토일"[d.weekday()] for d in dates]
+    chart = alt.Chart(df).mark_rect().encode(
+        x=alt.X("주차:T", title=None, axis=alt.Axis(format="%m월", tickCount="month")),
+        y=alt.Y("요일:O", sort=list("월화수목금토일"), title=None),
+        color=alt.Color("가격:Q", scale=alt.Scale(scheme="greens", reverse=True), legend=None),
+        tooltip=[alt.Tooltip("날짜:T", format="%Y-%m-%d"), alt.Tooltip("가격:Q", format=",")],
+    ).properties(height=160)
+    st.altair_chart(chart, width="stretch")
+
+
 def render_booking_page():
     """예약하기 탭 화면 (Airbnb Style Grid)."""
     
@@ -160,7 +178,7 @@ def render_booking_page():
     if "selected_campsite_id" in st.session_state:
         target_id = st.session_state.selected_campsite_id
         # 해당 ID의 객체 찾기
-        target_campsite = next((c for c in campsites if c.id == target_id), None)
+        target_campsite = system.get_campsite(target_id)
         
         if target_campsite:
             st.markdown("---")
@@ -168,6 +186,7 @@ def render_booking_page():
                 # Detail Modal - 3: 위치 정보 굵게 표시 (여기선 페이지 하단 열림 방식)
                 st.subheader(f"📝 예약 진행: {target_campsite.name}")
                 st.markdown(f"#### 📍 위치: **{target_campsite.location_desc}**")
+                target_unit = target_campsite.units[0] if target_campsite.units else None
                 
                 c1, c2 = st.columns([1, 1])
                 
@@ -197,6 +216,21 @@ def render_booking_page():
                         format_func=lambda x: time_options[x]
                     )
 
+                    # 선택한 시간대의 마감 날짜 안내 (슬롯 비트맵 조회, 향후 90일)
+                    if target_unit:
+                        closed_dates = system.get_unavailable_dates(target_unit.id, selected_time_key, days=90)
+                        if closed_dates:
+                            closed_text = ", ".join(d.strftime("%m/%d") for d in closed_dates[:14])
+                            more = f" 외 {len(closed_dates) - 14}일" if len(closed_dates) > 14 else ""
+                            st.caption(f"🚫 마감된 날짜: {closed_text}{more}")
+
+                    # 최저가 달력 (1년 가격표는 시스템에 캐시되어 리런마다 재계산하지 않음)
+                    with st.expander("📅 날짜별 요금 보기 (최저가 찾기)"):
+                        calendar_dates, calendar_prices = system.get_price_calendar(target_campsite, selected_time_key)
+                        _render_price_heatmap(calendar_dates, calendar_prices)
+                        cheapest = system.get_cheapest_dates(target_campsite, selected_time_key, count=5)
+                        st.caption("💰 최저가 날짜: " + ", ".join(f"{d.strftime('%m/%d')} ₩{p:,}" for d, p in cheapest))
+
                 with c2:
                     # Booking Flow - 4: Membership Toggle
                     user_type = st.radio(
@@ -210,16 +244,27 @@ def render_booking_page():
                     if is_member_selected:
                         membership_type = st.selectbox("보유 멤버십", ["M_SMART (투지아 스마트)", "M_ROYAL (리조트 로얄)"]).split(" ")[0]
 
-                    # 가격 계산
-                    is_weekend = (check_in.weekday() >= 5)
-                    price = system.calculate_price(
-                        target_campsite, 
-                        is_member_selected, 
-                        membership_type, 
-                        selected_time_key, 
-                        is_weekend
+                    # 가격 계산 (박마다 주말/공휴일 할증 적용)
+                    price = system.calculate_stay_price(
+                        target_campsite,
+                        is_member_selected,
+                        membership_type,
+                        selected_time_key,
+                        check_in,
+                        check_out
                     )
                     
+                    # 결제 중 임시 확보 (같은 숙소/기간/시간대일 때만 유효)
+                    hold = system.get_hold(st.session_state.get("booking_hold_id"))
+                    if hold and target_unit and not hold.matches(target_unit.id, check_in, check_out, selected_time_key):
+                        system.release_hold(hold.id) # 날짜/시간을 바꾸면 이전 확보 해제
+                        hold = None
+
+                    # 예약 가능 여부 (리런마다 호출되는 인덱스 조회, 다른 사용자의 임시 확보 포함)
+                    is_open = target_unit is None or hold is not None or system.is_available(target_unit.id, check_in, check_out, selected_time_key)
+                    if not is_open:
+                        st.warning("선택하신 기간에는 이미 예약이 있습니다. 다른 날짜나 시간을 선택해 주세요.")
+
                     # 결제 정보 표시
                     if is_member_selected:
                         st.caption("✨ 멤버십 혜택이 적용되었습니다!")
@@ -227,24 +272,47 @@ def render_booking_page():
                         # 실제 표시 가격 0원 처리
                     else:
                         st.success(f"**총 결제 금액: {price:,}원**")
+                        nights = max((check_out - check_in).days, 1)
+                        if any(system.get_day_type(check_in + datetime.timedelta(days=i)) != WEEKDAY for i in range(nights)):
+                            st.caption("📅 주말·공휴일(연휴 전날 포함) 요금이 적용된 날짜가 있습니다.")
                         
-                    if st.button("결제 및 예약 확정", type="primary", width="stretch"):
-                         booking = system.create_booking(
-                            user_id="current_user",
-                            campsite_id=target_campsite.id,
-                            check_in=check_in,
-                            check_out=check_out,
-                            guests=2, # Default guests for now in this view
-                            time_slot=selected_time_key,
-                            is_member=is_member_selected,
-                            membership_type=membership_type,
-                            payment_amount=price if not is_member_selected else 0
-                        )
+                    if hold:
+                        st.caption(f"⏳ {hold.expires_at:%H:%M}까지 결제를 위해 객실이 확보되어 있습니다.")
+                    elif is_open and target_unit and st.button("⏳ 결제하는 동안 객실 잡아두기", width="stretch"):
+                        try:
+                            hold = system.hold_unit(target_unit.id, "current_user", check_in, check_out, selected_time_key)
+                            st.session_state["booking_hold_id"] = hold.id
+                            st.rerun()
+                        except ValueError as e:
+                            st.error(f"객실 확보 실패: {e}")
+
+                    # 같은 입력으로 다시 제출되면(더블 클릭/리런) 처음 예약을 그대로 돌려받는 키
+                    idempotency_key = form_idempotency_key(
+                        f"booking_{target_campsite.id}", check_in, check_out, selected_time_key, membership_type
+                    )
+                    if st.button("결제 및 예약 확정", type="primary", width="stretch", disabled=not is_open):
+                         try:
+                             booking = system.create_booking(
+                                unit_id=target_unit.id if target_unit else None,
+                                user_id="current_user",
+                                campsite_id=target_campsite.id,
+                                check_in=check_in,
+                                check_out=check_out,
+                                guests=2, # Default guests for now in this view
+                                time_slot=selected_time_key,
+                                is_member=is_member_selected,
+                                membership_type=membership_type,
+                                payment_amount=price if not is_member_selected else 0,
+                                idempotency_key=idempotency_key,
+                                hold_id=hold.id if hold else None
+                            )
+                         except ValueError as e:
+                             booking = None
+                             st.error(f"예약 실패: {e}")
                          
                          if booking:
+                            st.session_state.pop("booking_hold_id", None)
                             st.balloons()
                             st.success(f"예약 완료! 예약번호: {booking.id}")
                             st.markdown(f"**위치:** {target_campsite.name}")
                             st.markdown(f"**기간:** {check_in} ~ {check_out}")
-                         else:
-                            st.error("예약 처리 중 오류가 발생했습니다.")
@@ -8,9 +8,13 @@ import streamlit as st
 import os
 import random
 import datetime
-from modules.utils import load_image_safe
+import pandas as pd
+from modules.utils import load_image_safe, form_idempotency_key
 from modules.core_logic import get_system, Unit
 
+POINT_KIND_LABELS = {"EARN": "예약 적립", "SPEND": "포인트 사용", "REFERRAL": "초대 리워드",
+                     "MEMBERSHIP_PAYBACK": "멤버십 페이백", "ADJUSTMENT": "잔액 보정", "EXPIRE": "포인트 소멸"}
+
 # UI 컴포넌트 로드
 from ui.products import render_products_page
 from ui.investor import render_investor_page
@@ -21,7 +25,7 @@ def render_unit_card(unit: Unit):
     """개별 숙소 카드 렌더링"""
     system = get_system()
     # Find campsite to get location
-    campsite = next((c for c in system.get_all_campsites() if any(u.id == unit.id for u in c.units)), None)
+    campsite = system.get_campsite_for_unit(unit.id)
     location_name = campsite.name if campsite else ""
     
     # 간략화된 위치명 (예: '포천 산정호수 (The Base)' -> '📍 포천 산정호수점')
@@ -68,7 +72,7 @@ def open_booking_dialog():
     user = system.get_user(user_id)
 
     # 지점명 찾기
-    campsite = next((c for c in system.get_all_campsites() if any(u.id == unit.id for u in c.units)), None)
+    campsite = system.get_campsite_for_unit(unit.id)
     location_name = campsite.name if campsite else ""
 
     # Detail Modal - 3: 위치 정보 굵게 표시
@@ -125,7 +129,7 @@ def open_booking_dialog():
                 points_to_use = st.number_input("사용할 포인트", min_value=0, max_value=user.points, value=0, step=1000)
             
             # 예상 가격 계산
-            original_total_price = unit.price # 1박 기준 (임시)
+            original_total_price = system.calculate_stay_price(unit, False, None, "OVERNIGHT", check_in, check_out)
             
             if is_member_selected:
                 final_price_display = 0
@@ -157,7 +161,10 @@ def open_booking_dialog():
                         used_points=points_to_use if not is_member_selected else 0, 
                         invite_code=invite_code,
                         payment_amount=final_price_display if is_member_selected else None,
-                        is_member=is_member_selected
+                        is_member=is_member_selected,
+                        idempotency_key=form_idempotency_key(
+                            f"dialog_{unit.id}", check_in, check_out, guests, is_member_selected, invite_code, points_to_use
+                        )
                     )
                     st.success("예약이 확정되었습니다!")
                     st.balloons()
@@ -295,8 +302,7 @@ def render_my_page():
     
     # 3. 예약 내역
     st.subheader("내 예약 내역")
-    # (실제로는 system._bookings에서 user_id로 필터링해야 함)
-    my_bookings = [b for b in system._bookings if b.user_id == user_id]
+    my_bookings = system.get_user_bookings(user_id)
     if not my_bookings:
         st.caption("아직 예약 내역이 없습니다.")
     else:
@@ -305,6 +311,20 @@ def render_my_page():
                 st.write(f"예약번호: {booking.id}")
                 st.write(f"적립 포인트: {booking.earned_points}")
 
+    # 4. 포인트 명세서 (원장 기준 월별 조회)
+    st.subheader("포인트 내역")
+    today = datetime.date.today()
+    statement = system.get_points_statement(user_id, today.year, today.month)
+    st.caption(f"{today.year}년 {today.month}월 · 기초 {statement.opening_balance:,} P → 기말 {statement.closing_balance:,} P "
+               f"(적립 {statement.earned:,} P / 사용 {statement.spent:,} P)")
+    if statement.entries:
+        st.dataframe(
+            pd.DataFrame([{"일시": e.created_at.strftime("%m/%d %H:%M"), "구분": POINT_KIND_LABELS.get(e.kind, e.kind),
+                           "포인트": e.amount, "잔액": e.balance_after, "예약번호": e.booking_id or "-"}
+                          for e in reversed(statement.entries)]),
+            hide_index=True, width="stretch"
+        )
+
 
 def main() -> None:
     """메인 실행 함수."""
@@ -387,11 +407,25 @@ def main() -> None:
         with c1:
             regions = ["지도 전체"] + [r.name for r in system.get_regions()]
             target_region_name = st.selectbox("여행지 선택", regions, label_visibility="collapsed", key="search_region")
-        
-        campsites = system.get_campsites_by_region(target_region_name)
-        display_units = []
-        for campsite in campsites:
-            display_units.extend(campsite.units)
+        with c2:
+            today = datetime.date.today()
+            search_dates = st.date_input(
+                "일정 선택",
+                (today, today + datetime.timedelta(days=1)),
+                min_value=today,
+                format="YYYY/MM/DD",
+                label_visibility="collapsed",
+                key="search_dates"
+            )
+        with c3:
+            search_guests = st.number_input("인원", min_value=1, max_value=20, value=2, label_visibility="collapsed", key="search_guests")
+
+        # 조건(지역/인원/일정)에 맞고 예약 가능한 숙소만 노출
+        search_check_in = search_dates[0] if isinstance(search_dates, tuple) and len(search_dates) > 0 else today
+        search_check_out = search_dates[1] if isinstance(search_dates, tuple) and len(search_dates) > 1 else search_check_in + datetime.timedelta(days=1)
+        display_units = system.search_available(
+            search_check_in, search_check_out, int(search_guests), "OVERNIGHT", region=target_region_name
+        )
 
         if not display_units:
             st.info("조건에 맞는 기지가 없습니다.")